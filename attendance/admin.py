@@ -3,6 +3,7 @@ from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth import get_permission_codename
 from django.urls import path
 from .models import Employee, AttendanceMonthly, AttendanceDaily, HolidayCalendar
+from .repository import monthly_repository
 from .admin_views import profile_view, attendance_overview, payroll_view, employee_detail_view, payroll_detail_view, payroll_pdf_download_view, monthly_approval_action, daily_calendar_view
 from django.utils.html import format_html
 from django.utils import timezone
@@ -207,8 +208,31 @@ class EmployeeAdmin(admin.ModelAdmin):
         extra_context['csv_upload_url'] = reverse('admin:employee_csv_upload')
         return super().changelist_view(request, extra_context=extra_context)
 
+class MonthlyCacheInvalidateMixin:
+    """管理画面で勤怠を変更・削除したら該当月のキャッシュを破棄する"""
+
+    def get_monthly(self, obj):
+        return obj
+
+    def _invalidate(self, obj):
+        monthly = self.get_monthly(obj)
+        monthly_repository.invalidate(monthly.employee_id, monthly.year, monthly.month)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self._invalidate(obj)
+
+    def delete_model(self, request, obj):
+        self._invalidate(obj)
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self._invalidate(obj)
+        super().delete_queryset(request, queryset)
+
 @admin.register(AttendanceMonthly, site=custom_admin_site)
-class AttendanceMonthlyAdmin(admin.ModelAdmin):
+class AttendanceMonthlyAdmin(MonthlyCacheInvalidateMixin, admin.ModelAdmin):
     """月別勤怠管理用のAdmin"""
     list_display = ('monthly_id', 'employee', 'year', 'month', 'project_name', 'base_calendar')
     list_filter = ('year', 'month', 'base_calendar', 'employee__place_work')
@@ -220,7 +244,7 @@ class AttendanceMonthlyAdmin(admin.ModelAdmin):
     employee.short_description = '社員'
 
 @admin.register(AttendanceDaily, site=custom_admin_site)
-class AttendanceDailyAdmin(admin.ModelAdmin):
+class AttendanceDailyAdmin(MonthlyCacheInvalidateMixin, admin.ModelAdmin):
     """日別勤怠管理用のAdmin"""
     list_display = ('daily_id', 'employee', 'date', 'work_type', 'start_time', 'end_time', 'is_confirmed')
     list_filter = ('work_type', 'is_confirmed', 'date', 'monthly_attendance__employee__place_work')
@@ -231,6 +255,9 @@ class AttendanceDailyAdmin(admin.ModelAdmin):
         return f"{obj.monthly_attendance.employee.employee_no:06d} - {obj.monthly_attendance.employee.last_name}{obj.monthly_attendance.employee.first_name}"
     employee.short_description = '社員'
 
+    def get_monthly(self, obj):
+        return obj.monthly_attendance
+
     def get_fieldsets(self, request, obj=None):
         return (
             ('日別勤怠', {'fields': ('monthly_attendance', 'date', 'work_type', 'start_time', 'end_time', 'notes', 'is_confirmed', 'is_required')}),
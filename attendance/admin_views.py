@@ -10,6 +10,7 @@ from django import forms
 from django.http import HttpResponseRedirect, HttpResponse
 from django.template.loader import render_to_string
 from .pdf_generator import generate_payslip_pdf
+from .utils import load_monthly_structures, load_monthly_structures_range
 from django.contrib import messages
 import calendar
 
@@ -40,12 +41,60 @@ def profile_view(request):
 def attendance_overview(request):
     """
     근태관리 메인 페이지: 전체/부서별 월별 근태정보 표
-    (기본 틀만 구현)
+    올해 1월~해당 월의 근태는 일괄 로더로 한 번에 읽습니다. (쿼리 2회)
     """
-    # 실제 데이터/필터링은 추후 구현
-    employees = Employee.objects.filter(is_active=True)
+    today = timezone.now().date()
+    year = int(request.GET.get('year', today.year))
+    month = int(request.GET.get('month', today.month))
+    place_work = request.GET.get('place_work') or None
+    
+    employees = Employee.objects.filter(is_active=True).order_by('employee_no')
+    if place_work:
+        employees = employees.filter(place_work=place_work)
+    employees = list(employees)
+    
+    monthly_by_employee = load_monthly_structures_range(
+        (year, 1), (year, month), employees=employees
+    )
+    paid_leaves = {
+        paid_leave.employee_id: paid_leave
+        for paid_leave in PaidLeave.objects.filter(employee__in=employees, year=str(year))
+    }
+    
+    current_key = f"{year:04d}-{month:02d}"
+    rows = []
+    for emp in employees:
+        months = monthly_by_employee.get(emp.employee_no, {})
+        current = months.get(current_key)
+        paid_leave = paid_leaves.get(emp.employee_no)
+        total_days = paid_leave.total_days if paid_leave else 0
+        used_days = sum(monthly_data.paid_leave_days for monthly_data in months.values())
+        rows.append({
+            'employee': emp,
+            'monthly_data': current,
+            'overtime': current.total_overtime_hours if current else 0.0,
+            'total_days': total_days,
+            'used_days': used_days,
+            'paid_leave_used': current.paid_leave_days if current else 0.0,
+            'remain_days': total_days - used_days,
+        })
+    avg_overtime = sum(row['overtime'] for row in rows) / len(rows) if rows else 0.0
+    
+    # 월 이동
+    prev_month = month - 1 if month > 1 else 12
+    prev_year = year - 1 if month == 1 else year
+    next_month = month + 1 if month < 12 else 1
+    next_year = year + 1 if month == 12 else year
     context = {
         'employees': employees,
+        'rows': rows,
+        'year': year,
+        'month': str(month).zfill(2),
+        'avg_overtime': avg_overtime,
+        'prev_year': prev_year,
+        'prev_month': str(prev_month).zfill(2),
+        'next_year': next_year,
+        'next_month': str(next_month).zfill(2),
     }
     return render(request, 'admin/attendance/attendance_overview.html', context)
 
@@ -64,16 +113,19 @@ def payroll_view(request):
         employees = Employee.objects.filter(is_active=True)
     else:
         employees = Employee.objects.filter(is_active=True, employee_no=user.employee_no)
-    # 급여명세서 데이터
+    employees = list(employees)
+    # 급여명세서 데이터 (명세서와 근태는 사원별로 조회하지 않고 한 번에 가져옴)
+    payslips = {
+        payslip.employee_id: payslip
+        for payslip in PaySlip.objects.filter(employee__in=employees, year=year, month=month)
+    }
+    monthly_by_employee = load_monthly_structures(int(year), int(month), employees=employees)
     rows = []
     for emp in employees:
-        try:
-            payslip = PaySlip.objects.get(employee=emp, year=year, month=month)
-        except PaySlip.DoesNotExist:
-            payslip = None
         rows.append({
             'employee': emp,
-            'payslip': payslip,
+            'payslip': payslips.get(emp.employee_no),
+            'monthly_data': monthly_by_employee.get(emp.employee_no),
         })
     # 월 이동
     prev_month = int(month) - 1 if int(month) > 1 else 12
@@ -103,7 +155,7 @@ def employee_detail_view(request, employee_no, year=None, month=None):
     month = int(month)
     # 해당 월의 AttendanceMonthly
     try:
-        monthly = AttendanceMonthly.objects.get(employee=employee, year=str(year), month=str(month).zfill(2))
+        monthly = AttendanceMonthly.objects.get(employee=employee, period=AttendanceMonthly.to_period(year, month))
     except AttendanceMonthly.DoesNotExist:
         monthly = None
     # 해당 월의 AttendanceDaily 리스트
@@ -210,7 +262,7 @@ def daily_calendar_view(request, year=None, month=None):
     employees = []
     if selected_date:
         d = selected_date
-        daily_qs = AttendanceDaily.objects.filter(date=d)
+        daily_qs = AttendanceDaily.objects.filter(date=d).select_related('monthly_attendance__employee')
         employees = [dd.monthly_attendance.employee for dd in daily_qs]
         daily_list = list(daily_qs)
     else:
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AttendanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'attendance'
+
+    def ready(self):
+        # 휴일 캘린더 변경 시 캐시 무효화, 응답 후 인접 월 미리 읽기
+        from . import signals  # noqa: F401
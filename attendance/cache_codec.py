@@ -0,0 +1,219 @@
+"""
+MonthlyData 캐시 직렬화 모듈 (바이너리)
+- 1바이트 스키마 버전 + 1바이트 플래그(압축 방식) + 본문
+- 일별 데이터는 열(column) 단위로 array에 담아 한 번에 직렬화합니다.
+  날짜는 월초 기준 일 오프셋, 시각은 분 정수, 근무구분은 고정 코드로 저장합니다.
+- 근무시간 등 계산 필드는 저장하지 않고 복원 시 다시 계산합니다.
+- 본문이 일정 크기 이상이면 lz4(설치된 경우) 또는 zlib으로 압축합니다.
+"""
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date
+from typing import List
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # lz4가 없으면 zlib 사용
+    lz4_frame = None
+
+from .structures import BASE_WORK_TYPES, DailyData, MonthlyData
+
+SCHEMA_VERSION = 1
+
+# 플래그 바이트
+FLAG_ZLIB = 0x01
+FLAG_LZ4 = 0x02
+
+# 이 크기(바이트) 이상인 본문만 압축
+COMPRESS_MIN_SIZE = 512
+
+# 일별 플래그
+_REQUIRED = 0x01
+_CONFIRMED = 0x02
+_HAS_NOTES = 0x04
+_INLINE_WORK_TYPE = 0x08  # 코드표에 없는 근무구분은 문자열로 저장
+
+_NONE = -1  # ID/시각 미입력
+_NO_DATE = -(2 ** 31)  # 대체 근무일 미입력
+_INLINE_CODE = 255
+
+_WORK_TYPE_CODES = {work_type: code for code, work_type in enumerate(BASE_WORK_TYPES)}
+
+# monthly_id, break_minutes, standard_work_hours, 일수
+_HEADER = struct.Struct('<qIdH')
+# 열 순서와 array 타입코드
+_COLUMNS = (
+    ('daily_id', 'q'),
+    ('day', 'h'),
+    ('work_type', 'B'),
+    ('start', 'h'),
+    ('end', 'h'),
+    ('alternative', 'i'),
+    ('flags', 'B'),
+)
+_SWAP = sys.byteorder != 'little'
+
+
+class CacheCodecError(ValueError):
+    """지원하지 않는 버전이거나 손상된 캐시 데이터"""
+
+
+def _pack_strings(values: List[str]) -> bytes:
+    encoded = [value.encode('utf-8') for value in values]
+    lengths = array('I', [len(value) for value in encoded])
+    if _SWAP:
+        lengths.byteswap()
+    return struct.pack('<I', len(encoded)) + lengths.tobytes() + b''.join(encoded)
+
+
+def _unpack_strings(view: memoryview, offset: int):
+    (count,) = struct.unpack_from('<I', view, offset)
+    offset += 4
+    lengths = array('I')
+    lengths.frombytes(view[offset:offset + 4 * count])
+    if _SWAP:
+        lengths.byteswap()
+    offset += 4 * count
+    values = []
+    for length in lengths:
+        values.append(str(view[offset:offset + length], 'utf-8'))
+        offset += length
+    return values, offset
+
+
+def encode_monthly_data(monthly_data: MonthlyData, compress: bool = True) -> bytes:
+    """MonthlyData를 바이너리로 직렬화"""
+    month_start = date(int(monthly_data.year), int(monthly_data.month), 1).toordinal()
+    columns = {name: array(typecode) for name, typecode in _COLUMNS}
+    strings = [
+        str(monthly_data.employee_id), monthly_data.year, monthly_data.month,
+        monthly_data.project_name or '', monthly_data.base_calendar or '',
+    ]
+
+    for daily in monthly_data.daily_list:
+        flags = 0
+        if daily.is_required:
+            flags |= _REQUIRED
+        if daily.is_confirmed:
+            flags |= _CONFIRMED
+        if daily.notes is not None:
+            flags |= _HAS_NOTES
+            strings.append(daily.notes)
+        code = _WORK_TYPE_CODES.get(daily.work_type, _INLINE_CODE)
+        if code == _INLINE_CODE:
+            flags |= _INLINE_WORK_TYPE
+            strings.append(daily.work_type)
+        alternative = daily.alternative_work_date
+
+        columns['daily_id'].append(_NONE if daily.daily_id is None else daily.daily_id)
+        columns['day'].append(daily.date_ordinal - month_start)
+        columns['work_type'].append(code)
+        columns['start'].append(_NONE if daily.start_minutes is None else daily.start_minutes)
+        columns['end'].append(_NONE if daily.end_minutes is None else daily.end_minutes)
+        columns['alternative'].append(_NO_DATE if alternative is None else alternative.toordinal() - month_start)
+        columns['flags'].append(flags)
+
+    parts = [_HEADER.pack(
+        _NONE if monthly_data.monthly_id is None else monthly_data.monthly_id,
+        monthly_data.break_minutes,
+        monthly_data.standard_work_hours,
+        len(monthly_data.daily_list),
+    )]
+    for name, _ in _COLUMNS:
+        column = columns[name]
+        if _SWAP:
+            column.byteswap()
+        parts.append(column.tobytes())
+    parts.append(_pack_strings(strings))
+    body = b''.join(parts)
+
+    flags = 0
+    if compress and len(body) >= COMPRESS_MIN_SIZE:
+        if lz4_frame is not None:
+            body = lz4_frame.compress(body)
+            flags = FLAG_LZ4
+        else:
+            body = zlib.compress(body, 1)
+            flags = FLAG_ZLIB
+    return bytes((SCHEMA_VERSION, flags)) + body
+
+
+def decode_monthly_data(data: bytes) -> MonthlyData:
+    """
+    encode_monthly_data로 직렬화한 바이트에서 MonthlyData 복원 (계산 필드는 재계산)
+    손상된 데이터는 어느 단계에서 실패하든 CacheCodecError로 알립니다. (호출 측은 캐시 미스로 처리)
+    """
+    if len(data) < 2 or data[0] != SCHEMA_VERSION:
+        raise CacheCodecError(f"지원하지 않는 캐시 스키마 버전: {data[:1]!r}")
+    try:
+        return _decode_body(data[1], data[2:])
+    except CacheCodecError:
+        raise
+    except Exception as e:
+        raise CacheCodecError(f"캐시 데이터 손상: {e!r}") from e
+
+
+def _decode_body(flags: int, body: bytes) -> MonthlyData:
+    if flags & FLAG_LZ4:
+        if lz4_frame is None:
+            raise CacheCodecError("lz4로 압축된 캐시지만 lz4가 설치되어 있지 않습니다.")
+        body = lz4_frame.decompress(body)
+    elif flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    view = memoryview(body)
+    monthly_id, break_minutes, standard_work_hours, count = _HEADER.unpack_from(view, 0)
+    offset = _HEADER.size
+    columns = {}
+    for name, typecode in _COLUMNS:
+        column = array(typecode)
+        size = column.itemsize * count
+        column.frombytes(view[offset:offset + size])
+        if _SWAP:
+            column.byteswap()
+        columns[name] = column
+        offset += size
+    strings, offset = _unpack_strings(view, offset)
+
+    employee_id, year, month, project_name, base_calendar = strings[:5]
+    next_string = iter(strings[5:]).__next__
+    month_start = date(int(year), int(month), 1).toordinal()
+
+    daily_list = []
+    for daily_id, day, code, start, end, alternative, day_flags in zip(
+            columns['daily_id'], columns['day'], columns['work_type'], columns['start'],
+            columns['end'], columns['alternative'], columns['flags']):
+        notes = next_string() if day_flags & _HAS_NOTES else None
+        work_type = next_string() if day_flags & _INLINE_WORK_TYPE else BASE_WORK_TYPES[code]
+        daily = DailyData.from_stored(
+            month_start + day,
+            work_type,
+            None if start == _NONE else start,
+            None if end == _NONE else end,
+            None if alternative == _NO_DATE else month_start + alternative,
+            notes,
+            bool(day_flags & _REQUIRED),
+            bool(day_flags & _CONFIRMED),
+            break_minutes,
+            standard_work_hours,
+            daily_id=None if daily_id == _NONE else daily_id,
+        )
+        # 한 달(최대 31일) 정도는 NumPy 일괄 계산보다 개별 계산이 빠름
+        daily.calculate_work_hours()
+        daily_list.append(daily)
+
+    monthly_data = MonthlyData(
+        employee_id=employee_id,
+        year=year,
+        month=month,
+        project_name=project_name,
+        base_calendar=base_calendar,
+        break_minutes=break_minutes,
+        standard_work_hours=standard_work_hours,
+        daily_list=daily_list,
+        monthly_id=None if monthly_id == _NONE else monthly_id,
+    )
+    monthly_data.mark_clean()
+    return monthly_data
@@ -3,17 +3,40 @@ Redis 캐싱 유틸리티 모듈
 월별 근태 데이터의 캐싱을 담당하는 유틸리티 함수들을 제공합니다.
 """
 import json
-import pickle
-from typing import Optional, Dict, Any
-from datetime import datetime, date
+import time as time_module
+import uuid
+import zlib
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from django.core.cache import cache
 from django.conf import settings
 from .models import Employee, AttendanceMonthly
 from .structures import MonthlyData
-from .utils import get_or_create_monthly_structure
+from .cache_codec import CacheCodecError, encode_monthly_data, decode_monthly_data
+from .local_cache import GenerationCounters, VersionedLocalCache
+from .utils import get_or_create_monthly_structure, load_monthly_structures_range
 
+# 월별 데이터용 로컬 LRU 계층 (Redis 앞단, 재생성 중에는 예비 사본 사용 가능)
+monthly_local_cache = VersionedLocalCache('monthly_data', stale_timeout=3600 * 2)
+# 리포트 출력(Excel/PDF)용 로컬 LRU 계층 (항목이 크므로 개수를 적게)
+report_local_cache = VersionedLocalCache('report', max_entries=16)
+REPORT_CACHE_TIMEOUT = 3600
+# 캐시 키에 넣는 세대 카운터 (전체 / 사원별 / 캘린더별)
+cache_generations = GenerationCounters()
+GLOBAL_NAMESPACE = 'global'
+# 어느 캘린더든 바뀌면 올라가는 세대 (기준 캘린더를 모르는 채로 검증할 때 사용)
+CALENDARS_NAMESPACE = 'calendars'
+# (사원, 월)별 버전 스탬프의 유지 시간 (없어지면 새 스탬프가 만들어질 뿐이므로 길게)
+MONTH_VERSION_TIMEOUT = 60 * 60 * 24 * 30
 
-def generate_cache_key(employee_id: str, year: str, month: str) -> str:
+# 월별 근태가 DB에 없다는 것을 나타내는 캐시 값 (캐시 스키마 버전 0은 사용하지 않음)
+ABSENT_MARKER = b'\x00'
+# 없는 달 표시의 유지 시간 (월 생성 시에는 즉시 삭제)
+ABSENT_CACHE_TIMEOUT = 600
+# lookup_cached_monthly_data가 "DB에 없는 달"을 나타낼 때 반환하는 값
+MONTH_ABSENT = object()
+
+
+def generate_cache_key(employee_id: str, year: str, month: str) -> Optional[str]:
     """
     캐시 키를 생성합니다.
     
@@ -23,9 +46,98 @@ def generate_cache_key(employee_id: str, year: str, month: str) -> str:
         month: 월
         
     Returns:
-        캐시 키 문자열
+        캐시 키 문자열 (전체/사원 세대 번호 포함), 세대 번호를 읽지 못하면 None (캐시를 거치지 않음)
+    """
+    employee_namespace = employee_namespace_of(employee_id)
+    generations = cache_generations.get_many([GLOBAL_NAMESPACE, employee_namespace])
+    if None in generations.values():
+        return None
+    return (
+        f"monthly_data:{employee_id}:{year}:{month.zfill(2)}"
+        f":g{generations[GLOBAL_NAMESPACE]}.{generations[employee_namespace]}"
+    )
+
+
+def employee_namespace_of(employee_id: str) -> str:
+    return f"employee:{employee_id}"
+
+
+def calendar_namespace_of(calendar_name: str) -> str:
+    return f"calendar:{calendar_name}"
+
+
+def month_version_key(employee_id: str, year, month) -> str:
+    return f"month_version:{employee_id}:{int(year):04d}-{int(month):02d}"
+
+
+def _new_month_version() -> Tuple[str, float]:
+    # (버전, 변경 시각 epoch 초)
+    return (uuid.uuid4().hex, time_module.time())
+
+
+def get_month_versions(employee_id: str, months: List[Tuple[int, int]]) -> Dict[Tuple[int, int], Tuple[str, float]]:
+    """
+    (사원, 월)별 버전 스탬프를 한 번의 캐시 요청으로 가져옵니다.
+    스탬프가 없는 달은 새로 만들어 둡니다. (동시에 만든 경우 먼저 저장된 것을 사용)
+
+    Returns:
+        {(년, 월): (버전, 변경 시각)}
+    """
+    months = [(int(year), int(month)) for year, month in months]
+    keys = {month: month_version_key(employee_id, *month) for month in months}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for month, key in keys.items():
+        version = found.get(key)
+        if version is None:
+            version = _new_month_version()
+            if not cache.add(key, version, timeout=MONTH_VERSION_TIMEOUT):
+                version = cache.get(key) or version
+        versions[month] = tuple(version)
+    return versions
+
+
+def bump_month_version(employee_id: str, year, month) -> None:
+    """(사원, 월)의 데이터가 바뀌었음을 기록 (ETag/Last-Modified가 바뀜)"""
+    cache.set(month_version_key(employee_id, year, month), _new_month_version(), timeout=MONTH_VERSION_TIMEOUT)
+
+
+def month_writer_key(employee_id: str, year, month) -> str:
+    return f"month_writer:{employee_id}:{int(year):04d}-{int(month):02d}"
+
+
+def get_month_writers(employee_id: str, months: List[Tuple[int, int]]) -> Dict[Tuple[int, int], Optional[str]]:
+    """(사원, 월)별 현재 쓰기 토큰 (없으면 None)"""
+    keys = {(int(year), int(month)): month_writer_key(employee_id, year, month) for year, month in months}
+    found = cache.get_many(keys.values())
+    return {month: found.get(key) for month, key in keys.items()}
+
+
+def claim_month_writes(employee_id: str, months: List[Tuple[int, int]]) -> Dict[Tuple[int, int], str]:
+    """
+    (사원, 월)별 쓰기 토큰을 새로 발급합니다.
+    월별 행을 잠근 트랜잭션 안(커밋 전)에서 호출하므로 토큰은 커밋 순서대로 바뀝니다.
+    """
+    tokens = {(int(year), int(month)): uuid.uuid4().hex for year, month in months}
+    cache.set_many(
+        {month_writer_key(employee_id, *month): token for month, token in tokens.items()},
+        timeout=MONTH_VERSION_TIMEOUT
+    )
+    return tokens
+
+
+def drop_overtaken_months(employee_id: str, tokens: Dict[Tuple[int, int], Optional[str]]) -> None:
+    """
+    캐시에 쓴 직후 호출합니다. DB에서 읽은 뒤 다른 쓰기가 토큰을 바꾼 달은
+    방금 쓴 사본이 최신이 아닐 수 있으므로(커밋 후 캐시 쓰기는 순서가 뒤바뀔 수 있음) 항목을 버립니다.
     """
-    return f"monthly_data:{employee_id}:{year}:{month.zfill(2)}"
+    if not tokens:
+        return
+    current = get_month_writers(employee_id, list(tokens))
+    for (year, month), token in tokens.items():
+        if current[(year, month)] != token:
+            print(f"다른 쓰기가 먼저 커밋되어 캐시 항목을 버림: {employee_id} - {year}/{month}")
+            invalidate_monthly_cache(employee_id, str(year), str(month))
 
 
 def cache_monthly_data(employee_id: str, year: str, month: str, monthly_data: MonthlyData) -> None:
@@ -39,41 +151,90 @@ def cache_monthly_data(employee_id: str, year: str, month: str, monthly_data: Mo
         monthly_data: 캐시할 월별 데이터
     """
     cache_key = generate_cache_key(employee_id, year, month)
+    if cache_key is None:
+        return
     
-    # MonthlyData 객체를 딕셔너리로 직렬화
-    data_dict = {
-        'employee_id': monthly_data.employee_id,
-        'year': monthly_data.year,
-        'month': monthly_data.month,
-        'project_name': monthly_data.project_name,
-        'base_calendar': monthly_data.base_calendar,
-        'break_minutes': monthly_data.break_minutes,
-        'standard_work_hours': monthly_data.standard_work_hours,
-        'daily_list': []
-    }
+    # 바이너리로 직렬화하여 캐시에 저장 (TTL: 1시간, 로컬 계층에도 저장)
+    monthly_local_cache.set(cache_key, encode_monthly_data(monthly_data), timeout=3600)
+
+
+def cache_absent_month(employee_id: str, year: str, month: str) -> None:
+    """
+    월별 데이터가 DB에 없다는 것을 캐시에 기록합니다. (TTL: ABSENT_CACHE_TIMEOUT)
+    월을 생성하는 쪽에서 invalidate_monthly_cache로 지워야 합니다.
+    """
+    cache_key = generate_cache_key(employee_id, year, month)
+    if cache_key is not None:
+        monthly_local_cache.set(cache_key, ABSENT_MARKER, timeout=ABSENT_CACHE_TIMEOUT)
+
+
+def _decode_cached(cache_key: str, cached_data):
+    """캐시 값을 MonthlyData(또는 MONTH_ABSENT)로 복원. 손상된 값은 삭제하고 None"""
+    if cached_data == ABSENT_MARKER:
+        return MONTH_ABSENT
     
-    # 일별 데이터도 직렬화
-    for daily in monthly_data.daily_list:
-        daily_dict = {
-            'date': daily.date.isoformat(),
-            'work_type': daily.work_type,
-            'start_time': daily.start_time.isoformat() if daily.start_time else None,
-            'end_time': daily.end_time.isoformat() if daily.end_time else None,
-            'alternative_work_date': daily.alternative_work_date.isoformat() if daily.alternative_work_date else None,
-            'notes': daily.notes,
-            'is_confirmed': daily.is_confirmed,
-            'break_minutes': daily.break_minutes,
-            'standard_work_hours': daily.standard_work_hours,
-            'regular_work_hours': daily.regular_work_hours,
-            'deduction_hours': daily.deduction_hours,
-            'overtime_hours': daily.overtime_hours,
-            'late_night_overtime_hours': daily.late_night_overtime_hours,
-            'total_hours': daily.total_hours
-        }
-        data_dict['daily_list'].append(daily_dict)
+    try:
+        return decode_monthly_data(cached_data)
+        
+    except (CacheCodecError, TypeError) as e:
+        # 캐시 데이터가 손상되었거나 모르는 버전이면 캐시 삭제
+        monthly_local_cache.delete(cache_key)
+        print(f"캐시 데이터 역직렬화 오류: {e}")
+        return None
+
+
+def lookup_cached_monthly_data(employee_id: str, year: str, month: str):
+    """
+    캐시에서 월별 데이터를 찾습니다.
+    
+    Returns:
+        MonthlyData 객체, DB에 없는 달로 기록되어 있으면 MONTH_ABSENT, 캐시에 없으면 None
+    """
+    cache_key = generate_cache_key(employee_id, year, month)
+    if cache_key is None:
+        return None
+    cached_data = monthly_local_cache.get(cache_key)
     
-    # JSON으로 직렬화하여 캐시에 저장 (TTL: 1시간)
-    cache.set(cache_key, json.dumps(data_dict), timeout=3600)
+    if not cached_data:
+        return None
+    return _decode_cached(cache_key, cached_data)
+
+
+def lookup_cached_monthly_bundle(employee_id: str, months: List[Tuple[int, int]]) -> Dict[Tuple[int, int], Any]:
+    """
+    여러 달을 한 번의 캐시 요청(MGET)으로 찾습니다.
+    
+    Returns:
+        {(년, 월): MonthlyData / MONTH_ABSENT / None(캐시에 없음)}
+    """
+    keys = {month: generate_cache_key(employee_id, str(month[0]), str(month[1])) for month in months}
+    cached = monthly_local_cache.get_many(key for key in keys.values() if key is not None)
+    result = {}
+    for month, cache_key in keys.items():
+        cached_data = cached.get(cache_key) if cache_key is not None else None
+        result[month] = _decode_cached(cache_key, cached_data) if cached_data else None
+    return result
+
+
+def cache_monthly_bundle(employee_id: str, months: Dict[Tuple[int, int], Optional[MonthlyData]],
+                         build_seconds: float = 0.0) -> None:
+    """
+    여러 달을 한 번의 캐시 요청(파이프라인)으로 저장합니다.
+    None인 달은 DB에 없는 달로 기록합니다. (TTL이 달라서 별도 요청)
+    build_seconds는 DB에서 읽는 데 걸린 시간 (만료 전 확률적 갱신에 사용)
+    """
+    present = {}
+    absent = {}
+    for (year, month), monthly_data in months.items():
+        cache_key = generate_cache_key(employee_id, str(year), str(month))
+        if cache_key is None:
+            continue
+        if monthly_data:
+            present[cache_key] = encode_monthly_data(monthly_data)
+        else:
+            absent[cache_key] = ABSENT_MARKER
+    monthly_local_cache.set_many(present, timeout=3600, build_seconds=build_seconds)
+    monthly_local_cache.set_many(absent, timeout=ABSENT_CACHE_TIMEOUT, build_seconds=build_seconds)
 
 
 def get_cached_monthly_data(employee_id: str, year: str, month: str) -> Optional[MonthlyData]:
@@ -86,62 +247,10 @@ def get_cached_monthly_data(employee_id: str, year: str, month: str) -> Optional
         month: 월
         
     Returns:
-        캐시된 MonthlyData 객체 또는 None
+        캐시된 MonthlyData 객체 또는 None (캐시에 없거나 DB에 없는 달)
     """
-    cache_key = generate_cache_key(employee_id, year, month)
-    cached_data = cache.get(cache_key)
-    
-    if not cached_data:
-        return None
-    
-    try:
-        # JSON에서 딕셔너리로 역직렬화
-        data_dict = json.loads(cached_data)
-        
-        # MonthlyData 객체 재구성
-        from .structures import DailyData
-        
-        # 일별 데이터 재구성
-        daily_list = []
-        for daily_dict in data_dict['daily_list']:
-            daily = DailyData(
-                date=date.fromisoformat(daily_dict['date']),
-                work_type=daily_dict['work_type'],
-                start_time=datetime.fromisoformat(daily_dict['start_time']).time() if daily_dict['start_time'] else None,
-                end_time=datetime.fromisoformat(daily_dict['end_time']).time() if daily_dict['end_time'] else None,
-                alternative_work_date=date.fromisoformat(daily_dict['alternative_work_date']) if daily_dict['alternative_work_date'] else None,
-                notes=daily_dict['notes'],
-                is_confirmed=daily_dict['is_confirmed'],
-                break_minutes=daily_dict['break_minutes'],
-                standard_work_hours=daily_dict['standard_work_hours']
-            )
-            # 계산된 값들 복원
-            daily.regular_work_hours = daily_dict['regular_work_hours']
-            daily.deduction_hours = daily_dict['deduction_hours']
-            daily.overtime_hours = daily_dict['overtime_hours']
-            daily.late_night_overtime_hours = daily_dict['late_night_overtime_hours']
-            daily.total_hours = daily_dict['total_hours']
-            daily_list.append(daily)
-        
-        # MonthlyData 객체 생성
-        monthly_data = MonthlyData(
-            employee_id=data_dict['employee_id'],
-            year=data_dict['year'],
-            month=data_dict['month'],
-            project_name=data_dict['project_name'],
-            base_calendar=data_dict['base_calendar'],
-            break_minutes=data_dict['break_minutes'],
-            standard_work_hours=data_dict['standard_work_hours'],
-            daily_list=daily_list
-        )
-        
-        return monthly_data
-        
-    except (json.JSONDecodeError, KeyError, ValueError) as e:
-        # 캐시 데이터가 손상된 경우 캐시 삭제
-        cache.delete(cache_key)
-        print(f"캐시 데이터 역직렬화 오류: {e}")
-        return None
+    cached_data = lookup_cached_monthly_data(employee_id, year, month)
+    return None if cached_data is MONTH_ABSENT else cached_data
 
 
 def invalidate_monthly_cache(employee_id: str, year: str, month: str) -> None:
@@ -154,7 +263,11 @@ def invalidate_monthly_cache(employee_id: str, year: str, month: str) -> None:
         month: 월
     """
     cache_key = generate_cache_key(employee_id, year, month)
-    cache.delete(cache_key)
+    if cache_key is None:
+        # 어느 키인지 알 수 없으면 그 사원의 항목 전체를 버림
+        invalidate_employee_cache(employee_id)
+        return
+    monthly_local_cache.delete(cache_key)
 
 
 def invalidate_employee_cache(employee_id: str) -> None:
@@ -164,9 +277,28 @@ def invalidate_employee_cache(employee_id: str) -> None:
     Args:
         employee_id: 사원번호
     """
-    # Redis에서 패턴 매칭으로 해당 사원의 모든 캐시 삭제
-    pattern = f"techave_kintai:monthly_data:{employee_id}:*"
-    cache.delete_pattern(pattern)
+    # 사원 세대 번호를 올리면 이전 키는 더 이상 참조되지 않고 TTL로 만료됨
+    cache_generations.bump(employee_namespace_of(employee_id))
+    monthly_local_cache.delete_local_prefix(f"monthly_data:{employee_id}:")
+
+
+def invalidate_calendar_cache(calendar_name: str) -> None:
+    """
+    특정 캘린더(base_calendar)의 캐시를 무효화합니다.
+    
+    Args:
+        calendar_name: 캘린더 이름
+    """
+    cache_generations.bump(calendar_namespace_of(calendar_name))
+    cache_generations.bump(CALENDARS_NAMESPACE)
+
+
+def invalidate_all_cache() -> None:
+    """
+    근태 캐시 전체를 무효화합니다. (전체 세대 번호를 올림)
+    """
+    cache_generations.bump(GLOBAL_NAMESPACE)
+    monthly_local_cache.clear_local()
 
 
 def get_monthly_data_with_cache(employee: Employee, year: str, month: str) -> Optional[MonthlyData]:
@@ -182,28 +314,121 @@ def get_monthly_data_with_cache(employee: Employee, year: str, month: str) -> Op
         MonthlyData 객체 또는 None
     """
     employee_id = employee.employee_no
+    cache_key = generate_cache_key(employee_id, year, month)
+    if cache_key is None:
+        print(f"세대 번호를 읽지 못해 캐시 없이 DB에서 로드: {employee_id} - {year}/{month}")
+        return get_or_create_monthly_structure(employee, year, month)
+    built = {}
     
-    # 1. 캐시에서 먼저 확인
-    cached_data = get_cached_monthly_data(employee_id, year, month)
-    if cached_data:
-        print(f"캐시에서 데이터 로드: {employee_id} - {year}/{month}")
-        return cached_data
-    
-    # 2. 캐시에 없으면 DB에서 가져오기
-    print(f"DB에서 데이터 로드: {employee_id} - {year}/{month}")
-    monthly_data = get_or_create_monthly_structure(employee, year, month)
+    def build():
+        # 캐시에 없으면 DB에서 가져와서 캐시에 저장 (없으면 없는 달로 기록)
+        built['writers'] = get_month_writers(employee_id, [(int(year), int(month))])
+        print(f"DB에서 데이터 로드: {employee_id} - {year}/{month}")
+        monthly_data = built['monthly_data'] = get_or_create_monthly_structure(employee, year, month)
+        if monthly_data:
+            print(f"캐시에 데이터 저장: {employee_id} - {year}/{month}")
+            return encode_monthly_data(monthly_data), 3600
+        return ABSENT_MARKER, ABSENT_CACHE_TIMEOUT
     
-    # 3. DB에서 가져온 데이터를 캐시에 저장
-    if monthly_data:
-        cache_monthly_data(employee_id, year, month, monthly_data)
-        print(f"캐시에 데이터 저장: {employee_id} - {year}/{month}")
+    # 캐시 우선, 재생성은 요청 하나만 수행 (동시 요청은 대기 후 결과 또는 예비 사본 사용)
+    cached_data = monthly_local_cache.get_or_build(cache_key, build)
+    if 'monthly_data' in built:
+        # 읽는 동안 쓰기가 커밋되었으면 방금 저장한 사본은 버림
+        drop_overtaken_months(employee_id, built['writers'])
+        return built['monthly_data']
     
+    monthly_data = _decode_cached(cache_key, cached_data)
+    if monthly_data is MONTH_ABSENT:
+        return None
+    if monthly_data is None:
+        # 캐시 값이 손상된 경우 DB에서 직접 읽음
+        return get_or_create_monthly_structure(employee, year, month)
+    print(f"캐시에서 데이터 로드: {employee_id} - {year}/{month}")
     return monthly_data
 
 
+def get_report_with_cache(employee: Employee, year, month, kind: str, build: Callable[[], bytes]) -> bytes:
+    """
+    리포트 출력(Excel/PDF 바이트)을 월별 데이터의 버전별로 캐시합니다.
+    월별 데이터가 바뀌면 버전이, 휴일 캘린더가 바뀌면 캘린더 세대가 달라지므로 무효화는 필요 없습니다.
+    월별 데이터가 없으면 캐시하지 않고 build()를 그대로 호출합니다.
+    
+    Args:
+        employee: 사원 객체
+        year: 년도
+        month: 월
+        kind: 리포트 종류 ('excel', 'pdf' 등)
+        build: 리포트 바이트를 만드는 함수
+    """
+    year, month = str(year), str(month)
+    month_key = generate_cache_key(employee.employee_no, year, month)
+    calendars = cache_generations.get(CALENDARS_NAMESPACE)
+    if month_key is None or calendars is None:
+        return build()
+    # 월별 데이터는 복원하지 않고 캐시 항목의 버전 스탬프만 확인
+    value, version = monthly_local_cache.get_with_version(month_key)
+    if value is None:
+        # 캐시에 없으면 한 번 읽어 캐시에 올린 뒤 다시 확인
+        if get_monthly_data_with_cache(employee, year, month) is None:
+            return build()
+        value, version = monthly_local_cache.get_with_version(month_key)
+    if value is None or value == ABSENT_MARKER or version is None:
+        return build()
+    
+    # 표시 이름과 휴일 캘린더도 리포트에 들어가므로 키에 포함
+    name_hash = zlib.crc32(employee.display_name.encode('utf-8'))
+    report_key = f"report:{kind}:{month_key}:{version}:c{calendars}:{name_hash:08x}"
+    return report_local_cache.get_or_build(report_key, lambda: (build(), REPORT_CACHE_TIMEOUT))
+
+
+def get_monthly_bundle_with_cache(employee: Employee, months: List[Tuple[int, int]]) -> Dict[str, Optional[MonthlyData]]:
+    """
+    여러 달을 캐시 우선으로 가져옵니다.
+    캐시 조회 1회(MGET), 캐시에 없는 달은 일괄 로더로 DB에서 한 번에 읽고(쿼리 2회)
+    캐시 저장도 한 번에 합니다.
+    
+    Args:
+        employee: 사원 객체
+        months: [(년, 월), ...]
+        
+    Returns:
+        월별 데이터 딕셔너리 (키: "YYYY-MM" 형식, DB에 없는 달은 None)
+    """
+    employee_id = employee.employee_no
+    months = [(int(year), int(month)) for year, month in months]
+    cached = lookup_cached_monthly_bundle(employee_id, months)
+    
+    result = {}
+    missing = []
+    for year, month in months:
+        monthly_data = cached[(year, month)]
+        if monthly_data is MONTH_ABSENT:
+            monthly_data = None
+        elif monthly_data is None:
+            missing.append((year, month))
+        result[f"{year:04d}-{month:02d}"] = monthly_data
+    
+    if missing:
+        writers = get_month_writers(employee_id, missing)
+        print(f"DB에서 데이터 로드: {employee_id} - {missing}")
+        started = time_module.monotonic()
+        loaded = load_monthly_structures_range(
+            min(missing), max(missing), employees=[employee_id]
+        ).get(employee_id, {})
+        build_seconds = time_module.monotonic() - started
+        fetched = {}
+        for year, month in missing:
+            key = f"{year:04d}-{month:02d}"
+            fetched[(year, month)] = result[key] = loaded.get(key)
+        cache_monthly_bundle(employee_id, fetched, build_seconds=build_seconds)
+        drop_overtaken_months(employee_id, writers)
+    
+    return result
+
+
 def preload_adjacent_months(employee: Employee, current_year: int, current_month: int) -> Dict[str, Optional[MonthlyData]]:
     """
-    현재 월과 인접한 월들의 데이터를 미리 로드합니다.
+    현재 월과 인접한 월들(이전 월, 현재 월, 다음 월)의 데이터를 한 번에 로드합니다.
     
     Args:
         employee: 사원 객체
@@ -213,30 +438,10 @@ def preload_adjacent_months(employee: Employee, current_year: int, current_month
     Returns:
         월별 데이터 딕셔너리 (키: "YYYY-MM" 형식)
     """
-    preloaded_data = {}
-    
-    # 이전 월, 현재 월, 다음 월 (총 3개월)
-    months_to_load = [
-        (current_year, current_month - 1),
-        (current_year, current_month),
-        (current_year, current_month + 1)
-    ]
-    
-    for year, month in months_to_load:
-        # 월이 0이거나 13이 되는 경우 처리
-        if month == 0:
-            year -= 1
-            month = 12
-        elif month == 13:
-            year += 1
-            month = 1
-        
-        # 데이터 로드 (캐시 우선)
-        monthly_data = get_monthly_data_with_cache(employee, str(year), str(month))
-        key = f"{year:04d}-{month:02d}"
-        preloaded_data[key] = monthly_data
-    
-    return preloaded_data
+    current_year, current_month = int(current_year), int(current_month)
+    prev_month = (current_year - 1, 12) if current_month == 1 else (current_year, current_month - 1)
+    next_month = (current_year + 1, 1) if current_month == 12 else (current_year, current_month + 1)
+    return get_monthly_bundle_with_cache(employee, [prev_month, (current_year, current_month), next_month])
 
 
 def get_monthly_attendance(employee_id, year, month):
@@ -0,0 +1,97 @@
+"""
+조건부 GET 모듈
+(사원, 월) 버전 스탬프로 ETag / Last-Modified를 만들어
+바뀌지 않았으면 월별 데이터를 읽지 않고 304를 돌려줍니다.
+- 버전 스탬프는 저장소(MonthlyRepository)가 쓸 때마다 바꿉니다.
+- 사원/전체 세대 번호도 ETag에 넣으므로 일괄 무효화도 반영됩니다.
+- 응답에는 Cache-Control: private, no-cache를 붙여 브라우저가 매번 재검증하게 합니다.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from django.template.loader import get_template
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .cache_utils import GLOBAL_NAMESPACE, cache_generations, employee_namespace_of, get_month_versions
+
+
+@lru_cache(maxsize=None)
+def template_stamp(template_name: str) -> str:
+    """템플릿 파일의 수정 시각 (배포로 화면이 바뀌면 ETag도 바뀌도록)"""
+    origin = getattr(get_template(template_name), 'origin', None)
+    try:
+        return str(os.path.getmtime(origin.name))
+    except (AttributeError, OSError, TypeError):
+        return ''
+
+
+def _month_state(request, months: List[Tuple[int, int]]):
+    # etag_func / last_modified_func가 같은 요청에서 두 번 읽지 않도록 요청 객체에 보관
+    memo = request.__dict__.setdefault('_month_state', {})
+    state_key = tuple(months)
+    if state_key not in memo:
+        employee_id = request.user.employee_no
+        employee_namespace = employee_namespace_of(employee_id)
+        generations = cache_generations.get_many([GLOBAL_NAMESPACE, employee_namespace])
+        memo[state_key] = (
+            employee_id,
+            (generations[GLOBAL_NAMESPACE], generations[employee_namespace]),
+            get_month_versions(employee_id, months),
+        )
+    return memo[state_key]
+
+
+def month_conditional(months_of: Callable[..., Optional[Iterable[Tuple[int, int]]]],
+                      extra_of: Optional[Callable[..., Iterable]] = None):
+    """
+    월별 데이터에 기반한 GET 뷰를 조건부 GET으로 만드는 데코레이터
+
+    Args:
+        months_of: request → 응답이 의존하는 [(년, 월), ...] (None이면 조건부 처리하지 않음)
+        extra_of: request → 월별 데이터 외에 응답을 바꾸는 값들 (ETag에만 반영,
+                  이 값에는 변경 시각이 없으므로 지정하면 Last-Modified는 내지 않음)
+    """
+    def _months(request, *args, **kwargs):
+        try:
+            months = months_of(request, *args, **kwargs)
+        except (TypeError, ValueError):
+            return None
+        return [(int(year), int(month)) for year, month in months] if months else None
+
+    def etag_func(request, *args, **kwargs):
+        months = _months(request, *args, **kwargs)
+        if months is None:
+            return None
+        employee_id, generations, versions = _month_state(request, months)
+        extras = list(extra_of(request, *args, **kwargs)) if extra_of is not None else []
+        if None in generations or None in extras:
+            # 세대 번호를 읽지 못했으면 변경 여부를 알 수 없으므로 조건부 처리하지 않음
+            return None
+        parts = [employee_id, '%s.%s' % generations]
+        parts.extend(f"{year:04d}-{month:02d}:{versions[(year, month)][0]}" for year, month in months)
+        parts.extend(str(value) for value in extras)
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def last_modified_func(request, *args, **kwargs):
+        months = _months(request, *args, **kwargs)
+        if months is None or extra_of is not None:
+            return None
+        _, generations, versions = _month_state(request, months)
+        if None in generations:
+            return None
+        return datetime.fromtimestamp(max(modified for _, modified in versions.values()), tz=timezone.utc)
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view_func)
+
+        @wraps(view_func)
+        def inner(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return inner
+    return decorator
@@ -1,13 +1,24 @@
+"""
+가동보고서(엑셀) 생성 모듈
+라벨, 병합, 스타일, 열 너비/행 높이, 시트 보호 같은 정적 레이아웃은 템플릿으로 한 번만 그리고
+보고서마다 템플릿을 복제해 값과 휴일 행 강조만 씁니다.
+- 템플릿은 실제로 쓰는 스타일만 남긴 워크북 (셀은 워크북 스타일 테이블의 인덱스만 가짐)
+- 복제는 스타일 테이블과 셀의 스타일 인덱스를 복사할 뿐 Font/Fill/Border 객체를 만들지 않음
+"""
+from copy import copy
+from functools import lru_cache
+
 import openpyxl
+from openpyxl.cell.cell import Cell, MergedCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, Protection
 from openpyxl.utils import get_column_letter
+from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.worksheet.merge import MergedCellRange
 from datetime import datetime, date
 from .models import AttendanceMonthly, AttendanceDaily
-from .utils import get_or_create_monthly_structure
-from calendar import monthrange
+from .repository import monthly_repository
+from .month_skeleton import get_month_skeleton, is_holiday_work_type
 import calendar
-import tkinter as tk
-from tkinter import ttk
 
 # 스타일 상수 정의
 class ExcelStyles:
@@ -31,12 +42,113 @@ class ExcelStyles:
     HEADER_FONT = Font(size=12, bold=True)
     NORMAL_FONT = Font(size=10)
     SMALL_FONT = Font(size=8)
+    HOLIDAY_FONT = Font(color="FF0000")
     
     # 정렬 정의
     CENTER_ALIGN = Alignment(horizontal="center", vertical="center", wrap_text=True)
     RIGHT_ALIGN = Alignment(horizontal="right", vertical="center", wrap_text=True)
     LEFT_ALIGN = Alignment(horizontal="left", vertical="center", wrap_text=True)
 
+SHEET_TITLE = "稼働報告書"
+# 템플릿에서 복사하는 워크북 단위 스타일 테이블
+_STYLE_TABLES = ('_fonts', '_fills', '_borders', '_alignments', '_protections', '_number_formats', '_cell_styles')
+
+
+class ReportTemplate:
+    """정적 레이아웃만 그린 보고서 템플릿 (불변, 여러 요청/스레드에서 공유)"""
+    __slots__ = ('workbook', 'worksheet', 'cells', 'merged')
+
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self.worksheet = workbook.active
+        # (행, 열, 값, 데이터형, 스타일 배열, 병합된 셀 여부)
+        self.cells = tuple(
+            (row, column, cell._value, cell.data_type, cell._style, isinstance(cell, MergedCell))
+            for (row, column), cell in sorted(self.worksheet._cells.items())
+        )
+        self.merged = tuple(merged_range.coord for merged_range in self.worksheet.merged_cells.ranges)
+
+    def clone(self):
+        """템플릿과 같은 레이아웃의 새 워크북 (스타일은 인덱스만 복사)"""
+        workbook = openpyxl.Workbook()
+        for name in _STYLE_TABLES:
+            setattr(workbook, name, IndexedList(getattr(self.workbook, name)))
+        
+        worksheet = workbook.active
+        worksheet.title = self.worksheet.title
+        # 병합 범위는 셀보다 먼저 등록 (MergedCellRange가 좌상단 셀의 테두리를 바꾸므로 템플릿 셀로 덮어씀)
+        for coord in self.merged:
+            worksheet.merged_cells.add(MergedCellRange(worksheet, coord))
+        cells = worksheet._cells
+        for row, column, value, data_type, style, merged in self.cells:
+            if merged:
+                cell = MergedCell(worksheet, row=row, column=column)
+                cell._style = copy(style)
+            else:
+                cell = Cell(worksheet, row=row, column=column, style_array=copy(style))
+                cell._value = value
+                cell.data_type = data_type
+            cells[(row, column)] = cell
+        
+        _copy_sheet_settings(self.worksheet, worksheet)
+        return workbook
+
+
+def _copy_sheet_settings(source, target):
+    """열 너비/행 높이, 시트 보호 등 셀 밖의 시트 설정을 복사"""
+    for attr in ('row_dimensions', 'column_dimensions'):
+        target_dimensions = getattr(target, attr)
+        for key, dimension in getattr(source, attr).items():
+            target_dimensions[key] = copy(dimension)
+            target_dimensions[key].worksheet = target
+    target.protection = copy(source.protection)
+    target.sheet_format = copy(source.sheet_format)
+    target.page_margins = copy(source.page_margins)
+    target.page_setup = copy(source.page_setup)
+    target.print_options = copy(source.print_options)
+
+
+def _compact_workbook(draft):
+    """
+    초안 워크북을 실제로 쓰는 스타일만 가진 워크북으로 옮김
+    (여러 단계에 걸쳐 덮어쓴 중간 스타일이 파일에 남지 않도록)
+    """
+    workbook = openpyxl.Workbook()
+    source = draft.active
+    target = workbook.active
+    target.title = source.title
+    for merged_range in source.merged_cells.ranges:
+        target.merge_cells(merged_range.coord)
+    
+    for (row, column), source_cell in sorted(source._cells.items()):
+        target_cell = target._cells.get((row, column)) or target.cell(row=row, column=column)
+        if not isinstance(source_cell, MergedCell):
+            target_cell._value = source_cell._value
+            target_cell.data_type = source_cell.data_type
+        if source_cell.has_style:
+            target_cell.font = copy(source_cell.font)
+            target_cell.fill = copy(source_cell.fill)
+            target_cell.border = copy(source_cell.border)
+            target_cell.alignment = copy(source_cell.alignment)
+            target_cell.protection = copy(source_cell.protection)
+            target_cell.number_format = source_cell.number_format
+    
+    _copy_sheet_settings(source, target)
+    return workbook
+
+
+@lru_cache(maxsize=1)
+def get_report_template() -> ReportTemplate:
+    """보고서 템플릿 (프로세스에서 처음 한 번만 그림)"""
+    draft = ExcelReportGenerator(None, None, None)._build_template()
+    return ReportTemplate(_compact_workbook(draft))
+
+
+def clear_report_template() -> None:
+    """메모해 둔 템플릿을 버림 (레이아웃 변경/테스트용)"""
+    get_report_template.cache_clear()
+
+
 # 엑셀 생성 클래스
 class ExcelReportGenerator:
     def __init__(self, employee, year, month):
@@ -46,46 +158,33 @@ class ExcelReportGenerator:
         self.workbook = None
         self.worksheet = None
         self.styles = ExcelStyles()
+        self.holiday_rows = set()
         
     def generate_report(self):
         """가동보고서 엑셀 파일을 생성합니다."""
         try:
-            # 구조체 기반으로 월별 데이터 가져오기
-            monthly_data = get_or_create_monthly_structure(
+            # 저장소에서 월별 데이터 가져오기 (캐시 우선)
+            monthly_data = monthly_repository.get(
                 employee=self.employee,
-                year=str(self.year),
-                month=str(self.month)
+                year=self.year,
+                month=self.month
             )
             
             if not monthly_data:
                 raise ValueError("該当月の情報が見つかりません。")
             
-            # 엑셀 워크북 생성
-            self.workbook = openpyxl.Workbook()
+            # 정적 레이아웃은 템플릿을 복제 (프로세스에서 한 번만 그림)
+            self.workbook = get_report_template().clone()
             self.worksheet = self.workbook.active
-            self.worksheet.title = "稼働報告書"
-
-            # 1단계: 기본 스타일 적용
-            self._apply_base_styles()
             
-            # 2단계: 데이터 입력
+            # 값만 입력
             self._create_header_data()
             self._create_monthly_info_data(monthly_data)
-            self._create_daily_table_data(monthly_data.daily_list)
-            
-            # 3단계: 디자인 적용
-            self._apply_header_design()
-            self._apply_table_design()
-            self._apply_column_widths()
-            self._apply_row_heights()
-            # 표 테두리만 적용
-            self._add_table_borders()
-            
-            # 4단계: 시트 보호 설정
-            self._apply_sheet_protection()
+            skeleton = get_month_skeleton(self.year, self.month, monthly_data.base_calendar)
+            self._create_daily_table_data(skeleton, monthly_data.daily_list)
             
-            # 5단계: 세로 중앙 정렬 적용
-            self._apply_vertical_center()
+            # 값에 따라 달라지는 서식 (휴일 행의 요일 셀)
+            self._apply_holiday_design()
             
             return self.workbook
             
@@ -93,6 +192,36 @@ class ExcelReportGenerator:
             print(f"Excel generation error: {e}")
             raise
 
+    def _build_template(self):
+        """값 없이 정적 레이아웃만 그린 워크북 (get_report_template에서 한 번만 호출)"""
+        self.workbook = openpyxl.Workbook()
+        self.worksheet = self.workbook.active
+        self.worksheet.title = SHEET_TITLE
+        
+        # 1단계: 기본 스타일 적용
+        self._apply_base_styles()
+        
+        # 2단계: 라벨과 병합
+        self._create_header_labels()
+        self._create_monthly_info_labels()
+        self._create_daily_table_labels()
+        
+        # 3단계: 디자인 적용
+        self._apply_header_design()
+        self._apply_table_design()
+        self._apply_column_widths()
+        self._apply_row_heights()
+        # 표 테두리만 적용
+        self._add_table_borders()
+        
+        # 4단계: 시트 보호 설정
+        self._apply_sheet_protection()
+        
+        # 5단계: 세로 중앙 정렬 적용
+        self._apply_vertical_center()
+        
+        return self.workbook
+
     def _apply_base_styles(self):
         """기본 스타일을 적용합니다."""
         # 시트 전체에 기본 비활성 스타일(회색 배경) 적용
@@ -100,8 +229,8 @@ class ExcelReportGenerator:
             for cell in row:
                 cell.fill = self.styles.INACTIVE_FILL
 
-    def _create_header_data(self):
-        """헤더 데이터를 입력합니다."""
+    def _create_header_labels(self):
+        """헤더 라벨과 병합 (템플릿)"""
         # 버전넘버
         self.worksheet['O1'] = "TA2025v1. 00"
         
@@ -110,7 +239,6 @@ class ExcelReportGenerator:
         self.worksheet.merge_cells('B2:G3')
         
         # 보고서 시기
-        self.worksheet['J2'] = f"{self.year}年 {self.month}月"
         self.worksheet.merge_cells('J2:K2')
         
         # 도장 섹션
@@ -133,24 +261,26 @@ class ExcelReportGenerator:
         
         # 작성자 정보
         self.worksheet['H7'] = "作成者 : "
-        self.worksheet['I7'] = f"{self.employee.display_name or self.employee.employee_no}"
         self.worksheet.merge_cells('I7:K7')
 
-    def _create_monthly_info_data(self, monthly_data):
-        """월별 정보 데이터를 입력합니다."""
+    def _create_header_data(self):
+        """헤더 데이터를 입력합니다."""
+        # 보고서 시기
+        self.worksheet['J2'] = f"{self.year}年 {self.month}月"
+        
+        # 작성자 정보
+        self.worksheet['I7'] = f"{self.employee.display_name or self.employee.employee_no}"
+
+    def _create_monthly_info_labels(self):
+        """월별 정보 라벨과 병합 (템플릿)"""
         # 상단 정보 (6-7행)
         self.worksheet['C6'] = "カレンダー : "
-        self.worksheet['E6'] = monthly_data.base_calendar
-        
         self.worksheet['H6'] = "PJ名 : "
         self.worksheet.merge_cells('I6:K6')
-        self.worksheet['I6'] = monthly_data.project_name
         
         # 휴게 시간과 기준 시간 (7행)
         self.worksheet['C7'] = "昼休み区分 : "
-        self.worksheet['E7'] = f"{monthly_data.break_minutes}分間"
         self.worksheet['F7'] = "基準時間 : "
-        self.worksheet['G7'] = f"{monthly_data.standard_work_hours}Hr"
         
         # 하단 통계 정보 (44-45행)
         # 라벨 (44행)
@@ -166,6 +296,17 @@ class ExcelReportGenerator:
         for i, (label, col) in enumerate(zip(labels, columns)):
             cell = self.worksheet[f'{col}44']
             cell.value = label
+        self.worksheet.merge_cells('N45:O45')
+
+    def _create_monthly_info_data(self, monthly_data):
+        """월별 정보 데이터를 입력합니다."""
+        # 상단 정보 (6-7행)
+        self.worksheet['E6'] = monthly_data.base_calendar
+        self.worksheet['I6'] = monthly_data.project_name
+        
+        # 휴게 시간과 기준 시간 (7행)
+        self.worksheet['E7'] = f"{monthly_data.break_minutes}分間"
+        self.worksheet['G7'] = f"{monthly_data.standard_work_hours}Hr"
         
         # 데이터 (45행)
         self.worksheet['D45'] = f"{monthly_data.work_days:.1f}"
@@ -179,11 +320,10 @@ class ExcelReportGenerator:
         self.worksheet['L45'] = f"{getattr(monthly_data, 'holiday_overtime_hours', 0):.2f}"
         self.worksheet['M45'] = f"{getattr(monthly_data, 'holiday_late_night_overtime_hours', 0):.2f}"
         overtime_conversion = f"{getattr(monthly_data, 'overtime_conversion_hours', monthly_data.total_overtime_hours + monthly_data.total_late_night_overtime_hours):.2f}"
-        self.worksheet.merge_cells('N45:O45')
         self.worksheet['N45'] = overtime_conversion
 
-    def _create_daily_table_data(self, daily_list):
-        """일별 정보 테이블 데이터를 입력합니다."""
+    def _create_daily_table_labels(self):
+        """일별 정보 테이블의 헤더와 합계 행 (템플릿)"""
         # 테이블 헤더 (11행) - 개행문자 포함
         headers = [
             "月/日", 
@@ -205,41 +345,39 @@ class ExcelReportGenerator:
             cell.value = header
         self.worksheet.merge_cells('M11:O11')
 
-        # 해당 월의 총 일수 계산
-        _, last_day = monthrange(self.year, self.month)
-        
-        # daily_list를 날짜별로 딕셔너리로 변환 (빠른 검색을 위해)
-        daily_dict = {}
-        for daily in daily_list:
-            daily_dict[daily.date.day] = daily
+        # 합계 표시
+        self.worksheet['B43'] = "合 計"
+        self.worksheet.merge_cells('B43:C43')
         
-        # 테이블 데이터 입력
+        # 합계 계산 (H, I, J, K, L열)
+        sum_columns = ['H', 'I', 'J', 'K', 'L']
+        for col in sum_columns:
+            self.worksheet[f'{col}43'] = f"=SUM({col}12:{col}42)"
+
+    def _create_daily_table_data(self, skeleton, daily_list):
+        """일별 정보 테이블 데이터를 입력합니다."""
+        # 테이블 데이터 입력 (월 골격의 날짜에 일별 데이터를 붙여서)
         current_row = 12
-        for day in range(1, last_day + 1):
+        for skeleton_day, daily in skeleton.join(daily_list):
             if current_row > 42:  # 42행을 넘어가면 중단
                 break
-                
-            # 날짜 생성
-            current_date = date(self.year, self.month, day)
             
             # B열: 날짜 (6/1 형태)
-            self.worksheet[f'B{current_row}'] = f"{self.month}/{day}"
+            self.worksheet[f'B{current_row}'] = f"{self.month}/{skeleton_day.day}"
             
             # C열: 요일
-            weekday_names = ["月", "火", "水", "木", "金", "土", "日"]
-            weekday = weekday_names[current_date.weekday()]
-            self.worksheet[f'C{current_row}'] = weekday
+            self.worksheet[f'C{current_row}'] = skeleton_day.weekday_name
             
             # D열부터 O열까지: 해당 날짜의 데이터가 있으면 입력
-            if day in daily_dict:
-                daily = daily_dict[day]
-                
+            if daily is not None:
                 # D열: 근무구분
                 work_type = daily.work_type or "-"
                 if work_type == "出勤":
                     self.worksheet[f'D{current_row}'] = ""
                 else:
                     self.worksheet[f'D{current_row}'] = work_type
+                if is_holiday_work_type(work_type):
+                    self.holiday_rows.add(current_row)
                 
                 # E열: 대휴/대체 근무일
                 if daily.alternative_work_date:
@@ -299,10 +437,9 @@ class ExcelReportGenerator:
             
             else:
                 # 데이터가 없는 경우 토요일/일요일 자동 휴일 설정
-                if weekday == "土":  # 토요일
-                    self.worksheet[f'D{current_row}'] = "休日"
-                elif weekday == "日":  # 일요일
-                    self.worksheet[f'D{current_row}'] = "休日(法)"
+                if skeleton_day.default_work_type:
+                    self.worksheet[f'D{current_row}'] = skeleton_day.default_work_type
+                    self.holiday_rows.add(current_row)
                 else:
                     self.worksheet[f'D{current_row}'] = " "
                 
@@ -312,15 +449,6 @@ class ExcelReportGenerator:
             
             current_row += 1
 
-        # 합계 표시
-        self.worksheet['B43'] = "合 計"
-        self.worksheet.merge_cells('B43:C43')
-        
-        # 합계 계산 (H, I, J, K, L열)
-        sum_columns = ['H', 'I', 'J', 'K', 'L']
-        for col in sum_columns:
-            self.worksheet[f'{col}43'] = f"=SUM({col}12:{col}42)"
-
     def _apply_header_design(self):
         """헤더 디자인을 적용합니다."""
         # 버전넘버 스타일
@@ -411,20 +539,6 @@ class ExcelReportGenerator:
         for col in ['H', 'I', 'J', 'K', 'L']:
             self.worksheet[f'{col}43'].alignment = Alignment(horizontal="right")
         
-        # 휴일 관련 스타일링 적용
-        for row in range(12, 43):
-            work_type_cell = self.worksheet[f'D{row}']
-            work_type_value = work_type_cell.value
-            
-            # 휴일 관련 키워드 체크
-            holiday_keywords = ["休日", "休日(法)", "振替(休)", "振替(法)", "祝日"]
-            is_holiday = any(keyword in str(work_type_value) for keyword in holiday_keywords)
-            
-            if is_holiday:
-                # C열 요일 셀 스타일링: 연한 노랑 배경, 빨간색 글씨
-                weekday_cell = self.worksheet[f'C{row}']
-                weekday_cell.fill = self.styles.HOLIDAY_FILL
-                weekday_cell.font = Font(color="FF0000")
         # 날짜/요일 등은 horizontal만 center로 지정
         for row in range(12, 43):
             self.worksheet[f'B{row}'].alignment = Alignment(horizontal="center")  # 날짜
@@ -438,6 +552,14 @@ class ExcelReportGenerator:
             for col in ['M', 'N', 'O']:
                 self.worksheet[f'{col}{row}'].alignment = Alignment(horizontal="left")
 
+    def _apply_holiday_design(self):
+        """휴일 관련 스타일링 적용 (데이터 입력 때 판정한 휴일 행)"""
+        for row in sorted(self.holiday_rows):
+            # C열 요일 셀 스타일링: 연한 노랑 배경, 빨간색 글씨
+            weekday_cell = self.worksheet[f'C{row}']
+            weekday_cell.fill = self.styles.HOLIDAY_FILL
+            weekday_cell.font = self.styles.HOLIDAY_FONT
+
     def _apply_column_widths(self):
         """헤더 기준으로 열 너비를 고정하고, 일부 열은 수동 조정."""
         headers = [
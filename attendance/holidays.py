@@ -0,0 +1,98 @@
+"""
+휴일 캘린더 색인 모듈
+캘린더별·연도별 휴일을 월 단위로 묶은 색인을 만들어 캐시(Redis + 로컬 LRU)에 두고
+요청마다 HolidayCalendar를 다시 조회하지 않도록 합니다.
+- 색인: {월: ((일, 구분), ...)}  (캘린더 1개, 1년분)
+- 캐시 키에 캘린더 세대 번호를 넣으므로 HolidayCalendar가 바뀌면
+  시그널에서 세대 번호를 올려 무효화합니다.
+"""
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache_utils import (
+    GLOBAL_NAMESPACE, cache_generations, calendar_namespace_of, invalidate_calendar_cache,
+)
+from .local_cache import VersionedLocalCache
+from .models import HolidayCalendar
+
+# 휴일 색인용 로컬 LRU 계층
+holiday_local_cache = VersionedLocalCache('holiday_index', max_entries=64)
+HOLIDAY_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def generate_holiday_key(calendar_name: str, year: int, generations: Dict[str, Optional[int]]) -> Optional[str]:
+    """휴일 색인의 캐시 키 (세대 번호를 읽지 못했으면 None: 캐시를 거치지 않음)"""
+    if generations[GLOBAL_NAMESPACE] is None or generations[calendar_namespace_of(calendar_name)] is None:
+        return None
+    return (
+        f"holiday_index:{calendar_name}:{year}"
+        f":g{generations[GLOBAL_NAMESPACE]}.{generations[calendar_namespace_of(calendar_name)]}"
+    )
+
+
+def get_holiday_indexes(calendar_names: Iterable[str], years: Iterable[int]) -> Dict[Tuple[str, int], dict]:
+    """
+    캘린더별·연도별 휴일 색인을 가져옵니다.
+    캐시는 한 번에 조회하고, 없는 색인은 한 번의 쿼리로 만들어 한 번에 저장합니다.
+
+    Returns:
+        {(캘린더 이름, 년): {월: ((일, 구분), ...)}}
+    """
+    calendar_names = list(dict.fromkeys(calendar_names))
+    years = sorted(set(int(year) for year in years))
+    generations = cache_generations.get_many(
+        [GLOBAL_NAMESPACE] + [calendar_namespace_of(name) for name in calendar_names]
+    )
+    keys = {
+        (name, year): generate_holiday_key(name, year, generations)
+        for name in calendar_names for year in years
+    }
+    cached = holiday_local_cache.get_many(key for key in keys.values() if key is not None)
+    indexes = {index_id: cached[key] for index_id, key in keys.items() if key is not None and key in cached}
+
+    missing = [index_id for index_id in keys if index_id not in indexes]
+    if missing:
+        started = time.monotonic()
+        grouped = {index_id: defaultdict(list) for index_id in missing}
+        rows = HolidayCalendar.objects.filter(
+            calendar_name__in={name for name, _ in missing},
+            date__range=(date(min(year for _, year in missing), 1, 1), date(max(year for _, year in missing), 12, 31)),
+        ).order_by('date', 'pk').values_list('calendar_name', 'date', 'category')
+        for calendar_name, holiday_date, category in rows:
+            months = grouped.get((calendar_name, holiday_date.year))
+            if months is not None:
+                months[holiday_date.month].append((holiday_date.day, category))
+        built = {}
+        for index_id, months in grouped.items():
+            indexes[index_id] = {month: tuple(days) for month, days in months.items()}
+            if keys[index_id] is not None:
+                built[keys[index_id]] = indexes[index_id]
+        holiday_local_cache.set_many(built, timeout=HOLIDAY_CACHE_TIMEOUT, build_seconds=time.monotonic() - started)
+    return indexes
+
+
+def get_holidays(calendar_names: Iterable[str], months: Iterable[Tuple[int, int]]) -> Dict[date, List[dict]]:
+    """
+    지정한 캘린더들의 지정한 달 휴일
+
+    Returns:
+        {날짜: [{'calendar_name': 캘린더 이름, 'category': 구분}, ...]}
+    """
+    calendar_names = list(dict.fromkeys(calendar_names))
+    months = [(int(year), int(month)) for year, month in months]
+    indexes = get_holiday_indexes(calendar_names, [year for year, _ in months])
+    holidays = defaultdict(list)
+    for year, month in months:
+        for calendar_name in calendar_names:
+            for day, category in indexes[(calendar_name, year)].get(month, ()):
+                holidays[date(year, month, day)].append({'calendar_name': calendar_name, 'category': category})
+    return dict(holidays)
+
+
+def invalidate_holidays(calendar_name: str) -> None:
+    """캘린더의 휴일 색인 캐시를 무효화 (다른 워커는 세대 번호 재확인 때 반영)"""
+    invalidate_calendar_cache(calendar_name)
+    holiday_local_cache.delete_local_prefix(f"holiday_index:{calendar_name}:")
+
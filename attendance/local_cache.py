@@ -0,0 +1,417 @@
+"""
+프로세스 내 LRU 캐시 계층 모듈
+Redis(공유 캐시) 앞에 워커별 LRU 계층을 두어 Redis 왕복을 줄입니다.
+- 항목마다 Redis에 버전 스탬프를 두고, 쓰기/무효화 시 스탬프를 바꿉니다.
+- 로컬 항목은 revalidate_seconds 동안은 그대로 사용하고, 그 이후에는
+  버전 스탬프만 Redis에서 확인해 다른 워커/서버의 변경을 반영합니다.
+  (다른 워커의 변경이 늦게 보이는 시간은 최대 revalidate_seconds)
+- 계층별 적중 횟수를 집계합니다.
+- 재생성은 락을 잡은 요청 하나만 수행하고(single-flight), 만료 전에 확률적으로 미리 갱신합니다.
+- 세대 카운터로 사원/캘린더/전체 단위의 키를 한 번에 무효화합니다.
+"""
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+# 계층별 통계 이름
+LOCAL_HIT = 'local_hit'  # 로컬 계층에서 Redis 접근 없이 반환
+REVALIDATED_HIT = 'revalidated_hit'  # 버전 확인 후 로컬 계층에서 반환
+REDIS_HIT = 'redis_hit'  # Redis에서 가져옴
+MISS = 'miss'  # 양쪽 모두 없음
+STALE_HIT = 'stale_hit'  # 재생성 대기 중 예비 사본을 반환
+
+_registry: Dict[str, 'VersionedLocalCache'] = {}
+
+# 락 해제: 토큰이 그대로일 때만 삭제 (비교와 삭제를 Redis 안에서 한 번에 수행)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _local_cache_settings() -> dict:
+    return getattr(settings, 'ATTENDANCE_LOCAL_CACHE', {})
+
+
+class LocalLRUCache:
+    """크기 제한이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class VersionedLocalCache:
+    """
+    Redis 앞단의 로컬 LRU 계층
+    값은 직렬화된 그대로(bytes 등) 보관하므로 호출하는 쪽이 매번 복원해서 사용합니다.
+    """
+
+    def __init__(self, name: str, max_entries: Optional[int] = None, revalidate_seconds: Optional[float] = None,
+                 stale_timeout: Optional[int] = None):
+        options = _local_cache_settings()
+        self.name = name
+        # 값과 함께 저장하는 예비 사본의 TTL (None이면 사본을 두지 않음)
+        self.stale_timeout = stale_timeout
+        self.lock_timeout = options.get('LOCK_TIMEOUT', 10)
+        self.lock_wait_seconds = options.get('LOCK_WAIT_SECONDS', 2)
+        self.early_refresh_beta = options.get('EARLY_REFRESH_BETA', 1.0)
+        self.revalidate_seconds = (
+            options.get('REVALIDATE_SECONDS', 1) if revalidate_seconds is None else revalidate_seconds
+        )
+        self.local = LocalLRUCache(options.get('MAX_ENTRIES', 512) if max_entries is None else max_entries)
+        self._stats = {LOCAL_HIT: 0, REVALIDATED_HIT: 0, REDIS_HIT: 0, MISS: 0, STALE_HIT: 0}
+        self._stats_lock = threading.Lock()
+        _registry[name] = self
+
+    @staticmethod
+    def version_key(key: str) -> str:
+        return f"version:{key}"
+
+    @staticmethod
+    def stale_key(key: str) -> str:
+        return f"stale:{key}"
+
+    @staticmethod
+    def lock_key(key: str) -> str:
+        return f"lock:{key}"
+
+    @staticmethod
+    def _new_stamp(timeout: Optional[int], build_seconds: float) -> tuple:
+        """버전 스탬프: (버전, 만료 시각, 재생성에 걸린 시간)"""
+        expires_at = None if timeout is None else time.time() + timeout
+        return (uuid.uuid4().hex, expires_at, build_seconds)
+
+    def _record(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _lookup(self, key: str):
+        """로컬 → (버전 확인) → Redis 순으로 (값, 버전 스탬프)를 찾습니다. 없으면 (None, None)"""
+        entry = self.local.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            stamp, value, checked_at = entry
+            if now - checked_at < self.revalidate_seconds:
+                self._record(LOCAL_HIT)
+                return value, stamp
+            if cache.get(self.version_key(key)) == stamp:
+                self.local.set(key, (stamp, value, now))
+                self._record(REVALIDATED_HIT)
+                return value, stamp
+
+        # 값과 버전 스탬프를 한 번에 가져옴
+        values = cache.get_many([key, self.version_key(key)])
+        value = values.get(key)
+        if value is None:
+            self.local.delete(key)
+            self._record(MISS)
+            return None, None
+
+        self._record(REDIS_HIT)
+        stamp = values.get(self.version_key(key))
+        if stamp is not None:
+            self.local.set(key, (stamp, value, now))
+        else:
+            self.local.delete(key)
+        return value, stamp
+
+    def get(self, key: str):
+        """로컬 → (버전 확인) → Redis 순으로 값을 찾습니다. 없으면 None"""
+        return self._lookup(key)[0]
+
+    def get_with_version(self, key: str) -> Tuple[object, Optional[str]]:
+        """(값, 현재 값의 버전) - 버전은 값이 바뀌면 달라짐. 없으면 (None, None)"""
+        value, stamp = self._lookup(key)
+        return value, None if stamp is None else stamp[0]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, object]:
+        """
+        여러 키를 한 번에 찾습니다. 로컬에서 바로 쓸 수 없는 키는
+        값과 버전 스탬프를 한 번의 get_many(MGET)로 가져옵니다.
+        없는 키는 결과에 포함되지 않습니다.
+        """
+        now = time.monotonic()
+        result = {}
+        local_entries = {}
+        fetch = []
+        for key in keys:
+            entry = self.local.get(key)
+            if entry is not None and now - entry[2] < self.revalidate_seconds:
+                self._record(LOCAL_HIT)
+                result[key] = entry[1]
+                continue
+            local_entries[key] = entry
+            fetch.append(key)
+        if not fetch:
+            return result
+
+        values = cache.get_many([name for key in fetch for name in (key, self.version_key(key))])
+        for key in fetch:
+            value = values.get(key)
+            version = values.get(self.version_key(key))
+            entry = local_entries[key]
+            if value is None:
+                self.local.delete(key)
+                self._record(MISS)
+                continue
+            self._record(REVALIDATED_HIT if entry is not None and entry[0] == version else REDIS_HIT)
+            if version is not None:
+                self.local.set(key, (version, value, now))
+            else:
+                self.local.delete(key)
+            result[key] = value
+        return result
+
+    def set_many(self, mapping: Dict[str, object], timeout: Optional[int] = None, build_seconds: float = 0.0) -> None:
+        """
+        여러 키를 새 버전 스탬프와 함께 한 번의 set_many(파이프라인)로 저장
+        build_seconds는 값을 만드는 데 걸린 시간 (조기 갱신 확률에 사용, 일괄 로드면 그 전체 시간)
+        """
+        if not mapping:
+            return
+        stamps = {key: self._new_stamp(timeout, build_seconds) for key in mapping}
+        values = dict(mapping)
+        values.update({self.version_key(key): stamp for key, stamp in stamps.items()})
+        cache.set_many(values, timeout=timeout)
+        if self.stale_timeout is not None:
+            cache.set_many({self.stale_key(key): value for key, value in mapping.items()},
+                           timeout=self.stale_timeout)
+        now = time.monotonic()
+        for key, value in mapping.items():
+            self.local.set(key, (stamps[key], value, now))
+
+    def set(self, key: str, value, timeout: Optional[int] = None, build_seconds: float = 0.0) -> None:
+        """새 버전 스탬프와 함께 Redis와 로컬 계층에 저장 (stale_timeout이 있으면 예비 사본도 저장)"""
+        stamp = self._new_stamp(timeout, build_seconds)
+        cache.set_many({key: value, self.version_key(key): stamp}, timeout=timeout)
+        if self.stale_timeout is not None:
+            cache.set(self.stale_key(key), value, timeout=self.stale_timeout)
+        self.local.set(key, (stamp, value, time.monotonic()))
+
+    def _should_refresh_early(self, stamp) -> bool:
+        """
+        확률적 조기 갱신 (XFetch)
+        만료가 가까울수록, 재생성이 오래 걸리는 값일수록 높은 확률로 True
+        """
+        if not stamp or stamp[1] is None or not stamp[2]:
+            return False
+        _, expires_at, build_seconds = stamp
+        return time.time() - build_seconds * self.early_refresh_beta * math.log(1.0 - random.random()) >= expires_at
+
+    def _acquire(self, key: str) -> Optional[str]:
+        token = uuid.uuid4().hex
+        return token if cache.add(self.lock_key(key), token, timeout=self.lock_timeout) else None
+
+    def _release(self, key: str, token: str) -> None:
+        lock_key = self.lock_key(key)
+        client = getattr(cache, 'client', None)
+        if hasattr(client, 'get_client'):
+            # django-redis: 락이 만료되어 다른 요청이 잡은 경우 그 락을 지우지 않도록 원자적으로 비교 후 삭제
+            client.get_client(write=True).eval(_RELEASE_SCRIPT, 1, client.make_key(lock_key), client.encode(token))
+            return
+        # 스크립트를 쓸 수 없는 백엔드 (LocMem 등 단일 프로세스용)
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+    def _build_and_set(self, key: str, build: Callable[[], Tuple[object, int]]):
+        started = time.monotonic()
+        value, timeout = build()
+        self.set(key, value, timeout=timeout, build_seconds=time.monotonic() - started)
+        return value
+
+    def get_or_build(self, key: str, build: Callable[[], Tuple[object, int]]):
+        """
+        값을 찾고, 없으면 build()로 만들어 저장합니다. build()는 (값, TTL)을 반환합니다.
+        - 재생성은 짧은 락(cache.add)을 잡은 요청 하나만 수행합니다. (single-flight)
+        - 락을 못 잡은 요청은 lock_wait_seconds 동안 값이 생기기를 기다리고,
+          그래도 없으면 예비 사본(stale)을 반환, 예비 사본도 없으면 직접 만듭니다.
+        - 값이 있어도 만료가 가까우면 확률적으로 한 요청이 미리 재생성합니다.
+        """
+        value, stamp = self._lookup(key)
+        if value is not None:
+            if not self._should_refresh_early(stamp):
+                return value
+            token = self._acquire(key)
+            if token is None:
+                return value
+            try:
+                return self._build_and_set(key, build)
+            finally:
+                self._release(key, token)
+
+        token = self._acquire(key)
+        if token is not None:
+            try:
+                return self._build_and_set(key, build)
+            finally:
+                self._release(key, token)
+
+        # 다른 요청이 재생성 중
+        deadline = time.monotonic() + self.lock_wait_seconds
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = self.get(key)
+            if value is not None:
+                return value
+        if self.stale_timeout is not None:
+            value = cache.get(self.stale_key(key))
+            if value is not None:
+                self._record(STALE_HIT)
+                return value
+        return self._build_and_set(key, build)
+
+    def delete(self, key: str) -> None:
+        """값과 버전 스탬프를 삭제 (다른 워커의 로컬 항목은 다음 확인 때 버려짐)"""
+        cache.delete_many([key, self.version_key(key)])
+        self.local.delete(key)
+
+    def delete_local_prefix(self, prefix: str) -> None:
+        self.local.delete_prefix(prefix)
+
+    def clear_local(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> dict:
+        """계층별 적중 횟수와 적중률"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        total = stats[LOCAL_HIT] + stats[REVALIDATED_HIT] + stats[REDIS_HIT] + stats[MISS]
+        local_hits = stats[LOCAL_HIT] + stats[REVALIDATED_HIT]
+        redis_requests = stats[REDIS_HIT] + stats[MISS]
+        stats['requests'] = total
+        stats['local_entries'] = len(self.local)
+        stats['local_hit_rate'] = local_hits / total if total else 0.0
+        stats['redis_hit_rate'] = stats[REDIS_HIT] / redis_requests if redis_requests else 0.0
+        return stats
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+class GenerationCounters:
+    """
+    네임스페이스별 세대 카운터 (전체/사원/캘린더 등)
+    캐시 키에 세대 번호를 넣어 두면 카운터를 INCR 한 번 하는 것만으로
+    그 네임스페이스의 키 전체가 무효화됩니다. (이전 키는 TTL로 만료)
+    읽은 세대 번호는 revalidate_seconds 동안 프로세스 내에서 재사용합니다.
+    """
+
+    def __init__(self, prefix: str = 'generation', revalidate_seconds: Optional[float] = None):
+        self.prefix = prefix
+        self.revalidate_seconds = (
+            _local_cache_settings().get('REVALIDATE_SECONDS', 1) if revalidate_seconds is None
+            else revalidate_seconds
+        )
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def counter_key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    @staticmethod
+    def _initial_value() -> int:
+        # 카운터가 축출되어도 이전 세대 번호와 겹치지 않도록 현재 시각(ms)에서 시작
+        return int(time.time() * 1000)
+
+    def get_many(self, namespaces: Iterable[str]) -> Dict[str, Optional[int]]:
+        """
+        여러 네임스페이스의 현재 세대 번호 (로컬에 없거나 오래된 것만 한 번에 조회)
+        캐시 장애 등으로 읽지 못한 세대는 None이며 로컬에 보관하지 않습니다. (호출 측은 캐시를 거치지 않음)
+        """
+        now = time.monotonic()
+        result = {}
+        fetch = []
+        with self._lock:
+            for namespace in namespaces:
+                entry = self._local.get(namespace)
+                if entry is not None and now - entry[1] < self.revalidate_seconds:
+                    result[namespace] = entry[0]
+                else:
+                    fetch.append(namespace)
+        if not fetch:
+            return result
+
+        values = cache.get_many([self.counter_key(namespace) for namespace in fetch])
+        for namespace in fetch:
+            value = values.get(self.counter_key(namespace))
+            if value is None:
+                cache.add(self.counter_key(namespace), self._initial_value(), timeout=None)
+                value = cache.get(self.counter_key(namespace))
+            result[namespace] = value
+            if value is not None:
+                with self._lock:
+                    self._local[namespace] = (value, now)
+        return result
+
+    def get(self, namespace: str) -> Optional[int]:
+        return self.get_many([namespace])[namespace]
+
+    def bump(self, namespace: str) -> Optional[int]:
+        """세대 번호를 올려 네임스페이스 전체를 무효화 (INCR 1회)"""
+        key = self.counter_key(namespace)
+        try:
+            value = cache.incr(key)
+        except ValueError:
+            # 카운터가 없으면 새로 만듦 (동시에 만들어진 경우 add가 실패하므로 다시 INCR)
+            if not cache.add(key, self._initial_value(), timeout=None):
+                value = cache.incr(key)
+            else:
+                value = cache.get(key)
+        with self._lock:
+            if value is None:
+                self._local.pop(namespace, None)
+            else:
+                self._local[namespace] = (value, time.monotonic())
+        return value
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+def get_tier_stats() -> Dict[str, dict]:
+    """이 프로세스의 로컬 캐시 계층별 통계"""
+    return {name: local_cache.stats() for name, local_cache in _registry.items()}
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+def fill_period(apps, schema_editor):
+    """
+    既存の月別勤怠の月を2桁に揃え、year/month から年月キーを設定
+    '6' と '06' のように同じ社員・年月の行が複数ある場合は年月キーで一意に引けないため中断する
+    """
+    AttendanceMonthly = apps.get_model('attendance', 'AttendanceMonthly')
+    rows = list(AttendanceMonthly.objects.only('monthly_id', 'employee_id', 'year', 'month').order_by('monthly_id'))
+
+    seen = {}
+    duplicates = []
+    for row in rows:
+        row.month = str(int(row.month)).zfill(2)
+        row.period = int(row.year) * 100 + int(row.month)
+        key = (row.employee_id, row.period)
+        if key in seen:
+            duplicates.append(f"{row.employee_id} {row.period} (monthly_id={seen[key]}, {row.monthly_id})")
+        else:
+            seen[key] = row.monthly_id
+    if duplicates:
+        raise RuntimeError(
+            '同じ社員・年月の月別勤怠が複数あります。統合してから再実行してください: ' + ', '.join(duplicates)
+        )
+
+    AttendanceMonthly.objects.bulk_update(rows, ['month', 'period'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancemonthly',
+            name='period',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='年月'),
+        ),
+        migrations.RunPython(fill_period, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='attendancemonthly',
+            constraint=models.UniqueConstraint(fields=('employee', 'period'), name='unique_monthly_period'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendancemonthly',
+            constraint=models.CheckConstraint(check=models.Q(('period__gt', 0)), name='monthly_period_set'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancedaily',
+            index=models.Index(fields=['date'], name='daily_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancedaily',
+            index=models.Index(fields=['date', 'work_type'], name='daily_date_work_type_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Cast
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 
@@ -70,6 +71,51 @@ class Employee(AbstractBaseUser, PermissionsMixin):
                 'employee_no': '社員番号は6桁の数字で入力してください。'
             })
 
+def normalize_month(month) -> str:
+    """月を2桁の文字列に揃える ('6' → '06')"""
+    return str(int(month)).zfill(2)
+
+
+class AttendanceMonthlyQuerySet(models.QuerySet):
+    """
+    月別勤怠のクエリセット
+    save() を通らない一括操作（bulk_create / bulk_update / update）でも年月キーを year/month から設定する
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.month = normalize_month(obj.month)
+            obj.period = self.model.to_period(obj.year, obj.month)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        fields = list(fields)
+        if 'year' in fields or 'month' in fields:
+            objs = list(objs)
+            for obj in objs:
+                obj.month = normalize_month(obj.month)
+                obj.period = self.model.to_period(obj.year, obj.month)
+            fields = list(dict.fromkeys(fields + ['month', 'period']))
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if ('year' in kwargs or 'month' in kwargs) and 'period' not in kwargs:
+            # 片方だけ変える場合は行ごとの値を使って年月キーを計算する
+            if 'month' in kwargs and not hasattr(kwargs['month'], 'resolve_expression'):
+                kwargs['month'] = normalize_month(kwargs['month'])
+            year = self._period_part(kwargs.get('year', models.F('year')))
+            month = self._period_part(kwargs.get('month', models.F('month')))
+            kwargs['period'] = year * 100 + month
+        return super().update(**kwargs)
+
+    @staticmethod
+    def _period_part(value):
+        if hasattr(value, 'resolve_expression'):
+            return Cast(value, models.IntegerField())
+        return models.Value(int(value))
+
+
 class AttendanceMonthly(models.Model):
     """
     月別勤怠モデル
@@ -84,6 +130,10 @@ class AttendanceMonthly(models.Model):
     standard_work_hours = models.FloatField(verbose_name='基準時間 (Hr)')
     is_confirmed = models.BooleanField(default=False, verbose_name='承認済み')
     is_required = models.BooleanField(default=False, verbose_name='承認申請中')
+    # 年月キー (YYYYMM) - 保存時・一括操作時に year/month から自動設定
+    period = models.PositiveIntegerField(verbose_name='年月', default=0, editable=False)
+
+    objects = AttendanceMonthlyQuerySet.as_manager()
 
     class Meta:
         verbose_name = '月別勤怠'
@@ -91,12 +141,27 @@ class AttendanceMonthly(models.Model):
         db_table = 'attendance_monthly'
         # 社員、年、月でユニークにする
         constraints = [
-            models.UniqueConstraint(fields=['employee', 'year', 'month'], name='unique_monthly_attendance')
+            models.UniqueConstraint(fields=['employee', 'year', 'month'], name='unique_monthly_attendance'),
+            # '6' と '06' のような表記違いでも同じ年月の行は1つだけ (社員別の月・期間検索のインデックスを兼ねる)
+            models.UniqueConstraint(fields=['employee', 'period'], name='unique_monthly_period'),
+            # 年月キーが未設定 (0) のまま保存されないようにする
+            models.CheckConstraint(check=models.Q(period__gt=0), name='monthly_period_set'),
         ]
 
     def __str__(self):
         return f"{int(self.employee.employee_no):06d} - {self.year}/{self.month}"
 
+    @staticmethod
+    def to_period(year, month) -> int:
+        """年・月 (文字列/数値) を YYYYMM の整数キーに変換"""
+        return int(year) * 100 + int(month)
+
+    def save(self, *args, **kwargs):
+        # 月は常に2桁で保存し、年月キーを同期する
+        self.month = normalize_month(self.month)
+        self.period = self.to_period(self.year, self.month)
+        super().save(*args, **kwargs)
+
 class AttendanceDaily(models.Model):
     """
     日別勤怠モデル
@@ -136,6 +201,11 @@ class AttendanceDaily(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['monthly_attendance', 'date'], name='unique_daily_attendance')
         ]
+        indexes = [
+            # 日付別 (全社員) の検索用
+            models.Index(fields=['date'], name='daily_date_idx'),
+            models.Index(fields=['date', 'work_type'], name='daily_date_work_type_idx'),
+        ]
         ordering = ['date']
 
     def __str__(self):
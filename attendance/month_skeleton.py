@@ -0,0 +1,123 @@
+"""
+월 골격(MonthSkeleton) 모듈
+(년, 월, 기준 캘린더)마다 날짜·요일·휴일 정보·주(週) 행처럼 사원과 무관한 부분을
+한 번만 만들어 프로세스 전체에서 공유합니다.
+- 메인 화면(캘린더/리스트), 엑셀, PDF는 골격에 사원별 일별 데이터만 붙여서 사용합니다.
+- 메모 키에 캘린더 세대 번호를 넣으므로 휴일이 바뀌면 새 골격이 만들어집니다.
+"""
+import calendar
+from datetime import date
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from .cache_utils import GLOBAL_NAMESPACE, cache_generations, calendar_namespace_of
+from .holidays import get_holidays
+
+COMMON_CALENDAR = '共通'
+WEEKDAY_NAMES = ('月', '火', '水', '木', '金', '土', '日')
+# 근무구분 문자열로 휴일 행을 판정할 때 쓰는 키워드 (엑셀/PDF 요일 셀 강조)
+HOLIDAY_KEYWORDS = ('休日', '休日(法)', '振替(休)', '振替(法)', '祝日')
+# 일별 데이터가 없는 날의 기본 근무구분 (토: 休日, 일: 休日(法))
+_WEEKEND_WORK_TYPES = {5: '休日', 6: '休日(法)'}
+
+# 메모해 둘 골격 수 (월 × 기준 캘린더 × 세대)
+MAX_SKELETONS = 64
+
+
+def is_holiday_work_type(work_type) -> bool:
+    """근무구분이 휴일 계열인지 (키워드 포함 여부)"""
+    return any(keyword in str(work_type) for keyword in HOLIDAY_KEYWORDS)
+
+
+class SkeletonDay(NamedTuple):
+    """골격의 하루분 (사원과 무관한 정보만)"""
+    date: date
+    day: int
+    weekday: int  # 0=월 ... 6=일
+    weekday_name: str
+    default_work_type: Optional[str]  # 일별 데이터가 없을 때의 근무구분
+    holidays: Tuple[Tuple[str, str], ...]  # ((캘린더 이름, 구분), ...)
+    common_categories: Tuple[str, ...]  # 共通 캘린더의 휴일 구분
+
+    @property
+    def is_calendar_holiday(self) -> bool:
+        return bool(self.holidays)
+
+
+class MonthSkeleton:
+    """한 달분 골격 (불변, 여러 요청/스레드에서 공유)"""
+    __slots__ = ('year', 'month', 'base_calendar', 'days', 'weeks')
+
+    def __init__(self, year: int, month: int, base_calendar: str,
+                 days: Tuple[SkeletonDay, ...], weeks: Tuple[Tuple[Optional[SkeletonDay], ...], ...]):
+        self.year = year
+        self.month = month
+        self.base_calendar = base_calendar
+        self.days = days
+        self.weeks = weeks
+
+    def __repr__(self):
+        return f"MonthSkeleton({self.year}-{self.month:02d}, base_calendar={self.base_calendar!r})"
+
+    def day(self, day: int) -> SkeletonDay:
+        return self.days[day - 1]
+
+    def join(self, daily_list) -> List[Tuple[SkeletonDay, object]]:
+        """골격의 각 날짜에 일별 데이터를 붙임 → [(SkeletonDay, DailyData 또는 None), ...]"""
+        records = {daily.date: daily for daily in daily_list or ()}
+        return [(skeleton_day, records.get(skeleton_day.date)) for skeleton_day in self.days]
+
+
+def _calendars_of(base_calendar: Optional[str]) -> List[str]:
+    calendars = [COMMON_CALENDAR]
+    if base_calendar and base_calendar not in calendars:
+        calendars.append(base_calendar)
+    return calendars
+
+
+@lru_cache(maxsize=MAX_SKELETONS)
+def _build_month_skeleton(year: int, month: int, base_calendar: str,
+                          generations: Tuple[Tuple[str, int], ...]) -> MonthSkeleton:
+    # generations는 메모 키로만 사용 (휴일이 바뀌면 다른 키가 됨)
+    holidays = get_holidays(_calendars_of(base_calendar), [(year, month)])
+    _, last_day = calendar.monthrange(year, month)
+    days = []
+    for day in range(1, last_day + 1):
+        current_date = date(year, month, day)
+        weekday = current_date.weekday()
+        day_holidays = tuple((h['calendar_name'], h['category']) for h in holidays.get(current_date, ()))
+        days.append(SkeletonDay(
+            date=current_date,
+            day=day,
+            weekday=weekday,
+            weekday_name=WEEKDAY_NAMES[weekday],
+            default_work_type=_WEEKEND_WORK_TYPES.get(weekday),
+            holidays=day_holidays,
+            common_categories=tuple(category for name, category in day_holidays if name == COMMON_CALENDAR),
+        ))
+    days = tuple(days)
+    weeks = tuple(
+        tuple(days[day - 1] if day else None for day in week)
+        for week in calendar.Calendar(firstweekday=calendar.SUNDAY).monthdayscalendar(year, month)
+    )
+    return MonthSkeleton(year, month, base_calendar, days, weeks)
+
+
+def get_month_skeleton(year, month, base_calendar: Optional[str] = None) -> MonthSkeleton:
+    """
+    (년, 월, 기준 캘린더)의 골격을 가져옵니다.
+    같은 세대 번호라면 프로세스 내에서 만든 골격을 그대로 돌려줍니다.
+    """
+    base_calendar = base_calendar or ''
+    generations = cache_generations.get_many(
+        [GLOBAL_NAMESPACE] + [calendar_namespace_of(name) for name in _calendars_of(base_calendar)]
+    )
+    if None in generations.values():
+        # 세대 번호를 읽지 못하면 메모하지 않고 매번 만듦
+        return _build_month_skeleton.__wrapped__(int(year), int(month), base_calendar, ())
+    return _build_month_skeleton(int(year), int(month), base_calendar, tuple(sorted(generations.items())))
+
+
+def clear_month_skeletons() -> None:
+    """메모해 둔 골격을 모두 버림 (테스트용)"""
+    _build_month_skeleton.cache_clear()
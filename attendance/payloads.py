@@ -0,0 +1,79 @@
+"""
+화면 부분 갱신용 JSON 페이로드 모듈
+저장/삭제/승인/월 수정 API가 바뀐 하루분 레코드와 월 합계를 함께 돌려주면
+프런트엔드는 페이지를 다시 읽지 않고 해당 캘린더 칸, 리스트 행, 월 정보만 고칩니다.
+월 단위 일별 데이터(month_days_payload)는 프런트엔드가 메모리에 들고 있다가
+날짜를 클릭할 때 서버를 부르지 않고 폼을 채우는 데 씁니다.
+"""
+from datetime import date
+from typing import Optional
+
+from .structures import DailyData, MonthlyData
+
+# 월 정보 영역에 표시하는 합계 항목 (main.html의 data-month-field 속성과 같은 이름)
+SUMMARY_FIELDS = (
+    'work_days',
+    'paid_leave_days',
+    'total_regular_work_hours',
+    'total_deduction_hours',
+    'total_overtime_hours',
+    'total_late_night_overtime_hours',
+    'total_holiday_work_hours',
+    'holiday_work_hours_night',
+)
+
+
+def _hours(value) -> Optional[float]:
+    return None if value is None else round(float(value), 2)
+
+
+def day_record_payload(daily: Optional[DailyData]) -> Optional[dict]:
+    """하루분 레코드 (없으면 None)"""
+    if daily is None:
+        return None
+    return {
+        'work_type': daily.work_type,
+        'start_time': daily.start_time.strftime('%H:%M') if daily.start_time else '',
+        'end_time': daily.end_time.strftime('%H:%M') if daily.end_time else '',
+        'alternative_work_date': daily.alternative_work_date.strftime('%Y-%m-%d') if daily.alternative_work_date else '',
+        'notes': daily.notes or '',
+        'is_required': bool(daily.is_required),
+        'is_confirmed': bool(daily.is_confirmed),
+        'regular_work_hours': _hours(daily.regular_work_hours),
+        'deduction_hours': _hours(daily.deduction_hours),
+        'overtime_hours': _hours(daily.overtime_hours),
+        'late_night_overtime_hours': _hours(daily.late_night_overtime_hours),
+    }
+
+
+def day_payload(target_date: date, daily: Optional[DailyData]) -> dict:
+    """바뀐 날짜와 그 날의 레코드"""
+    return {'date': target_date.strftime('%Y-%m-%d'), 'record': day_record_payload(daily)}
+
+
+def month_payload(monthly_data: MonthlyData) -> dict:
+    """월 정보와 합계"""
+    payload = {
+        'year': int(monthly_data.year),
+        'month': int(monthly_data.month),
+        'project_name': monthly_data.project_name,
+        'base_calendar': monthly_data.base_calendar,
+        'break_minutes': monthly_data.break_minutes,
+        'standard_work_hours': monthly_data.standard_work_hours,
+    }
+    for field in SUMMARY_FIELDS:
+        payload[field] = _hours(getattr(monthly_data, field))
+    return payload
+
+
+def month_days_payload(monthly_data: Optional[MonthlyData]) -> dict:
+    """한 달분 일별 레코드 ({'YYYY-MM-DD': 레코드}, 레코드가 없는 날은 생략)"""
+    if monthly_data is None:
+        return {'month': None, 'days': {}}
+    return {
+        'month': month_payload(monthly_data),
+        'days': {
+            daily.date.strftime('%Y-%m-%d'): day_record_payload(daily)
+            for daily in monthly_data.daily_list
+        },
+    }
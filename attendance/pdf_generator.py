@@ -1,6 +1,5 @@
 import os
 from io import BytesIO
-from calendar import monthrange, weekday
 from datetime import date
 
 from django.conf import settings
@@ -14,7 +13,8 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
 from .models import AttendanceMonthly, AttendanceDaily
-from .utils import get_or_create_monthly_structure
+from .repository import monthly_repository
+from .month_skeleton import get_month_skeleton, is_holiday_work_type
 
 # --- 폰트 등록 (사용자 지정 폰트 사용) ---
 # .ttc (TrueType Collection) 파일은 여러 폰트가 포함되어 있을 수 있습니다.
@@ -92,17 +92,18 @@ class PDFReportGenerator:
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=15*mm, rightMargin=15*mm, topMargin=10*mm, bottomMargin=10*mm)
 
         try:
-            monthly_data = get_or_create_monthly_structure(
+            monthly_data = monthly_repository.get(
                 employee=self.employee,
-                year=str(self.year),
-                month=str(self.month)
+                year=self.year,
+                month=self.month
             )
             if not monthly_data:
                 raise ValueError("해당 월의 정보를 찾을 수 없습니다.")
 
             # PDF 내용 생성
             self._create_header_and_info(monthly_data)
-            self._create_daily_table(monthly_data.daily_list)
+            skeleton = get_month_skeleton(self.year, self.month, monthly_data.base_calendar)
+            self._create_daily_table(skeleton, monthly_data.daily_list)
             self._create_summary_tables(monthly_data)
             
             # 문서 빌드
@@ -202,7 +203,7 @@ class PDFReportGenerator:
         self.story.append(Spacer(1, 8*mm))
 
 
-    def _create_daily_table(self, daily_list):
+    def _create_daily_table(self, skeleton, daily_list):
         """일별 데이터 테이블을 생성합니다."""
         
         # 테이블 헤더
@@ -213,29 +214,22 @@ class PDFReportGenerator:
         
         data = [header_paragraphs]
         
-        _, last_day = monthrange(self.year, self.month)
-        daily_dict = {daily.date.day: daily for daily in daily_list}
-        
         # 합계 계산을 위한 변수
         sums = {'H': 0.0, 'I': 0.0, 'J': 0.0, 'K': 0.0, 'L': 0.0}
+        # 휴일 행 (요일 셀 강조용, data 기준 행 번호)
+        holiday_rows = set()
 
-        # 일별 데이터 행 추가
-        for day in range(1, last_day + 1):
-            current_date = date(self.year, self.month, day)
-            weekday_names = ["月", "火", "水", "木", "金", "土", "日"]
-            weekday_str = weekday_names[current_date.weekday()]
-            
+        # 일별 데이터 행 추가 (월 골격의 날짜에 일별 데이터를 붙여서)
+        for skeleton_day, daily in skeleton.join(daily_list):
             row_data = [
-                Paragraph(f"{self.month}/{day}", self.styles.STYLES['NormalCenter']),
-                Paragraph(weekday_str, self.styles.STYLES['NormalCenter'])
+                Paragraph(f"{self.month}/{skeleton_day.day}", self.styles.STYLES['NormalCenter']),
+                skeleton_day.weekday_name,
             ]
             is_holiday_row = False
 
-            if day in daily_dict:
-                daily = daily_dict[day]
+            if daily is not None:
                 work_type = daily.work_type or ""
-                holiday_keywords = ["休日", "休日(法)", "振替(休)", "振替(法)", "祝日"]
-                if any(keyword in work_type for keyword in holiday_keywords):
+                if is_holiday_work_type(work_type):
                     is_holiday_row = True
 
                 row_data.append(Paragraph(work_type if work_type != "出勤" else "", self.styles.STYLES['NormalCenter']))
@@ -272,21 +266,16 @@ class PDFReportGenerator:
                 row_data.append(Paragraph(daily.notes or "", self.styles.STYLES['Normal']))
             else:
                 # 데이터가 없는 날
-                work_type = ""
-                if weekday_str == "土": work_type = "休日"
-                elif weekday_str == "日": work_type = "休日(法)"
+                work_type = skeleton_day.default_work_type or ""
                 if work_type: is_holiday_row = True
                 
                 row_data.extend([Paragraph(work_type, self.styles.STYLES['NormalCenter']), '', '', '', '', '', '', '', '', Paragraph('', self.styles.STYLES['Normal'])])
 
             data.append(row_data)
             
-            # 휴일 행 스타일 추가
+            # 휴일 행 스타일은 테이블 생성 후 처리
             if is_holiday_row:
-                row_index = len(data) - 1
-                # self.daily_table_style.add('BACKGROUND', (1, row_index), (1, row_index), self.styles.HOLIDAY_FILL)
-                # self.daily_table_style.add('TEXTCOLOR', (1, row_index), (1, row_index), self.styles.RED_FONT)
-                # 위 방식은 동적으로 어려우므로 아래 테이블 생성 후 처리
+                holiday_rows.add(len(data) - 1)
         
         # 합계 행 추가
         total_row = [
@@ -336,15 +325,9 @@ class PDFReportGenerator:
         for i in range(1, len(data) - 1):  # 헤더와 합계행 제외
             style_cmds.append(('SPAN', (11, i), (11, i)))  # 비고란 SPAN
 
-            # 날짜와 요일 셀을 Paragraph로 변환 (폰트 적용을 위해)
-            data[i][0] = Paragraph(str(data[i][0]), self.styles.STYLES['NormalCenter'])
-
-            work_type_val = data[i][2]
-            is_holiday = isinstance(work_type_val, Paragraph) and any(kw in work_type_val.text for kw in ["休日", "休日(法)", "振替(休)", "振替(法)", "祝日"])
-
-            # 요일 한자 추출
-            weekday_text = str(data[i][1])
-            if is_holiday:
+            # 요일 셀을 Paragraph로 변환 (폰트 적용을 위해)
+            weekday_text = data[i][1]
+            if i in holiday_rows:
                 # 휴일: 노란 배경 + 빨간 글자
                 style_cmds.append(('BACKGROUND', (1, i), (1, i), self.styles.HOLIDAY_FILL))
                 data[i][1] = Paragraph(weekday_text, ParagraphStyle(name='holiday', fontName=FONT_NAME, alignment=TA_CENTER, textColor=self.styles.RED_FONT))
@@ -0,0 +1,160 @@
+"""
+인접 월 미리 읽기(prefetch) 모듈
+화면에 필요 없는 이웃 달은 응답을 보낸 뒤(request_finished) 백그라운드 스레드에서
+DB → 캐시로 미리 올려 둡니다. 사용자는 이웃 달 로드/직렬화를 기다리지 않습니다.
+- 크기 제한이 있는 스레드 풀 + 대기 작업 수 상한 (넘치면 버림)
+- 같은 (사원, 년, 월)이 처리 중이거나 미리 읽은 뒤 아직 쓰이지 않았으면 다시 넣지 않음
+- 미리 읽은 달이 실제로 쓰였는지 집계 (사용률)
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from .cache_utils import get_monthly_bundle_with_cache, lookup_cached_monthly_bundle
+from .models import Employee
+
+# 쓰임 여부를 기억해 둘 미리 읽은 달의 수
+MAX_TRACKED = 1024
+
+
+def _prefetch_settings() -> dict:
+    return getattr(settings, 'ATTENDANCE_PREFETCH', {})
+
+
+class MonthPrefetcher:
+    """이웃 달을 응답 후 백그라운드에서 캐시에 올려 두는 프리페처"""
+
+    def __init__(self, max_workers: int = None, max_pending: int = None):
+        options = _prefetch_settings()
+        self.max_workers = max_workers or options.get('MAX_WORKERS', 2)
+        self.max_pending = max_pending or options.get('MAX_PENDING', 16)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._request = threading.local()  # 요청 처리 중 예약한 작업 (응답 후 제출)
+        self._inflight = set()
+        self._futures = set()
+        self._prefetched = OrderedDict()  # 미리 읽은 뒤 아직 쓰이지 않은 달
+        self._stats = {}
+        self.reset_stats()
+
+    @staticmethod
+    def enabled() -> bool:
+        return _prefetch_settings().get('ENABLED', True)
+
+    @staticmethod
+    def _task_key(employee_id: str, year: int, month: int) -> Tuple[str, int, int]:
+        return (employee_id, int(year), int(month))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='attendance-prefetch'
+                )
+            return self._executor
+
+    def schedule(self, employee: Employee, months: Iterable[Tuple[int, int]]) -> None:
+        """응답을 보낸 뒤 미리 읽을 달을 예약 (같은 스레드의 request_finished에서 제출)"""
+        if not self.enabled():
+            return
+        pending = getattr(self._request, 'pending', None)
+        if pending is None:
+            pending = self._request.pending = []
+        pending.append((employee.employee_no, [(int(year), int(month)) for year, month in months]))
+
+    def flush(self) -> None:
+        """예약해 둔 작업을 스레드 풀에 제출 (request_finished 핸들러에서 호출)"""
+        pending = getattr(self._request, 'pending', None)
+        if not pending:
+            return
+        self._request.pending = []
+        for employee_id, months in pending:
+            self.submit(employee_id, months)
+
+    def submit(self, employee_id: str, months: List[Tuple[int, int]]) -> None:
+        """중복을 걸러 스레드 풀에 제출 (대기 작업이 상한을 넘으면 버림)"""
+        with self._lock:
+            targets = []
+            for year, month in months:
+                task_key = self._task_key(employee_id, year, month)
+                if task_key in self._inflight or task_key in self._prefetched:
+                    self._stats['deduplicated'] += 1
+                else:
+                    targets.append(task_key)
+            if not targets:
+                return
+            if len(self._futures) >= self.max_pending:
+                self._stats['dropped'] += len(targets)
+                return
+            self._inflight.update(targets)
+            self._stats['scheduled'] += len(targets)
+        future = self._get_executor().submit(self._run, employee_id, [(year, month) for _, year, month in targets])
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard_future)
+
+    def _discard_future(self, future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def _run(self, employee_id: str, months: List[Tuple[int, int]]) -> None:
+        close_old_connections()
+        try:
+            # 캐시에 이미 있는 달은 건드리지 않음
+            cached = lookup_cached_monthly_bundle(employee_id, months)
+            missing = [month for month in months if cached[month] is None]
+            if missing:
+                employee = Employee.objects.get(employee_no=employee_id)
+                get_monthly_bundle_with_cache(employee, missing)
+            with self._lock:
+                self._stats['already_cached'] += len(months) - len(missing)
+                self._stats['loaded'] += len(missing)
+                for year, month in missing:
+                    self._prefetched[self._task_key(employee_id, year, month)] = True
+                while len(self._prefetched) > MAX_TRACKED:
+                    self._prefetched.popitem(last=False)
+        except Exception as e:
+            print(f"인접 월 미리 읽기 오류: {employee_id} - {months}: {e}")
+            with self._lock:
+                self._stats['failed'] += len(months)
+        finally:
+            with self._lock:
+                for year, month in months:
+                    self._inflight.discard(self._task_key(employee_id, year, month))
+            # 백그라운드 스레드의 DB 연결은 작업마다 닫음
+            connections.close_all()
+
+    def record_use(self, employee: Employee, months: Iterable[Tuple[int, int]]) -> None:
+        """화면에서 읽은 달 중 미리 읽어 둔 달을 사용으로 집계"""
+        with self._lock:
+            for year, month in months:
+                if self._prefetched.pop(self._task_key(employee.employee_no, year, month), None):
+                    self._stats['used'] += 1
+
+    def wait(self, timeout: float = None) -> None:
+        """제출한 작업이 끝날 때까지 대기 (테스트/종료용)"""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout=timeout)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['pending'] = len(self._futures)
+        stats['use_rate'] = stats['used'] / stats['loaded'] if stats['loaded'] else 0.0
+        return stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._prefetched.clear()
+            self._stats = dict.fromkeys(
+                ('scheduled', 'deduplicated', 'dropped', 'already_cached', 'loaded', 'failed', 'used'), 0
+            )
+
+
+# 프로세스 전역 프리페처
+month_prefetcher = MonthPrefetcher()
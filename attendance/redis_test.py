@@ -4,6 +4,8 @@ Redis 서버 연결 상태를 확인하고 테스트하는 기능을 제공합
 """
 from django.core.cache import cache
 from django.conf import settings
+from .local_cache import get_tier_stats
+from .prefetch import month_prefetcher
 
 
 def test_redis_connection() -> bool:
@@ -66,6 +68,11 @@ def check_redis_status() -> dict:
     if 'OPTIONS' in settings.CACHES['default']:
         status['settings']['options'] = settings.CACHES['default']['OPTIONS']
     
+    # 로컬 캐시 계층별 적중 통계 (이 프로세스 기준)
+    status['tier_stats'] = get_tier_stats()
+    # 인접 월 미리 읽기 통계 (이 프로세스 기준)
+    status['prefetch_stats'] = month_prefetcher.stats()
+    
     return status
 
 
@@ -83,4 +90,12 @@ def print_redis_status():
     print(f"설정:")
     for key, value in status['settings'].items():
         print(f"  {key}: {value}")
+    print(f"캐시 계층 통계:")
+    for name, stats in status['tier_stats'].items():
+        print(f"  {name}: 로컬 적중률 {stats['local_hit_rate']:.1%}, Redis 적중률 {stats['redis_hit_rate']:.1%} "
+              f"(로컬 {stats['local_hit']}, 재확인 {stats['revalidated_hit']}, Redis {stats['redis_hit']}, 미스 {stats['miss']})")
+    prefetch = status['prefetch_stats']
+    print(f"인접 월 미리 읽기: 사용률 {prefetch['use_rate']:.1%} "
+          f"(로드 {prefetch['loaded']}, 사용 {prefetch['used']}, 중복 {prefetch['deduplicated']}, "
+          f"버림 {prefetch['dropped']}, 실패 {prefetch['failed']})")
     print("=" * 50) 
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+월별 근태 데이터 저장소 모듈
+모든 뷰와 리포트 생성기는 이 저장소를 통해 MonthlyData를 읽고 씁니다.
+- 읽기: 캐시 우선, 없으면 DB에서 읽어 캐시에 저장
+- 쓰기: edit() 블록에서 월별 행을 잠그고(select_for_update) DB에서 읽은 사본을 수정
+  → 같은 트랜잭션에서 변경분 저장 → 커밋 후 그 사본을 캐시에 씀 (write-through)
+  같은 달의 쓰기는 행 잠금으로 차례대로 처리되므로 사본이 다른 요청의 변경을 놓치지 않습니다.
+  커밋 후의 캐시 쓰기는 순서가 뒤바뀔 수 있으므로, 잠금 안에서 (사원, 월)별 쓰기 토큰을 바꾸고
+  캐시에 쓴 뒤 토큰이 그대로인지 확인합니다. (바뀌었으면 항목을 버림)
+- 잠금 없이 읽은 사본을 저장하는 save()와 저장소를 거치지 않은 변경은 캐시 항목을 버립니다.
+  쓸 때마다 (사원, 월) 버전 스탬프를 바꿔 조건부 GET(ETag)이 변경을 알 수 있게 합니다.
+"""
+import time
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import transaction
+
+from .models import Employee, AttendanceMonthly, AttendanceDaily
+from .structures import DailyData, MonthlyData
+from .utils import load_monthly_structures_range, update_monthly_from_structure
+from .cache_utils import (
+    get_monthly_data_with_cache, get_monthly_bundle_with_cache, cache_monthly_bundle, claim_month_writes,
+    drop_overtaken_months, invalidate_monthly_cache, bump_month_version,
+)
+
+
+def month_key(year, month) -> str:
+    """월 식별 문자열 ("YYYY-MM")"""
+    return f"{int(year):04d}-{int(month):02d}"
+
+
+def adjacent_months(year: int, month: int) -> List[Tuple[int, int]]:
+    """전월, 당월, 익월의 (년, 월) 목록"""
+    year, month = int(year), int(month)
+    prev_month = (year - 1, 12) if month == 1 else (year, month - 1)
+    next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return [prev_month, (year, month), next_month]
+
+
+class MonthlyRepository:
+    """월별 근태 데이터 저장소 (캐시 우선 읽기 / 행 잠금 + write-through 쓰기)"""
+
+    def get(self, employee: Employee, year, month) -> Optional[MonthlyData]:
+        """한 달분 MonthlyData (없으면 None)"""
+        return get_monthly_data_with_cache(employee, str(year), str(month))
+
+    def get_many(self, employee: Employee, months: Iterable[Tuple[int, int]]) -> Dict[str, Optional[MonthlyData]]:
+        """
+        여러 달의 MonthlyData를 가져옵니다.
+        캐시는 한 번에 조회(MGET)하고, 캐시에 없는 달은 일괄 로더로 한 번에 읽어(쿼리 2회)
+        한 번에 캐시에 저장합니다. DB에 없는 달도 캐시에 기록하므로 다음에는 조회하지 않습니다.
+
+        Returns:
+            {"YYYY-MM": MonthlyData 또는 None}
+        """
+        return get_monthly_bundle_with_cache(employee, list(months))
+
+    @contextmanager
+    def edit(self, employee: Employee, year, month) -> Iterator[Optional[MonthlyData]]:
+        """
+        한 달분을 수정하는 블록 (with 문, 없는 달이면 None)
+        블록이 정상 종료되면 변경분을 저장하고 커밋 후 캐시에 씁니다. 예외가 나면 롤백하고 캐시는 그대로 둡니다.
+        """
+        with self.edit_many(employee, [(year, month)]) as monthly_map:
+            yield monthly_map[month_key(year, month)]
+
+    @contextmanager
+    def edit_many(self, employee: Employee,
+                  months: Iterable[Tuple[int, int]]) -> Iterator[Dict[str, Optional[MonthlyData]]]:
+        """
+        여러 달을 수정하는 블록 (with 문, {"YYYY-MM": MonthlyData 또는 None})
+        월별 행을 잠그고 DB에서 읽은 사본을 넘겨줍니다. (캐시의 사본은 쓰지 않음)
+        블록이 정상 종료되면 바뀐 달만 같은 트랜잭션에서 저장하고,
+        커밋 후 그 달들을 한 번에 캐시에 씁니다.
+        """
+        months = sorted({(int(year), int(month)) for year, month in months})
+        if not months:
+            yield {}
+            return
+        
+        employee_id = employee.employee_no
+        with transaction.atomic():
+            started = time.monotonic()
+            loaded = load_monthly_structures_range(
+                months[0], months[-1], employees=[employee_id], lock=True
+            ).get(employee_id, {})
+            build_seconds = time.monotonic() - started
+            monthly_map = {month_key(*month): loaded.get(month_key(*month)) for month in months}
+            day_counts = {
+                key: len(monthly_data.daily_list) for key, monthly_data in monthly_map.items() if monthly_data
+            }
+            
+            yield monthly_map
+            
+            changed = {
+                (int(monthly_data.year), int(monthly_data.month)): monthly_data
+                for key, monthly_data in monthly_map.items()
+                if monthly_data and (monthly_data.is_header_dirty or monthly_data.dirty_days()
+                                     or len(monthly_data.daily_list) != day_counts[key])
+            }
+            for monthly_data in changed.values():
+                update_monthly_from_structure(monthly_data, employee)
+            # 잠금을 잡은 채로 토큰을 바꿈 (커밋 순서 = 토큰이 바뀌는 순서)
+            tokens = claim_month_writes(employee_id, list(changed))
+        
+        cache_monthly_bundle(employee_id, changed, build_seconds=build_seconds)
+        drop_overtaken_months(employee_id, tokens)
+        for year, month in changed:
+            bump_month_version(employee_id, year, month)
+
+    def delete_day(self, monthly_data: MonthlyData, target_date: date) -> Optional[DailyData]:
+        """edit() 블록 안에서 한 날짜를 구조체와 DB에서 삭제합니다. (없으면 None)"""
+        daily = monthly_data.remove_day(target_date)
+        if daily is not None and monthly_data.monthly_id is not None:
+            AttendanceDaily.objects.filter(
+                monthly_attendance_id=monthly_data.monthly_id,
+                date=target_date
+            ).delete()
+        return daily
+
+    def save(self, monthly_data: MonthlyData, employee: Employee) -> int:
+        """
+        잠금 없이 읽은 사본의 변경분을 DB에 저장하고 캐시 항목을 버립니다. 반환값은 월별 데이터 ID
+        (사본이 다른 요청의 변경을 모를 수 있으므로 캐시에 쓰지 않음, 가능하면 edit()를 사용)
+        """
+        monthly_id = update_monthly_from_structure(monthly_data, employee)
+        self.invalidate(employee.employee_no, monthly_data.year, monthly_data.month)
+        return monthly_id
+
+    def delete(self, employee: Employee, year, month) -> Optional[int]:
+        """한 달분 월별/일별 데이터를 삭제하고 캐시를 무효화합니다. 반환값은 삭제한 일별 건수 (없는 달이면 None)"""
+        with transaction.atomic():
+            monthly_model = AttendanceMonthly.objects.select_for_update().filter(
+                employee=employee,
+                period=AttendanceMonthly.to_period(year, month)
+            ).first()
+            if monthly_model is None:
+                return None
+            daily_count, _ = AttendanceDaily.objects.filter(monthly_attendance=monthly_model).delete()
+            monthly_model.delete()
+        self.invalidate(employee.employee_no, year, month)
+        return daily_count
+
+    def invalidate(self, employee_id: str, year, month) -> None:
+        """DB가 바뀐 달의 캐시 항목을 버립니다. (저장소의 쓰기 후, 관리 화면 등 저장소를 거치지 않은 변경)"""
+        invalidate_monthly_cache(employee_id, str(year), str(month))
+        bump_month_version(employee_id, year, month)
+
+
+monthly_repository = MonthlyRepository()
@@ -0,0 +1,41 @@
+"""
+근태 앱 시그널 핸들러
+HolidayCalendar가 바뀌면 해당 캘린더의 휴일 색인 캐시를 무효화합니다.
+(관리 화면 편집, 삭제, loaddata 등 모델을 거치는 변경 모두)
+응답을 보낸 뒤에는 요청 중 예약한 인접 월 미리 읽기를 제출합니다.
+"""
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .holidays import invalidate_holidays
+from .models import HolidayCalendar
+from .prefetch import month_prefetcher
+
+
+@receiver(pre_save, sender=HolidayCalendar)
+def remember_previous_calendar(sender, instance, raw=False, **kwargs):
+    # 캘린더 이름이 바뀌는 경우 이전 캘린더도 무효화하기 위해 기억
+    instance._previous_calendar_name = None
+    if instance.pk and not raw:
+        instance._previous_calendar_name = (
+            HolidayCalendar.objects.filter(pk=instance.pk).values_list('calendar_name', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=HolidayCalendar)
+def invalidate_holidays_on_save(sender, instance, **kwargs):
+    invalidate_holidays(instance.calendar_name)
+    previous = getattr(instance, '_previous_calendar_name', None)
+    if previous and previous != instance.calendar_name:
+        invalidate_holidays(previous)
+
+
+@receiver(post_delete, sender=HolidayCalendar)
+def invalidate_holidays_on_delete(sender, instance, **kwargs):
+    invalidate_holidays(instance.calendar_name)
+
+
+@receiver(request_finished)
+def submit_scheduled_prefetch(sender, **kwargs):
+    month_prefetcher.flush()
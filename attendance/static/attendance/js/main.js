@@ -57,7 +57,6 @@ document.addEventListener('DOMContentLoaded', () => {
     const calendarTable = document.querySelector('.calendar-table');
     const dayDisplay = document.getElementById('day-display');
     const dayInputHidden = document.getElementById('day-input-hidden');
-    const getDailyDataUrl = '/daily/get/';
 
     // New elements for Year/Month Picker
     const pickerModal = document.getElementById('year-month-picker-modal');
@@ -189,6 +188,51 @@ document.addEventListener('DOMContentLoaded', () => {
         window.location.href = url;
     }
 
+    // ===================================================================
+    //  MONTH DAYS CACHE (월 단위 일별 데이터를 메모리에 두고 날짜 클릭은 서버를 부르지 않음)
+    // ===================================================================
+    // 'YYYY-MM' → Promise<{'YYYY-MM-DD': record}>
+    const monthDaysCache = new Map();
+
+    function loadMonthDays(date) {
+        const key = date.slice(0, 7);
+        if (!monthDaysCache.has(key)) {
+            const [year, month] = key.split('-').map(v => parseInt(v, 10));
+            // 응답에 ETag가 붙어 있으므로 다시 받을 때는 브라우저가 304로 재검증
+            const request = fetchWithCsrf(`/daily/month/?year=${year}&month=${month}`)
+                .then(response => {
+                    if (!response.ok) throw new Error('月別データの取得に失敗しました。');
+                    return response.json();
+                })
+                .then(data => {
+                    if (data.status !== 'success') throw new Error(data.message);
+                    return data.days || {};
+                });
+            // 실패한 달은 다음 클릭에서 다시 시도
+            request.catch(() => monthDaysCache.delete(key));
+            monthDaysCache.set(key, request);
+        }
+        return monthDaysCache.get(key);
+    }
+
+    async function getDayRecord(date) {
+        const days = await loadMonthDays(date);
+        return days[date] || null;
+    }
+
+    // 저장/삭제/승인 응답의 하루분 레코드를 메모리에도 반영
+    function storeDayRecord(day) {
+        const cached = monthDaysCache.get(day.date.slice(0, 7));
+        if (!cached) return;
+        cached.then(days => {
+            if (day.record) {
+                days[day.date] = day.record;
+            } else {
+                delete days[day.date];
+            }
+        }).catch(() => {});
+    }
+
     /**
      * 日別勤怠データをフォームに表示
      * @param {string} date - 'YYYY-MM-DD'形式の日付
@@ -205,11 +249,7 @@ document.addEventListener('DOMContentLoaded', () => {
         }
 
         try {
-            const response = await fetchWithCsrf(`/daily/get/?date=${date}`);
-            if (!response.ok) {
-                throw new Error('日次データの取得に失敗しました。');
-            }
-            const data = await response.json();
+            const data = { record: await getDayRecord(date) };
             
             const form = document.getElementById('daily-entry-form');
             
@@ -261,6 +301,83 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // ===================================================================
+    //  PARTIAL UPDATE (저장/삭제 후 페이지를 다시 읽지 않고 해당 부분만 갱신)
+    // ===================================================================
+    // "YYYY-MM-DD" → "n/j"
+    function formatMonthDay(dateStr) {
+        if (!dateStr) return '';
+        const [, m, d] = dateStr.split('-');
+        return `${parseInt(m, 10)}/${parseInt(d, 10)}`;
+    }
+
+    // 템플릿이 출력하는 float 표기(8.0, 7.75)와 맞춤
+    function formatPyFloat(value) {
+        const num = Number(value);
+        return Number.isInteger(num) ? num.toFixed(1) : String(num);
+    }
+
+    // 월 정보 항목별 표시 형식 (main.html의 data-month-field)
+    const monthFieldFormats = {
+        project_name: v => v || '',
+        base_calendar: v => v || '',
+        break_minutes: v => `${v}分`,
+        standard_work_hours: v => `${formatPyFloat(v)}時間`,
+        work_days: v => `${formatPyFloat(v)}日`,
+        paid_leave_days: v => `${formatPyFloat(v)}日`,
+    };
+
+    // 캘린더 칸과 리스트 행을 하루분 레코드로 갱신
+    function applyDayPayload(day) {
+        if (!day) return;
+        storeDayRecord(day);
+        const record = day.record;
+        const cell = document.querySelector(`.calendar-table td[data-date='${day.date}']`);
+        if (cell) {
+            cell.classList.toggle('has-record', !!record);
+            const recordTime = cell.querySelector('.record-time');
+            if (recordTime) {
+                recordTime.textContent = record && record.start_time && record.end_time
+                    ? `${record.start_time} - ${record.end_time}` : '';
+            }
+        }
+        const row = document.querySelector(`.attendance-list-row[data-date='${day.date}']`);
+        if (row) {
+            const cells = row.children;
+            cells[2].textContent = record ? (record.work_type || '-') : '-';
+            cells[3].textContent = record ? (formatMonthDay(record.alternative_work_date) || '-') : '-';
+            cells[4].textContent = record ? (record.start_time || '-') : '-';
+            cells[5].textContent = record ? (record.end_time || '-') : '-';
+            const notesCell = cells[6];
+            notesCell.textContent = '';
+            if (record) {
+                const content = document.createElement('div');
+                content.className = 'notes-content';
+                content.append(record.notes || '');
+                const deleteBtn = document.createElement('button');
+                deleteBtn.className = 'delete-daily-btn';
+                deleteBtn.dataset.date = day.date;
+                deleteBtn.title = '削除';
+                deleteBtn.textContent = '×';
+                content.append(deleteBtn);
+                notesCell.append(content);
+            } else {
+                notesCell.textContent = '-';
+            }
+        }
+    }
+
+    // 월 정보와 합계를 갱신
+    function applyMonthPayload(month) {
+        if (!month) return;
+        document.querySelectorAll('[data-month-field]').forEach(el => {
+            const field = el.dataset.monthField;
+            if (!(field in month)) return;
+            const format = monthFieldFormats[field] || (v => `${Number(v || 0).toFixed(2)}h`);
+            el.textContent = format(month[field]);
+        });
+    }
+
     // ===================================================================
     //  MONTHLY MODAL CONTROL
     // ===================================================================
@@ -491,8 +608,11 @@ document.addEventListener('DOMContentLoaded', () => {
                 console.log('Response data:', result);
         
                 if (result.status === 'success') {
-                    // 페이지를 리로드하여 캘린더표시를 업데이트
-                    window.location.reload();
+                    // 바뀐 날짜의 캘린더 칸/리스트 행과 월 합계만 갱신
+                    applyDayPayload(result.day);
+                    applyMonthPayload(result.month);
+                    hideFormWarning();
+                    saveOriginalFormData();
                 } else {
                     let errorMessage = '에러가 발생했습니다。';
                     if (result.errors) {
@@ -605,7 +725,13 @@ document.addEventListener('DOMContentLoaded', () => {
                     
                     if (result.status === 'success') {
                         alert(result.message);
-                        window.location.reload();
+                        applyDayPayload(result.day);
+                        applyMonthPayload(result.month);
+                        // 삭제한 날짜가 입력 중인 날짜면 폼도 비움
+                        const selectedCell = document.querySelector('.calendar-table td.selected');
+                        if (selectedCell && selectedCell.dataset.date === date) {
+                            populateDailyForm(date);
+                        }
                     } else {
                         alert('エーラ: ' + (result.message || '削除に失敗しました。'));
                     }
@@ -735,7 +861,17 @@ document.addEventListener('DOMContentLoaded', () => {
                 
                 if (result.status === 'success') {
                     monthlyUpdateModal.style.display = 'none';
-                    window.location.reload();
+                    const baseCalendarEl = document.querySelector('[data-month-field="base_calendar"]');
+                    if (baseCalendarEl && result.month && baseCalendarEl.textContent !== result.month.base_calendar) {
+                        // 기준 캘린더가 바뀌면 휴일 표시가 달라지므로 다시 읽음
+                        window.location.reload();
+                    } else {
+                        applyMonthPayload(result.month);
+                        // 휴게시간/기준 근무시간이 바뀌면 일별 시간도 다시 계산되므로 다음 클릭에서 다시 받음
+                        if (result.month) {
+                            monthDaysCache.delete(`${result.month.year}-${String(result.month.month).padStart(2, '0')}`);
+                        }
+                    }
                 } else {
                     let errorMessage = '에러가 발생했습니다。';
                     if (result.errors) {
@@ -1,35 +1,253 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
-from typing import List, Optional
-from datetime import date, time, datetime, timedelta
+from typing import List, NamedTuple, Optional, Union
+from datetime import date, time
+
+from .work_hours import (
+    apply_work_hours_batch, get_work_rule_timeline,
+    HOLIDAY_TYPES, HOLIDAY_BAND, WORKDAY_BAND, LATE_NIGHT_BAND,
+    DAY_MINUTES, LUNCH_DEDUCT_FROM, LUNCH_DEDUCT_TO, OVERTIME_START, LATE_NIGHT_START, LATE_NIGHT_END,
+)
+
+# 근무구분 코드표 (0은 미입력)
+# 코드는 고정이므로 캐시 직렬화 등 프로세스 간에 공유해도 됨
+# 목록에 없는 값(요청 JSON의 임의 문자열 등)은 코드표에 추가하지 않고 문자열 그대로 보관
+BASE_WORK_TYPES = (
+    None, '出勤', '有給', '有給(半)', '代休', '振替(休)', '振替(法)', '振替(勤)',
+    '特別休暇', '欠勤', '休日', '休日(法)', '祝日', 'その他',
+)
+_WORK_TYPE_CODES = {work_type: code for code, work_type in enumerate(BASE_WORK_TYPES)}
+
+# 0:00~23:59 time 객체, 분 정수, 날짜 서수는 모든 인스턴스가 공유
+_TIMES = tuple(time(minute // 60, minute % 60) for minute in range(DAY_MINUTES))
+_MINUTES = tuple(range(DAY_MINUTES))
+_ORDINALS = {}
+
+
+def _work_type_code(work_type: Optional[str]) -> Union[int, str]:
+    """코드표의 근무구분은 코드(int), 그 밖의 값은 문자열 그대로"""
+    return _WORK_TYPE_CODES.get(work_type, work_type)
+
+
+def _to_ordinal(value: Optional[date]) -> Optional[int]:
+    if value is None:
+        return None
+    ordinal = value.toordinal()
+    return _ORDINALS.setdefault(ordinal, ordinal)
+
+
+def _to_minutes(value: Optional[time]) -> Optional[int]:
+    """time을 분으로 변환 (근태 시각은 분 단위, 초 이하는 버림)"""
+    if value is None:
+        return None
+    return _MINUTES[value.hour * 60 + value.minute]
+
 
-@dataclass
 class DailyData:
-    date: date
-    work_type: Optional[str]
-    start_time: Optional[time]
-    end_time: Optional[time]
-    alternative_work_date: Optional[date] = None
-    notes: Optional[str] = None
-    is_required: bool = False
-    is_confirmed: bool = False
-    
-    # 월별 근태 정보 (계산에 필요)
-    break_minutes: int = 60  # 점심시간 (기본값 60분)
-    standard_work_hours: float = 8.0  # 기준 근무시간 (기본값 8시간)
-    
-    # 계산 필드 (초기값은 None으로 설정)
-    regular_work_hours: Optional[float] = None  # 상근시간
-    deduction_hours: Optional[float] = None     # 공제시간
-    overtime_hours: Optional[float] = None      # 잔업시간
-    late_night_overtime_hours: Optional[float] = None  # 심야시간
-    total_hours: Optional[float] = None         # 소계시간
-    
+    """
+    일별 근태 구조체
+    메모리 절약을 위해 __slots__를 사용하고 날짜는 서수, 시각은 분, 근무구분은 코드로 보관합니다.
+    date / work_type / start_time / end_time / alternative_work_date 속성은
+    기존과 같은 date, str, time 객체를 반환합니다.
+    DB에 저장되는 값이 바뀌면 is_dirty가 True가 되어 변경된 날만 저장할 수 있습니다.
+    """
+    __slots__ = (
+        '_month',  # 소속 MonthlyData (집계 캐시 무효화용)
+        'daily_id', '_dirty',  # DB 행 ID (미저장은 None), 저장 후 변경 여부
+        '_date', '_work_type', '_start', '_end', '_alternative_work_date',
+        '_notes', '_is_required', '_is_confirmed',
+        # 월별 근태 정보 (계산에 필요)
+        'break_minutes', 'standard_work_hours',
+        # 계산 필드
+        'regular_work_hours', 'deduction_hours', 'overtime_hours',
+        'late_night_overtime_hours', 'total_hours',
+    )
+
+    FIELDS = (
+        'date', 'work_type', 'start_time', 'end_time', 'alternative_work_date',
+        'notes', 'is_required', 'is_confirmed', 'break_minutes', 'standard_work_hours',
+        'regular_work_hours', 'deduction_hours', 'overtime_hours',
+        'late_night_overtime_hours', 'total_hours',
+    )
+
+    def __init__(self, date: date, work_type: Optional[str], start_time: Optional[time],
+                 end_time: Optional[time], alternative_work_date: Optional[date] = None,
+                 notes: Optional[str] = None, is_required: bool = False, is_confirmed: bool = False,
+                 break_minutes: int = 60, standard_work_hours: float = 8.0,
+                 regular_work_hours: Optional[float] = None, deduction_hours: Optional[float] = None,
+                 overtime_hours: Optional[float] = None, late_night_overtime_hours: Optional[float] = None,
+                 total_hours: Optional[float] = None, daily_id: Optional[int] = None):
+        self._month = None
+        self.daily_id = daily_id
+        self._date = self._work_type = self._start = self._end = self._alternative_work_date = None
+        self._notes = self._is_required = self._is_confirmed = None
+        self.date = date
+        self.work_type = work_type
+        self.start_time = start_time
+        self.end_time = end_time
+        self.alternative_work_date = alternative_work_date
+        self.notes = notes
+        self.is_required = is_required
+        self.is_confirmed = is_confirmed
+        self.break_minutes = break_minutes  # 점심시간 (기본값 60분)
+        self.standard_work_hours = standard_work_hours  # 기준 근무시간 (기본값 8시간)
+        self.regular_work_hours = regular_work_hours  # 상근시간
+        self.deduction_hours = deduction_hours  # 공제시간
+        self.overtime_hours = overtime_hours  # 잔업시간
+        self.late_night_overtime_hours = late_night_overtime_hours  # 심야시간
+        self.total_hours = total_hours  # 소계시간
+        self._dirty = True  # 새로 만든 데이터는 미저장 상태
+
+    @classmethod
+    def from_stored(cls, date_ordinal: int, work_type: Optional[str], start_minutes: Optional[int],
+                    end_minutes: Optional[int], alternative_ordinal: Optional[int], notes: Optional[str],
+                    is_required: bool, is_confirmed: bool, break_minutes: int, standard_work_hours: float,
+                    daily_id: Optional[int] = None) -> 'DailyData':
+        """
+        서수/분/문자열 값에서 바로 생성합니다. (캐시 복원용)
+        setter를 거치지 않으며, 저장된 값이므로 변경 없음 상태로 만들어집니다. 계산 필드는 None입니다.
+        """
+        self = cls.__new__(cls)
+        self._month = None
+        self.daily_id = daily_id
+        self._date = _ORDINALS.setdefault(date_ordinal, date_ordinal)
+        self._work_type = _work_type_code(work_type)
+        self._start = None if start_minutes is None else _MINUTES[start_minutes]
+        self._end = None if end_minutes is None else _MINUTES[end_minutes]
+        self._alternative_work_date = None if alternative_ordinal is None else _ORDINALS.setdefault(alternative_ordinal, alternative_ordinal)
+        self._notes = notes
+        self._is_required = is_required
+        self._is_confirmed = is_confirmed
+        self.break_minutes = break_minutes
+        self.standard_work_hours = standard_work_hours
+        self.regular_work_hours = self.deduction_hours = self.overtime_hours = None
+        self.late_night_overtime_hours = self.total_hours = None
+        self._dirty = False
+        return self
+
+    @property
+    def date(self) -> date:
+        return date.fromordinal(self._date)
+
+    @date.setter
+    def date(self, value: date):
+        self._set('_date', _to_ordinal(value), touch=True)
+
+    @property
+    def work_type(self) -> Optional[str]:
+        code = self._work_type
+        return BASE_WORK_TYPES[code] if type(code) is int else code
+
+    @work_type.setter
+    def work_type(self, value: Optional[str]):
+        self._set('_work_type', _work_type_code(value), touch=True)
+
+    @property
+    def start_time(self) -> Optional[time]:
+        return None if self._start is None else _TIMES[self._start]
+
+    @start_time.setter
+    def start_time(self, value: Optional[time]):
+        self._set('_start', _to_minutes(value), touch=True)
+
+    @property
+    def end_time(self) -> Optional[time]:
+        return None if self._end is None else _TIMES[self._end]
+
+    @end_time.setter
+    def end_time(self, value: Optional[time]):
+        self._set('_end', _to_minutes(value), touch=True)
+
+    @property
+    def alternative_work_date(self) -> Optional[date]:
+        ordinal = self._alternative_work_date
+        return None if ordinal is None else date.fromordinal(ordinal)
+
+    @alternative_work_date.setter
+    def alternative_work_date(self, value: Optional[date]):
+        self._set('_alternative_work_date', _to_ordinal(value), touch=True)
+
+    @property
+    def notes(self) -> Optional[str]:
+        return self._notes
+
+    @notes.setter
+    def notes(self, value: Optional[str]):
+        self._set('_notes', value)
+
+    @property
+    def is_required(self) -> bool:
+        return self._is_required
+
+    @is_required.setter
+    def is_required(self, value: bool):
+        self._set('_is_required', value)
+
+    @property
+    def is_confirmed(self) -> bool:
+        return self._is_confirmed
+
+    @is_confirmed.setter
+    def is_confirmed(self, value: bool):
+        self._set('_is_confirmed', value)
+
+    def _set(self, slot: str, value, touch: bool = False):
+        """저장 대상 값을 설정하고, 실제로 바뀐 경우에만 변경 표시"""
+        if getattr(self, slot) == value:
+            return
+        setattr(self, slot, value)
+        self._dirty = True
+        if touch:
+            self._touch()
+
+    def _touch(self):
+        """집계에 영향을 주는 값이 바뀌면 소속 월의 집계 캐시를 무효화"""
+        month = self._month
+        if month is not None:
+            month._summary = None
+
+    @property
+    def is_dirty(self) -> bool:
+        """마지막 저장(또는 DB/캐시 로드) 이후 저장 대상 값이 바뀌었는지 여부"""
+        return self._dirty
+
+    def mark_clean(self, daily_id: Optional[int] = None):
+        """DB와 같은 상태로 표시 (저장 직후 또는 로드 직후에 호출)"""
+        if daily_id is not None:
+            self.daily_id = daily_id
+        self._dirty = False
+
+    @property
+    def date_ordinal(self) -> int:
+        return self._date
+
+    @property
+    def start_minutes(self) -> Optional[int]:
+        return self._start
+
+    @property
+    def end_minutes(self) -> Optional[int]:
+        return self._end
+
+    def __repr__(self):
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.FIELDS)
+        return f'{type(self).__name__}({values})'
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+
+    __hash__ = None
+
     def calculate_work_hours(self):
         """근무시간 계산 메서드"""
         self._calculate_regular_work_hours()
         self._calculate_deduction_hours()
         self._calculate_overtime_hours()
         self._calculate_total_hours()
+        self._touch()
     
     def _calculate_regular_work_hours(self):
         """상근시간 계산"""
@@ -49,19 +267,19 @@ class DailyData:
                 self.regular_work_hours = self.standard_work_hours
             return
         
-        # start_time과 end_time이 모두 있는 경우
-        start_dt = datetime.combine(self.date, self.start_time)
-        end_dt = datetime.combine(self.date, self.end_time)
+        # start_time과 end_time이 모두 있는 경우 (분 단위)
+        start = self._start
+        end = self._end
         
         # 다음날로 넘어가는 경우 처리
-        if end_dt < start_dt:
-            end_dt += timedelta(days=1)
+        if end < start:
+            end += DAY_MINUTES
         
         # 기본 근무시간 계산 (분 단위)
-        work_minutes = (end_dt - start_dt).total_seconds() / 60
+        work_minutes = end - start
         
         # 오전 9시~12시 사이 시작인 경우 점심시간 공제
-        if time(9, 0) <= self.start_time <= time(12, 0):
+        if LUNCH_DEDUCT_FROM <= start <= LUNCH_DEDUCT_TO:
             work_minutes -= self.break_minutes
         
         # 기준 근무시간을 초과하는 경우 기준값으로 제한
@@ -94,181 +312,60 @@ class DailyData:
         self.deduction_hours = max(0.0, deduction)
     
     def _calculate_overtime_hours(self):
-        """잔업시간 및 심야시간 계산"""
+        """잔업시간 및 심야시간 계산 (근무규칙 타임라인 기반)"""
         # start_time과 end_time 중 하나라도 없으면 null
         if not self.start_time or not self.end_time:
             self.overtime_hours = None
             self.late_night_overtime_hours = None
             return
         
-        start_dt = datetime.combine(self.date, self.start_time)
-        end_dt = datetime.combine(self.date, self.end_time)
+        start = self._start
+        end = self._end
         
         # 다음날로 넘어가는 경우 처리
-        if end_dt < start_dt:
-            end_dt += timedelta(days=1)
+        if end < start:
+            end += DAY_MINUTES
         
-        # 휴일/공휴일/대체휴일인 경우: 전체 근무시간이 잔업시간
-        holiday_types = ['休日(法)', '祝日', '振替(法)', '休日', '振替(休)']
-        if self.work_type in holiday_types:
-            # 전체 근무시간 계산 (분 단위)
-            total_work_minutes = (end_dt - start_dt).total_seconds() / 60
-            
-            # 점심시간 공제 (12:00~12:00+lunch_break_hours)
-            lunch_start = datetime.combine(self.date, time(12, 0))
-            lunch_end = datetime.combine(self.date, time(12, 0)) + timedelta(minutes=self.break_minutes)
-            
-            if lunch_start < end_dt and lunch_end > start_dt:
-                overlap_start = max(lunch_start, start_dt)
-                overlap_end = min(lunch_end, end_dt)
-                total_work_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-            
-            # 저녁 휴게시간 공제 (19:30~20:00, 22:00~22:30)
-            dinner_break1_start = datetime.combine(self.date, time(19, 30))
-            dinner_break1_end = datetime.combine(self.date, time(20, 0))
-            dinner_break2_start = datetime.combine(self.date, time(22, 0))
-            dinner_break2_end = datetime.combine(self.date, time(22, 30))
-            
-            # 첫 번째 저녁 휴게시간 공제
-            if dinner_break1_start < end_dt and dinner_break1_end > start_dt:
-                overlap_start = max(dinner_break1_start, start_dt)
-                overlap_end = min(dinner_break1_end, end_dt)
-                total_work_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-            
-            # 두 번째 저녁 휴게시간 공제
-            if dinner_break2_start < end_dt and dinner_break2_end > start_dt:
-                overlap_start = max(dinner_break2_start, start_dt)
-                overlap_end = min(dinner_break2_end, end_dt)
-                total_work_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-            
-            # 22:30 이후는 심야시간으로 분리
-            late_night_start = datetime.combine(self.date, time(22, 30))
-            if end_dt > late_night_start:
-                # 22:30 이전까지는 잔업시간
-                overtime_minutes = (late_night_start - start_dt).total_seconds() / 60
-                
-                # 점심시간 공제 (잔업시간 부분만)
-                if lunch_start < late_night_start and lunch_end > start_dt:
-                    overlap_start = max(lunch_start, start_dt)
-                    overlap_end = min(lunch_end, late_night_start)
-                    overtime_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-                
-                # 저녁 휴게시간 공제 (잔업시간 부분만)
-                if dinner_break1_start < late_night_start and dinner_break1_end > start_dt:
-                    overlap_start = max(dinner_break1_start, start_dt)
-                    overlap_end = min(dinner_break1_end, late_night_start)
-                    overtime_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-                
-                if dinner_break2_start < late_night_start and dinner_break2_end > start_dt:
-                    overlap_start = max(dinner_break2_start, start_dt)
-                    overlap_end = min(dinner_break2_end, late_night_start)
-                    overtime_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-                
+        timeline = get_work_rule_timeline(self.break_minutes)
+        
+        # 휴일/공휴일/대체휴일인 경우: 전체 근무시간이 잔업시간 (점심, 저녁 휴게 공제)
+        if self.work_type in HOLIDAY_TYPES:
+            if end > LATE_NIGHT_START:
+                # 22:30 이전까지는 잔업시간, 이후는 심야시간
+                overtime_minutes = timeline.paid_minutes(HOLIDAY_BAND, start, LATE_NIGHT_START)
                 self.overtime_hours = max(0.0, overtime_minutes / 60.0)
-                
-                # 22:30 이후는 심야시간 계산
-                next_day = self.date + timedelta(days=1)
-                late_night_end = datetime.combine(next_day, time(6, 0))
-                
-                if end_dt > late_night_end:
-                    late_night_end = end_dt
-                
-                late_night_minutes = (late_night_end - late_night_start).total_seconds() / 60
-                
-                # 심야 휴게시간 공제 (00:30~01:00, 03:00~03:30)
-                late_break1_start = datetime.combine(next_day, time(0, 30))
-                late_break1_end = datetime.combine(next_day, time(1, 0))
-                late_break2_start = datetime.combine(next_day, time(3, 0))
-                late_break2_end = datetime.combine(next_day, time(3, 30))
-                
-                if late_break1_start < late_night_end and late_break1_end > late_night_start:
-                    overlap_start = max(late_break1_start, late_night_start)
-                    overlap_end = min(late_break1_end, late_night_end)
-                    late_night_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-                
-                if late_break2_start < late_night_end and late_break2_end > late_night_start:
-                    overlap_start = max(late_break2_start, late_night_start)
-                    overlap_end = min(late_break2_end, late_night_end)
-                    late_night_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-                
-                self.late_night_overtime_hours = max(0.0, late_night_minutes / 60.0)
+                self.late_night_overtime_hours = self._late_night_hours(timeline, end)
             else:
                 # 22:30 이전에 끝나는 경우 전체가 잔업시간
-                self.overtime_hours = max(0.0, total_work_minutes / 60.0)
+                overtime_minutes = timeline.paid_minutes(HOLIDAY_BAND, start, end)
+                self.overtime_hours = max(0.0, overtime_minutes / 60.0)
                 self.late_night_overtime_hours = 0.0
-            
             return
         
-        # 일반 근무일의 경우: 기존 로직 유지
-        # 18:00 이후 시간 계산
-        overtime_start = datetime.combine(self.date, time(18, 0))
-        if end_dt <= overtime_start:
+        # 일반 근무일의 경우: 18:00 이후 시간만 잔업
+        if end <= OVERTIME_START:
             self.overtime_hours = 0.0
             self.late_night_overtime_hours = 0.0
             return
         
-        # 잔업시간 계산 (18:00~22:30)
-        late_night_start = datetime.combine(self.date, time(22, 30))
-        if end_dt <= late_night_start:
-            overtime_end = end_dt
-        else:
-            overtime_end = late_night_start
-        
-        overtime_minutes = (overtime_end - overtime_start).total_seconds() / 60
-        
-        # 휴게시간 공제 (19:30~20:00, 22:00~22:30)
-        break1_start = datetime.combine(self.date, time(19, 30))
-        break1_end = datetime.combine(self.date, time(20, 0))
-        break2_start = datetime.combine(self.date, time(22, 0))
-        break2_end = datetime.combine(self.date, time(22, 30))
-        
-        # 첫 번째 휴게시간 공제
-        if break1_start < overtime_end and break1_end > overtime_start:
-            overlap_start = max(break1_start, overtime_start)
-            overlap_end = min(break1_end, overtime_end)
-            overtime_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-        
-        # 두 번째 휴게시간 공제
-        if break2_start < overtime_end and break2_end > overtime_start:
-            overlap_start = max(break2_start, overtime_start)
-            overlap_end = min(break2_end, overtime_end)
-            overtime_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-        
+        # 잔업시간 계산 (18:00~22:30, 저녁 휴게 공제)
+        overtime_end = min(end, LATE_NIGHT_START)
+        overtime_minutes = timeline.paid_minutes(WORKDAY_BAND, OVERTIME_START, overtime_end)
         self.overtime_hours = max(0.0, overtime_minutes / 60.0)
         
         # 심야시간 계산 (22:30~06:00)
-        if end_dt > late_night_start:
-            # 다음날 06:00까지
-            next_day = self.date + timedelta(days=1)
-            late_night_end = datetime.combine(next_day, time(6, 0))
-            
-            if end_dt > late_night_end:
-                late_night_end = end_dt
-            
-            late_night_minutes = (late_night_end - late_night_start).total_seconds() / 60
-            
-            # 심야 휴게시간 공제 (00:30~01:00, 03:00~03:30)
-            late_break1_start = datetime.combine(next_day, time(0, 30))
-            late_break1_end = datetime.combine(next_day, time(1, 0))
-            late_break2_start = datetime.combine(next_day, time(3, 0))
-            late_break2_end = datetime.combine(next_day, time(3, 30))
-            
-            # 첫 번째 심야 휴게시간 공제
-            if late_break1_start < late_night_end and late_break1_end > late_night_start:
-                overlap_start = max(late_break1_start, late_night_start)
-                overlap_end = min(late_break1_end, late_night_end)
-                late_night_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-            
-            # 두 번째 심야 휴게시간 공제
-            if late_break2_start < late_night_end and late_break2_end > late_night_start:
-                overlap_start = max(late_break2_start, late_night_start)
-                overlap_end = min(late_break2_end, late_night_end)
-                late_night_minutes -= (overlap_end - overlap_start).total_seconds() / 60
-            
-            self.late_night_overtime_hours = max(0.0, late_night_minutes / 60.0)
+        if end > LATE_NIGHT_START:
+            self.late_night_overtime_hours = self._late_night_hours(timeline, end)
         else:
             self.late_night_overtime_hours = 0.0
     
+    @staticmethod
+    def _late_night_hours(timeline, end):
+        """22:30부터 다음날 06:00(그 이후까지 근무하면 종료시각)까지의 심야시간"""
+        late_night_end = max(LATE_NIGHT_END, end)
+        late_night_minutes = timeline.paid_minutes(LATE_NIGHT_BAND, LATE_NIGHT_START, late_night_end)
+        return max(0.0, late_night_minutes / 60.0)
+    
     def _calculate_total_hours(self):
         """소계시간 계산"""
         # end_time과 start_time이 없으면 null
@@ -289,7 +386,123 @@ class DailyData:
         
         self.total_hours = total
 
-@dataclass
+# 법정 휴일 근무구분 (상근시간 합계에서 제외, 휴일 근무시간으로 집계)
+LEGAL_HOLIDAY_TYPES = ('休日(法)', '祝日', '振替(法)')
+
+
+class MonthlySummary(NamedTuple):
+    """
+    월별 집계 결과 (불변)
+    daily_list를 한 번만 순회하여 모든 합계를 계산합니다. 필드는 반올림 전 합계입니다.
+    """
+    regular_work_hours: float = 0.0
+    deduction_hours: float = 0.0
+    overtime_hours: float = 0.0
+    late_night_overtime_hours: float = 0.0
+    holiday_work_hours: float = 0.0
+    holiday_late_night_hours: float = 0.0
+    work_days: int = 0
+    paid_leave: float = 0.0
+    special_paid_leave_days: int = 0
+    unpaid_leave_days: int = 0
+
+    @classmethod
+    def from_daily_list(cls, daily_list: List[DailyData]) -> 'MonthlySummary':
+        regular = deduction = overtime = late_night = 0.0
+        holiday = holiday_night = paid_leave = 0.0
+        work_days = special_paid_leave = unpaid_leave = 0
+        for daily in daily_list:
+            work_type = daily.work_type
+            is_legal_holiday = work_type in LEGAL_HOLIDAY_TYPES
+            if not is_legal_holiday and daily.regular_work_hours is not None:
+                regular += daily.regular_work_hours
+            if daily.deduction_hours is not None:
+                deduction += daily.deduction_hours
+            if daily.overtime_hours is not None:
+                overtime += daily.overtime_hours
+                if is_legal_holiday:
+                    holiday += daily.overtime_hours
+            if daily.late_night_overtime_hours is not None:
+                late_night += daily.late_night_overtime_hours
+                if is_legal_holiday:
+                    holiday_night += daily.late_night_overtime_hours
+            if daily.start_time is not None:
+                work_days += 1
+            if work_type == "有給(半)":
+                paid_leave += 0.5
+            elif work_type == "有給":
+                paid_leave += 1.0
+            elif work_type == "欠勤":
+                paid_leave -= 1.0
+            elif work_type == "特別休暇":
+                special_paid_leave += 1
+            elif work_type == "代休":
+                # alternative_work_date가 없거나, date와 다를 때만 +1
+                if not daily.alternative_work_date or daily.date != daily.alternative_work_date:
+                    unpaid_leave += 1
+        return cls(regular, deduction, overtime, late_night, holiday, holiday_night,
+                   work_days, paid_leave, special_paid_leave, unpaid_leave)
+
+
+class DailyList(list):
+    """
+    MonthlyData.daily_list용 리스트
+    일별 데이터가 추가/삭제/교체되면 소유 MonthlyData의 집계 캐시를 무효화합니다.
+    """
+    __slots__ = ('_owner',)
+
+    def __init__(self, iterable=(), owner=None):
+        super().__init__(iterable)
+        self._owner = owner
+        for daily in self:
+            daily._month = owner
+
+    def _changed(self, added=()):
+        for daily in added:
+            daily._month = self._owner
+        if self._owner is not None:
+            self._owner._summary = None
+
+    def append(self, daily):
+        super().append(daily)
+        self._changed((daily,))
+
+    def insert(self, index, daily):
+        super().insert(index, daily)
+        self._changed((daily,))
+
+    def extend(self, iterable):
+        added = list(iterable)
+        super().extend(added)
+        self._changed(added)
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed(value if isinstance(index, slice) else (value,))
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def remove(self, daily):
+        super().remove(daily)
+        self._changed()
+
+    def pop(self, index=-1):
+        daily = super().pop(index)
+        self._changed()
+        return daily
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+@dataclass(slots=True)
 class MonthlyData:
     employee_id: int  # 6자리 숫자 사원번호
     year: str
@@ -303,86 +516,120 @@ class MonthlyData:
     total_work_days: int = 0
     total_overtime: float = 0.0
     # ... 필요에 따라 추가
+    monthly_id: Optional[int] = field(default=None, compare=False)  # DB 행 ID (미저장은 None)
+    # 집계 캐시 (일별 데이터가 추가/삭제/재계산되면 None으로 초기화)
+    _summary: Optional[MonthlySummary] = field(default=None, init=False, repr=False, compare=False)
+    # 마지막으로 DB와 맞춘 헤더 값 (None이면 미저장 또는 알 수 없음)
+    _saved_header: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        if name == 'daily_list':
+            value = DailyList(value, owner=self)
+            object.__setattr__(self, '_summary', None)
+        object.__setattr__(self, name, value)
+
+    def header_state(self) -> tuple:
+        """AttendanceMonthly 행에 저장되는 헤더 값"""
+        return (self.project_name, self.base_calendar, self.break_minutes, self.standard_work_hours)
+
+    @property
+    def is_header_dirty(self) -> bool:
+        return self._saved_header != self.header_state()
+
+    def dirty_days(self) -> List[DailyData]:
+        """저장 이후 변경되었거나 아직 저장되지 않은 일별 데이터"""
+        return [daily for daily in self.daily_list if daily.is_dirty]
+
+    def mark_clean(self, monthly_id: Optional[int] = None):
+        """헤더와 모든 일별 데이터를 DB와 같은 상태로 표시"""
+        if monthly_id is not None:
+            self.monthly_id = monthly_id
+        self._saved_header = self.header_state()
+        for daily in self.daily_list:
+            daily.mark_clean()
 
     def calculate_all_daily_hours(self):
-        """모든 일별 근무시간 계산"""
+        """모든 일별 근무시간 계산 (NumPy 일괄 계산)"""
         for daily in self.daily_list:
             # 월별 정보를 일별 데이터에 전달
             daily.break_minutes = self.break_minutes
             daily.standard_work_hours = self.standard_work_hours
-            daily.calculate_work_hours()
+        apply_work_hours_batch(self.daily_list)
+        self._summary = None
+
+    def find_day(self, target_date: date) -> Optional[DailyData]:
+        """해당 날짜의 일별 데이터 (없으면 None)"""
+        ordinal = target_date.toordinal()
+        for daily in self.daily_list:
+            if daily.date_ordinal == ordinal:
+                return daily
+        return None
+
+    def update_day(self, target_date: date, **changes) -> DailyData:
+        """
+        한 날짜만 갱신(없으면 추가)하고 그 날만 재계산합니다.
+        월 합계는 다음 조회 때 summary에서 한 번만 다시 집계합니다.
+        """
+        daily = self.find_day(target_date)
+        if daily is None:
+            daily = DailyData(date=target_date, work_type=None, start_time=None, end_time=None)
+            self.daily_list.append(daily)
+        
+        for name, value in changes.items():
+            setattr(daily, name, value)
+        daily.break_minutes = self.break_minutes
+        daily.standard_work_hours = self.standard_work_hours
+        daily.calculate_work_hours()
+        self._summary = None
+        return daily
+
+    def remove_day(self, target_date: date) -> Optional[DailyData]:
+        """한 날짜를 제거합니다. (없으면 None)"""
+        daily = self.find_day(target_date)
+        if daily is None:
+            return None
+        
+        self.daily_list.remove(daily)
+        daily._month = None
+        self._summary = None
+        return daily
+
+    @property
+    def summary(self) -> MonthlySummary:
+        """월별 집계 (한 번 계산하면 일별 데이터가 바뀔 때까지 재사용)"""
+        if self._summary is None:
+            self._summary = MonthlySummary.from_daily_list(self.daily_list)
+        return self._summary
 
     @property
     def total_regular_work_hours(self) -> float:
-        """상근시간 합계: 휴일(법), 공휴일, 대체(법) 제외한 나머지 날들의 상근시간 합"""
-        total = 0.0
-        exclude_types = ['休日(法)', '祝日', '振替(法)']
-        
-        for daily in self.daily_list:
-            if (daily.work_type not in exclude_types and 
-                daily.regular_work_hours is not None):
-                total += daily.regular_work_hours
-        
-        return round(total, 2)
+        """상근시간 합계: 휴일(法), 공휴일, 대체(法) 제외한 나머지 날들의 상근시간 합"""
+        return round(self.summary.regular_work_hours, 2)
 
     @property
     def total_deduction_hours(self) -> float:
         """공제시간 합계: 모든 일별 공제시간의 합"""
-        total = 0.0
-        
-        for daily in self.daily_list:
-            if daily.deduction_hours is not None:
-                total += daily.deduction_hours
-        
-        return round(total, 2)
+        return round(self.summary.deduction_hours, 2)
 
     @property
     def total_overtime_hours(self) -> float:
         """잔업시간 합계: 모든 일별 잔업시간의 합"""
-        total = 0.0
-        
-        for daily in self.daily_list:
-            if daily.overtime_hours is not None:
-                total += daily.overtime_hours
-        
-        return round(total, 2)
+        return round(self.summary.overtime_hours, 2)
 
     @property
     def total_late_night_overtime_hours(self) -> float:
         """심야시간 합계: 모든 일별 심야시간의 합"""
-        total = 0.0
-        
-        for daily in self.daily_list:
-            if daily.late_night_overtime_hours is not None:
-                total += daily.late_night_overtime_hours
-        
-        return round(total, 2)
+        return round(self.summary.late_night_overtime_hours, 2)
 
     @property
     def total_holiday_work_hours(self) -> float:
         """휴일 근무시간 합계: 법정 휴일(休日(法)、祝日、振替(法))에 일한 잔업시간의 합"""
-        total = 0.0
-        legal_holiday_types = ['休日(法)', '祝日', '振替(法)']
-        
-        for daily in self.daily_list:
-            if (daily.work_type in legal_holiday_types and 
-                daily.overtime_hours is not None):
-                total += daily.overtime_hours
-        
-        return round(total, 2)
+        return round(self.summary.holiday_work_hours, 2)
 
     @property
     def holiday_work_hours_night(self) -> float:
         """휴일 심야근무시간 합계: 법정 휴일에 심야근무한 시간의 합"""
-        total = 0.0
-        legal_holiday_types = ['休日(法)', '祝日', '振替(法)']
-        
-        for daily in self.daily_list:
-            if (daily.work_type in legal_holiday_types and 
-                daily.late_night_overtime_hours is not None):
-                total += daily.late_night_overtime_hours
-        
-        return round(total, 2)
+        return round(self.summary.holiday_late_night_hours, 2)
 
     @property
     def holiday_work_hours_overtime(self) -> float:
@@ -404,35 +651,19 @@ class MonthlyData:
     @property
     def work_days(self) -> float:
         """출근일: start_time이 입력된 일수"""
-        count = sum(1 for d in self.daily_list if d.start_time is not None)
-        return round(float(count), 1)
+        return round(float(self.summary.work_days), 1)
 
     @property
     def paid_leave_days(self) -> float:
         """연차 유급: 有給(半)=+0.5, 有給=+1, 欠勤=-1, 합산 후 0 미만이면 0"""
-        total = 0.0
-        for d in self.daily_list:
-            if d.work_type == "有給(半)":
-                total += 0.5
-            elif d.work_type == "有給":
-                total += 1.0
-            elif d.work_type == "欠勤":
-                total -= 1.0
-        return round(max(total, 0.0), 1)
+        return round(max(self.summary.paid_leave, 0.0), 1)
 
     @property
     def special_paid_leave_days(self) -> float:
         """특별 유급: 特別休暇 카운트"""
-        count = sum(1 for d in self.daily_list if d.work_type == "特別休暇")
-        return round(float(count), 1)
+        return round(float(self.summary.special_paid_leave_days), 1)
 
     @property
     def unpaid_leave_days(self) -> float:
         """무급일: 代休이면서 date != alternative_work_date인 경우만 카운트"""
-        count = 0
-        for d in self.daily_list:
-            if d.work_type == "代休":
-                # alternative_work_date가 없거나, date와 다를 때만 +1
-                if not d.alternative_work_date or d.date != d.alternative_work_date:
-                    count += 1
-        return round(float(count), 1)
+        return round(float(self.summary.unpaid_leave_days), 1)
@@ -1,3 +1,1407 @@
-from django.test import TestCase
+import os
+from copy import deepcopy
+from datetime import date, time
+from io import BytesIO
+from time import perf_counter
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .cache_codec import _HEADER, CacheCodecError, _pack_strings, decode_monthly_data, encode_monthly_data
+from .cache_utils import (
+    MONTH_ABSENT, cache_generations, cache_monthly_bundle, claim_month_writes, generate_cache_key,
+    get_cached_monthly_data, get_report_with_cache, invalidate_all_cache, invalidate_calendar_cache,
+    invalidate_employee_cache, lookup_cached_monthly_bundle, monthly_local_cache,
+)
+from .excel_generator import ExcelReportGenerator, clear_report_template, get_report_template
+from .holidays import get_holidays, holiday_local_cache
+from .local_cache import VersionedLocalCache
+from .month_skeleton import clear_month_skeletons, get_month_skeleton, is_holiday_work_type
+from .models import Employee, AttendanceMonthly, AttendanceDaily, HolidayCalendar
+from .prefetch import month_prefetcher
+from .repository import monthly_repository
+from .structures import DailyData, MonthlyData
+from .utils import (
+    convert_monthly_to_structure, get_or_create_monthly_structure, load_monthly_structures,
+    load_monthly_structures_range, update_monthly_from_structure,
+)
+
+
+class UpdateMonthlyFromStructureTests(TestCase):
+    """変更分のみ保存する update_monthly_from_structure のクエリ数テスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        cls.monthly = AttendanceMonthly.objects.create(
+            employee=cls.employee, year='2025', month='06', project_name='PJ',
+            base_calendar='本社', break_minutes=60, standard_work_hours=8.0
+        )
+        AttendanceDaily.objects.bulk_create([
+            AttendanceDaily(
+                monthly_attendance=cls.monthly, date=date(2025, 6, day), work_type='出勤',
+                start_time=time(9, 0), end_time=time(18, 0)
+            )
+            for day in range(1, 31)
+        ])
+
+    def load(self):
+        monthly_data = convert_monthly_to_structure(self.monthly)
+        monthly_data.calculate_all_daily_hours()
+        return monthly_data
+
+    def test_unchanged_month_writes_nothing(self):
+        monthly_data = self.load()
+        # SAVEPOINT / RELEASE のみ
+        with self.assertNumQueries(2):
+            update_monthly_from_structure(monthly_data, self.employee)
+
+    def test_one_day_edit_is_single_update(self):
+        monthly_data = self.load()
+        monthly_data.update_day(date(2025, 6, 10), end_time=time(21, 0), notes='残業')
+        # SAVEPOINT / 月別行のロック確認 / 日別 UPDATE 1件 / RELEASE
+        with self.assertNumQueries(4):
+            update_monthly_from_structure(monthly_data, self.employee)
+        daily = AttendanceDaily.objects.get(monthly_attendance=self.monthly, date=date(2025, 6, 10))
+        self.assertEqual(daily.end_time, time(21, 0))
+        self.assertEqual(daily.notes, '残業')
+        self.assertFalse(monthly_data.dirty_days())
+
+    def test_header_change_updates_monthly_row(self):
+        monthly_data = self.load()
+        monthly_data.project_name = 'PJ2'
+        with self.assertNumQueries(3):
+            update_monthly_from_structure(monthly_data, self.employee)
+        self.monthly.refresh_from_db()
+        self.assertEqual(self.monthly.project_name, 'PJ2')
+
+    def test_new_day_is_created_with_id(self):
+        AttendanceDaily.objects.filter(monthly_attendance=self.monthly, date=date(2025, 6, 30)).delete()
+        monthly_data = self.load()
+        daily = monthly_data.update_day(date(2025, 6, 30), work_type='出勤',
+                                        start_time=time(9, 0), end_time=time(18, 0))
+        update_monthly_from_structure(monthly_data, self.employee)
+        self.assertIsNotNone(daily.daily_id)
+        self.assertEqual(
+            AttendanceDaily.objects.get(daily_id=daily.daily_id).date, date(2025, 6, 30)
+        )
+
+    def test_deleted_row_is_created_again(self):
+        monthly_data = self.load()
+        # 読み込んだ後に別のリクエストが行を削除した
+        AttendanceDaily.objects.filter(monthly_attendance=self.monthly, date=date(2025, 6, 10)).delete()
+        daily = monthly_data.update_day(date(2025, 6, 10), end_time=time(21, 0))
+        update_monthly_from_structure(monthly_data, self.employee)
+        saved = AttendanceDaily.objects.get(monthly_attendance=self.monthly, date=date(2025, 6, 10))
+        self.assertEqual(saved.end_time, time(21, 0))
+        self.assertEqual(daily.daily_id, saved.daily_id)
+        self.assertFalse(monthly_data.dirty_days())
+
+    def test_deleted_month_is_reported(self):
+        # 読み込んだ後に別のリクエストが月ごと削除した: 外部キー違反ではなく DoesNotExist
+        for change_header in (True, False):
+            with self.subTest(change_header=change_header):
+                monthly_data = self.load()
+                if change_header:
+                    monthly_data.project_name = 'PJ2'
+                monthly_data.update_day(date(2025, 6, 10), end_time=time(21, 0))
+                with transaction.atomic():
+                    AttendanceMonthly.objects.filter(monthly_id=self.monthly.monthly_id).delete()
+                    with self.assertRaises(AttendanceMonthly.DoesNotExist):
+                        update_monthly_from_structure(monthly_data, self.employee)
+                    self.assertFalse(AttendanceDaily.objects.exists())
+                    transaction.set_rollback(True)
+
+    def test_row_replaced_under_new_id_is_updated(self):
+        monthly_data = self.load()
+        # 削除後に同じ日付の行が別の ID で作り直された
+        AttendanceDaily.objects.filter(monthly_attendance=self.monthly, date=date(2025, 6, 11)).delete()
+        replaced = AttendanceDaily.objects.create(
+            monthly_attendance=self.monthly, date=date(2025, 6, 11), work_type='有給'
+        )
+        daily = monthly_data.update_day(date(2025, 6, 11), end_time=time(20, 0))
+        update_monthly_from_structure(monthly_data, self.employee)
+        saved = AttendanceDaily.objects.get(monthly_attendance=self.monthly, date=date(2025, 6, 11))
+        self.assertEqual(saved.daily_id, replaced.daily_id)
+        self.assertEqual(saved.end_time, time(20, 0))
+        self.assertEqual(daily.daily_id, replaced.daily_id)
+
+
+class LoadMonthlyStructuresTests(TestCase):
+    """複数社員の月別データを一括で組み立てる load_monthly_structures のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = []
+        for no, place_work in (('000001', '本社'), ('000002', '本社'), ('000003', '大甕')):
+            employee = Employee.objects.create_user(
+                employee_no=no, password='0000', first_name='太郎', last_name='山田', place_work=place_work
+            )
+            cls.employees.append(employee)
+            for month in (5, 6):
+                monthly = AttendanceMonthly.objects.create(
+                    employee=employee, year='2025', month=str(month).zfill(2), project_name='PJ',
+                    base_calendar='本社', break_minutes=60, standard_work_hours=8.0
+                )
+                AttendanceDaily.objects.bulk_create([
+                    AttendanceDaily(
+                        monthly_attendance=monthly, date=date(2025, month, day), work_type='出勤',
+                        start_time=time(9, 0), end_time=time(20, 0)
+                    )
+                    for day in range(1, 11)
+                ])
+
+    def test_single_month_in_two_queries(self):
+        with self.assertNumQueries(2):
+            result = load_monthly_structures(2025, 6, employees=self.employees)
+        self.assertEqual(set(result), {'000001', '000002', '000003'})
+        monthly_data = result['000001']
+        self.assertEqual(len(monthly_data.daily_list), 10)
+        self.assertEqual(monthly_data.employee_id, '000001')
+        self.assertFalse(monthly_data.dirty_days())
+
+        single = convert_monthly_to_structure(AttendanceMonthly.objects.get(employee_id='000001', month='06'))
+        single.calculate_all_daily_hours()
+        self.assertEqual(monthly_data.summary, single.summary)
+
+    def test_range_with_place_work_filter(self):
+        with self.assertNumQueries(2):
+            result = load_monthly_structures_range((2025, 4), (2025, 6), place_work='本社')
+        self.assertEqual(set(result), {'000001', '000002'})
+        self.assertEqual(set(result['000002']), {'2025-05', '2025-06'})
+
+
+class PeriodIndexTests(TestCase):
+    """年月キー・日付インデックスが主要クエリで使われることを EXPLAIN で確認"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_period_is_set_on_save(self):
+        employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        monthly = AttendanceMonthly.objects.create(
+            employee=employee, year='2025', month='6', project_name='PJ',
+            base_calendar='本社', break_minutes=60, standard_work_hours=8.0
+        )
+        self.assertEqual(monthly.month, '06')
+        self.assertEqual(monthly.period, 202506)
+
+    def test_period_is_set_by_bulk_operations(self):
+        employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        header = {'project_name': 'PJ', 'base_calendar': '本社', 'break_minutes': 60, 'standard_work_hours': 8.0}
+        AttendanceMonthly.objects.bulk_create([
+            AttendanceMonthly(employee=employee, year='2025', month=month, **header) for month in ('5', '6')
+        ])
+        self.assertEqual(sorted(AttendanceMonthly.objects.values_list('month', 'period')),
+                         [('05', 202505), ('06', 202506)])
+
+        # save() を通らない update でも年月キーが追従する
+        AttendanceMonthly.objects.filter(month='06').update(month=7)
+        AttendanceMonthly.objects.filter(month='05').update(year='2024')
+        self.assertEqual(sorted(AttendanceMonthly.objects.values_list('year', 'month', 'period')),
+                         [('2024', '05', 202405), ('2025', '07', 202507)])
+
+        monthly = AttendanceMonthly.objects.get(period=202507)
+        monthly.month = '8'
+        AttendanceMonthly.objects.bulk_update([monthly], ['month'])
+        self.assertEqual(AttendanceMonthly.objects.get(pk=monthly.pk).period, 202508)
+
+    def test_period_constraints(self):
+        employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        monthly = AttendanceMonthly.objects.create(
+            employee=employee, year='2025', month='06', project_name='PJ',
+            base_calendar='本社', break_minutes=60, standard_work_hours=8.0
+        )
+        # 年月キーが未設定のままの行は保存できない
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            QuerySet.update(AttendanceMonthly.objects.filter(pk=monthly.pk), period=0)
+        # 同じ社員・年月キーの行は1つだけ
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            QuerySet.update(AttendanceMonthly.objects.filter(pk=monthly.pk), month='6')
+            AttendanceMonthly.objects.bulk_create([AttendanceMonthly(
+                employee=employee, year='2025', month='06', project_name='PJ',
+                base_calendar='本社', break_minutes=60, standard_work_hours=8.0
+            )])
+
+    def assertUsesEmployeePeriodIndex(self, queryset):
+        # (社員, 年月キー) のユニーク制約のインデックス (SQLite では自動命名)
+        self.assertRegex(queryset.explain(), r'USING (COVERING )?INDEX \S+ \(employee_id=\? AND period')
+
+    def test_employee_month_lookup(self):
+        self.assertUsesEmployeePeriodIndex(AttendanceMonthly.objects.filter(employee_id='000001', period=202506))
+
+    def test_employee_month_range(self):
+        self.assertUsesEmployeePeriodIndex(
+            AttendanceMonthly.objects.filter(employee_id__in=['000001', '000002'],
+                                             period__range=(202501, 202506))
+        )
+
+    def test_daily_by_date(self):
+        self.assertUsesIndex(AttendanceDaily.objects.filter(date=date(2025, 6, 2)), 'daily_date')
+
+    def test_daily_by_date_and_work_type(self):
+        self.assertUsesIndex(
+            AttendanceDaily.objects.filter(date=date(2025, 6, 2), work_type='出勤'),
+            'daily_date_work_type_idx'
+        )
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class MonthlyRepositoryTests(TestCase):
+    """キャッシュ優先読み込み・行ロック付き write-through の MonthlyRepository テスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        cls.monthly = AttendanceMonthly.objects.create(
+            employee=cls.employee, year='2025', month='06', project_name='PJ',
+            base_calendar='本社', break_minutes=60, standard_work_hours=8.0
+        )
+        AttendanceDaily.objects.bulk_create([
+            AttendanceDaily(
+                monthly_attendance=cls.monthly, date=date(2025, 6, day), work_type='出勤',
+                start_time=time(9, 0), end_time=time(19, 0)
+            )
+            for day in range(1, 21)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        monthly_local_cache.clear_local()
+        cache_generations.clear_local()
+
+    def test_second_read_hits_cache(self):
+        first = monthly_repository.get(self.employee, 2025, 6)
+        with self.assertNumQueries(0):
+            second = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(first, second)
+        self.assertEqual(first.summary, second.summary)
+
+    def test_save_invalidates_cache(self):
+        monthly_data = monthly_repository.get(self.employee, 2025, 6)
+        monthly_data.update_day(date(2025, 6, 3), end_time=time(22, 0))
+        monthly_repository.save(monthly_data, self.employee)
+        # 保存後の最初の読み込みは DB から作り直し、2 回目はキャッシュ
+        reloaded = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(reloaded.find_day(date(2025, 6, 3)).end_time, time(22, 0))
+        self.assertFalse(reloaded.dirty_days())
+        with self.assertNumQueries(0):
+            monthly_repository.get(self.employee, 2025, 6)
+
+    def test_saving_two_copies_of_same_month_keeps_both_edits(self):
+        copy_a = monthly_repository.get(self.employee, 2025, 6)
+        copy_b = deepcopy(copy_a)
+        copy_a.update_day(date(2025, 6, 3), end_time=time(22, 0))
+        monthly_repository.save(copy_a, self.employee)
+        # copy_b は 3 日の変更を知らないまま 4 日だけ変更して保存する
+        copy_b.update_day(date(2025, 6, 4), end_time=time(20, 0))
+        monthly_repository.save(copy_b, self.employee)
+
+        reloaded = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(reloaded.find_day(date(2025, 6, 3)).end_time, time(22, 0))
+        self.assertEqual(reloaded.find_day(date(2025, 6, 4)).end_time, time(20, 0))
+        cached = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(cached.find_day(date(2025, 6, 3)).end_time, time(22, 0))
+
+    def test_edit_writes_through_cache(self):
+        monthly_repository.get(self.employee, 2025, 6)
+        with monthly_repository.edit(self.employee, 2025, 6) as monthly_data:
+            monthly_data.update_day(date(2025, 6, 3), end_time=time(22, 0))
+        self.assertEqual(AttendanceDaily.objects.get(date=date(2025, 6, 3)).end_time, time(22, 0))
+        # 保存したコピーがそのままキャッシュに入る
+        with self.assertNumQueries(0):
+            cached = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(cached.find_day(date(2025, 6, 3)).end_time, time(22, 0))
+        self.assertFalse(cached.dirty_days())
+
+    def test_edit_locks_month_row(self):
+        with mock.patch('attendance.repository.load_monthly_structures_range',
+                        wraps=load_monthly_structures_range) as loader:
+            with monthly_repository.edit(self.employee, 2025, 6) as monthly_data:
+                self.assertEqual(len(monthly_data.daily_list), 20)
+        self.assertTrue(loader.call_args.kwargs['lock'])
+
+    def test_edit_reads_db_not_cached_copy(self):
+        monthly_repository.get(self.employee, 2025, 6)
+        # キャッシュにまだ反映されていない変更
+        AttendanceDaily.objects.filter(date=date(2025, 6, 4)).update(end_time=time(20, 0))
+        with monthly_repository.edit(self.employee, 2025, 6) as monthly_data:
+            monthly_data.update_day(date(2025, 6, 3), end_time=time(22, 0))
+        cached = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(cached.find_day(date(2025, 6, 3)).end_time, time(22, 0))
+        self.assertEqual(cached.find_day(date(2025, 6, 4)).end_time, time(20, 0))
+
+    def test_edit_error_rolls_back_and_keeps_cache(self):
+        monthly_repository.get(self.employee, 2025, 6)
+        with self.assertRaises(RuntimeError):
+            with monthly_repository.edit(self.employee, 2025, 6) as monthly_data:
+                monthly_data.update_day(date(2025, 6, 3), end_time=time(22, 0))
+                raise RuntimeError('boom')
+        self.assertEqual(AttendanceDaily.objects.get(date=date(2025, 6, 3)).end_time, time(19, 0))
+        with self.assertNumQueries(0):
+            cached = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(cached.find_day(date(2025, 6, 3)).end_time, time(19, 0))
+
+    def test_write_through_overtaken_by_later_writer_is_dropped(self):
+        def later_writer_commits(employee_id, months, **kwargs):
+            # キャッシュに書いた直後に、次の書き込みがロックを取ってトークンを更新した
+            cache_monthly_bundle(employee_id, months, **kwargs)
+            claim_month_writes(employee_id, list(months))
+
+        with mock.patch('attendance.repository.cache_monthly_bundle', side_effect=later_writer_commits):
+            with monthly_repository.edit(self.employee, 2025, 6) as monthly_data:
+                monthly_data.update_day(date(2025, 6, 3), end_time=time(22, 0))
+        self.assertIsNone(get_cached_monthly_data('000001', '2025', '6'))
+
+    def test_rebuild_overtaken_by_write_is_dropped(self):
+        def write_commits_during_rebuild(employee, year, month):
+            # DB から読み込んでいる間に書き込みがコミットされた
+            monthly_data = get_or_create_monthly_structure(employee, year, month)
+            claim_month_writes(employee.employee_no, [(int(year), int(month))])
+            return monthly_data
+
+        with mock.patch('attendance.cache_utils.get_or_create_monthly_structure',
+                        side_effect=write_commits_during_rebuild):
+            self.assertIsNotNone(monthly_repository.get(self.employee, 2025, 6))
+        self.assertIsNone(get_cached_monthly_data('000001', '2025', '6'))
+
+    def test_delete_day(self):
+        with monthly_repository.edit(self.employee, 2025, 6) as monthly_data:
+            monthly_repository.delete_day(monthly_data, date(2025, 6, 3))
+        self.assertFalse(AttendanceDaily.objects.filter(date=date(2025, 6, 3)).exists())
+        with self.assertNumQueries(0):
+            cached = monthly_repository.get(self.employee, 2025, 6)
+        self.assertIsNone(cached.find_day(date(2025, 6, 3)))
+        self.assertEqual(len(cached.daily_list), 19)
+
+    def test_delete_missing_month(self):
+        self.assertIsNone(monthly_repository.delete(self.employee, 2025, 7))
+        self.assertEqual(monthly_repository.delete(self.employee, 2025, 6), 20)
+
+    def test_get_many_loads_misses_together(self):
+        with self.assertNumQueries(2):
+            months = monthly_repository.get_many(self.employee, [(2025, 5), (2025, 6), (2025, 7)])
+        self.assertIsNone(months['2025-05'])
+        self.assertEqual(len(months['2025-06'].daily_list), 20)
+        # 存在しない月も記録されるので 2 回目は DB を読まない
+        with self.assertNumQueries(0):
+            months = monthly_repository.get_many(self.employee, [(2025, 5), (2025, 6), (2025, 7)])
+        self.assertIsNone(months['2025-07'])
+
+    def test_get_many_records_load_time(self):
+        # 一括ロードで書き込んだ月にも読み込み時間を記録し、確率的早期更新の対象にする
+        monthly_repository.get_many(self.employee, [(2025, 6), (2025, 7)])
+        for month in ('6', '7'):
+            stamp = monthly_local_cache.local.get(generate_cache_key('000001', '2025', month))[0]
+            self.assertGreater(stamp[2], 0)
+
+    def test_get_many_reads_cache_in_one_round_trip(self):
+        months = [(2025, 5), (2025, 6), (2025, 7)]
+        monthly_repository.get_many(self.employee, months)
+        monthly_local_cache.clear_local()  # 別ワーカーからの読み込みを想定
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many, \
+                self.assertNumQueries(0):
+            result = monthly_repository.get_many(self.employee, months)
+        # 3 か月分の値とバージョンスタンプを 1 回の MGET で取得
+        self.assertEqual(get_many.call_count, 1)
+        self.assertEqual(len(get_many.call_args.args[0]), 6)
+        self.assertEqual(len(result['2025-06'].daily_list), 20)
+
+    def test_invalidate_employee_bumps_generation(self):
+        monthly_repository.get(self.employee, 2025, 6)
+        old_key = generate_cache_key('000001', '2025', '6')
+        with mock.patch.object(cache, 'delete_pattern', create=True) as delete_pattern:
+            invalidate_employee_cache('000001')
+        delete_pattern.assert_not_called()
+        self.assertNotEqual(generate_cache_key('000001', '2025', '6'), old_key)
+        with self.assertNumQueries(2):
+            monthly_repository.get(self.employee, 2025, 6)
+
+    def test_invalidate_all(self):
+        monthly_repository.get(self.employee, 2025, 6)
+        invalidate_all_cache()
+        self.assertIsNone(get_cached_monthly_data('000001', '2025', '6'))
+
+    def test_report_is_cached_per_month_version(self):
+        build = mock.Mock(return_value=b'report')
+        self.assertEqual(get_report_with_cache(self.employee, 2025, 6, 'excel', build), b'report')
+        get_report_with_cache(self.employee, 2025, 6, 'excel', build)
+        self.assertEqual(build.call_count, 1)
+        monthly_data = monthly_repository.get(self.employee, 2025, 6)
+        monthly_data.update_day(date(2025, 6, 3), end_time=time(22, 0))
+        monthly_repository.save(monthly_data, self.employee)
+        get_report_with_cache(self.employee, 2025, 6, 'excel', build)
+        self.assertEqual(build.call_count, 2)
+
+    def test_unreadable_generation_bypasses_cache(self):
+        # キャッシュ障害で世代番号が読めないときは "gNone" のキーを作らず、その間はキャッシュを使わない
+        with mock.patch.object(cache, 'get_many', return_value={}), \
+                mock.patch.object(cache, 'add', return_value=False), \
+                mock.patch.object(cache, 'get', return_value=None):
+            self.assertIsNone(cache_generations.get('global'))
+            self.assertIsNone(generate_cache_key('000001', '2025', '6'))
+        self.assertIsNotNone(generate_cache_key('000001', '2025', '6'))
+
+        build = mock.Mock(return_value=b'report')
+        unreadable = mock.patch.object(
+            cache_generations, 'get_many', side_effect=lambda namespaces: dict.fromkeys(namespaces)
+        )
+        with unreadable, mock.patch.object(monthly_local_cache, 'set') as cache_set:
+            for _ in range(2):
+                with self.assertNumQueries(2):
+                    self.assertEqual(monthly_repository.get(self.employee, 2025, 6).project_name, 'PJ')
+                get_report_with_cache(self.employee, 2025, 6, 'excel', build)
+        cache_set.assert_not_called()
+        self.assertEqual(build.call_count, 2)
+
+    def test_report_is_rebuilt_when_holiday_calendar_changes(self):
+        build = mock.Mock(return_value=b'report')
+        get_report_with_cache(self.employee, 2025, 6, 'excel', build)
+        # キャッシュ済みの月はスタンプだけ確認し、月データは復元しない
+        with mock.patch('attendance.cache_utils.decode_monthly_data') as decode:
+            get_report_with_cache(self.employee, 2025, 6, 'excel', build)
+        decode.assert_not_called()
+        self.assertEqual(build.call_count, 1)
+        invalidate_calendar_cache('本社')
+        get_report_with_cache(self.employee, 2025, 6, 'excel', build)
+        self.assertEqual(build.call_count, 2)
+
+    def test_absent_month_is_cached(self):
+        self.assertIsNone(monthly_repository.get(self.employee, 2025, 7))
+        with self.assertNumQueries(0):
+            self.assertIsNone(monthly_repository.get(self.employee, 2025, 7))
+
+    def test_copy_prev_month_clears_absent_entry(self):
+        self.assertIsNone(monthly_repository.get(self.employee, 2025, 7))
+        self.client.force_login(self.employee)
+        response = self.client.post(reverse('attendance:copy_prev_month'), {'year': 2025, 'month': 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(monthly_repository.get(self.employee, 2025, 7).project_name, 'PJ')
+
+
+class CacheCodecTests(TestCase):
+    """キャッシュ用バイナリ直列化 (cache_codec) の往復テスト"""
+
+    def build(self, days=30):
+        daily_list = [
+            DailyData(
+                date=date(2025, 7, day), work_type='出勤' if day % 7 else '休日',
+                start_time=time(9, 0), end_time=time(18 + day % 5, 30),
+                notes='客先対応' if day % 5 == 0 else None,
+                is_required=day % 3 == 0, is_confirmed=day % 2 == 0, daily_id=100 + day,
+            )
+            for day in range(1, days + 1)
+        ]
+        daily_list.append(DailyData(
+            date=date(2025, 7, 31), work_type='特殊勤務',
+            start_time=None, end_time=None, alternative_work_date=date(2025, 6, 28), notes='',
+        ))
+        monthly_data = MonthlyData(
+            employee_id='000001', year='2025', month='07', project_name='PJ', base_calendar='本社',
+            break_minutes=60, standard_work_hours=8.0, daily_list=daily_list, monthly_id=42,
+        )
+        monthly_data.calculate_all_daily_hours()
+        return monthly_data
+
+    def assertRoundTrip(self, monthly_data, **kwargs):
+        restored = decode_monthly_data(encode_monthly_data(monthly_data, **kwargs))
+        self.assertEqual(restored, monthly_data)
+        self.assertEqual(restored.summary, monthly_data.summary)
+        self.assertEqual(restored.monthly_id, 42)
+        self.assertEqual([d.daily_id for d in restored.daily_list], [d.daily_id for d in monthly_data.daily_list])
+        self.assertFalse(restored.dirty_days())
+        self.assertFalse(restored.is_header_dirty)
+
+    def test_round_trip_compressed(self):
+        monthly_data = self.build()
+        payload = encode_monthly_data(monthly_data)
+        self.assertNotEqual(payload[1], 0)
+        self.assertRoundTrip(monthly_data)
+
+    def test_round_trip_uncompressed(self):
+        self.assertRoundTrip(self.build(days=3), compress=False)
+
+    def test_unknown_version_is_rejected(self):
+        payload = encode_monthly_data(self.build(days=3))
+        with self.assertRaises(CacheCodecError):
+            decode_monthly_data(bytes((payload[0] + 1,)) + payload[1:])
+
+    def test_corrupt_payload_is_rejected(self):
+        # どの段階で壊れていても CacheCodecError（呼び出し側ではキャッシュミス）になる
+        monthly_data = self.build(days=3)
+        count = len(monthly_data.daily_list)
+        payload = encode_monthly_data(monthly_data, compress=False)
+        strings = ['000001', '2025', '07', 'PJ', '本社', '', '特殊勤務']
+        self.assertTrue(payload.endswith(_pack_strings(strings)))
+        head = payload[:-len(_pack_strings(strings))]
+        work_type_offset = 2 + _HEADER.size + (8 + 2) * count
+        bad_code = bytearray(payload)
+        bad_code[work_type_offset] = 200
+
+        corrupted = {
+            'truncated': payload[:len(payload) // 2],
+            'short strings table': head + _pack_strings(strings[:5]),
+            'bad work type code': bytes(bad_code),
+            'bad month': head + _pack_strings(['000001', '2025', '13', 'PJ', '本社', '', '特殊勤務']),
+        }
+        for label, data in corrupted.items():
+            with self.subTest(label), self.assertRaises(CacheCodecError):
+                decode_monthly_data(data)
+
+    def test_unknown_work_type_is_kept_inline(self):
+        # コード表にない勤務区分はプロセス共通の表に追加せず文字列のまま保持する
+        daily = DailyData(date=date(2025, 7, 1), work_type='出勤', start_time=None, end_time=None)
+        daily.work_type = '特殊勤務'
+        self.assertEqual(daily._work_type, '特殊勤務')
+        self.assertEqual(daily.work_type, '特殊勤務')
+        daily.work_type = 'その他'
+        self.assertIsInstance(daily._work_type, int)
+        self.assertEqual(daily.work_type, 'その他')
+        daily.work_type = None
+        self.assertIsNone(daily.work_type)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_unknown_version_in_cache_is_miss(self):
+        monthly_local_cache.clear_local()
+        cache.set(generate_cache_key('000001', '2025', '7'), b'\xff\x00', timeout=60)
+        self.assertIsNone(get_cached_monthly_data('000001', '2025', '7'))
+        # 旧形式（JSON 文字列）の値もキャッシュミスとして扱い、DB から読み直させる
+        cache.set(generate_cache_key('000001', '2025', '7'), '{"daily_list": []}', timeout=60)
+        self.assertIsNone(get_cached_monthly_data('000001', '2025', '7'))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class VersionedLocalCacheTests(TestCase):
+    """Redis 前段のローカル LRU 層とバージョンスタンプによる再検証のテスト"""
+
+    def setUp(self):
+        cache.clear()
+        self.local_cache = VersionedLocalCache('test', max_entries=2, revalidate_seconds=60)
+
+    def test_local_hit_skips_shared_cache(self):
+        self.local_cache.set('a', b'1')
+        cache.delete('a')  # 共有キャッシュから消えても再検証前はローカルで返す
+        self.assertEqual(self.local_cache.get('a'), b'1')
+        self.assertEqual(self.local_cache.stats()['local_hit'], 1)
+
+    def test_other_worker_write_is_seen_after_revalidation(self):
+        self.local_cache.set('a', b'1')
+        other_worker = VersionedLocalCache('test_other', revalidate_seconds=0)
+        self.assertEqual(other_worker.get('a'), b'1')
+        self.local_cache.set('a', b'2')
+        self.assertEqual(other_worker.get('a'), b'2')
+        self.local_cache.delete('a')
+        self.assertIsNone(other_worker.get('a'))
+        stats = other_worker.stats()
+        self.assertEqual((stats['redis_hit'], stats['miss']), (2, 1))
+
+    def test_unchanged_version_is_revalidated_locally(self):
+        self.local_cache.set('a', b'1')
+        self.local_cache.revalidate_seconds = 0
+        self.assertEqual(self.local_cache.get('a'), b'1')
+        self.assertEqual(self.local_cache.stats()['revalidated_hit'], 1)
+
+    def test_lru_eviction(self):
+        for key in ('a', 'b', 'c'):
+            self.local_cache.set(key, key.encode())
+        self.assertIsNone(self.local_cache.local.get('a'))
+        self.assertEqual(len(self.local_cache.local), 2)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SingleFlightTests(TestCase):
+    """再生成の single-flight・予備コピー・確率的早期更新のテスト"""
+
+    def setUp(self):
+        cache.clear()
+        self.local_cache = VersionedLocalCache('single_flight_test', revalidate_seconds=0, stale_timeout=600)
+        self.local_cache.lock_wait_seconds = 0
+        self.build = mock.Mock(return_value=(b'new', 60))
+
+    def test_only_lock_holder_builds(self):
+        self.assertEqual(self.local_cache.get_or_build('a', self.build), b'new')
+        self.assertEqual(self.local_cache.get_or_build('a', self.build), b'new')
+        self.build.assert_called_once()
+        self.assertIsNone(cache.get(self.local_cache.lock_key('a')))
+
+    def test_waiter_falls_back_to_stale_copy(self):
+        self.local_cache.set('a', b'old', timeout=60)
+        self.local_cache.delete('a')
+        cache.add(self.local_cache.lock_key('a'), 'other', timeout=10)  # 他のリクエストが再生成中
+        self.assertEqual(self.local_cache.get_or_build('a', self.build), b'old')
+        self.build.assert_not_called()
+        self.assertEqual(self.local_cache.stats()['stale_hit'], 1)
+
+    def test_lock_release_is_atomic_on_redis(self):
+        # django-redis では比較と削除を1回のスクリプトで行い、期限切れ後に他のリクエストの錠を消さない
+        client = mock.Mock()
+        client.make_key.side_effect = lambda key: f'prefix:{key}'
+        client.encode.side_effect = lambda value: f'encoded:{value}'
+        with mock.patch.object(cache, 'client', client, create=True), \
+                mock.patch.object(cache, 'delete', wraps=cache.delete) as delete:
+            self.local_cache._release('a', 'token')
+        client.get_client.return_value.eval.assert_called_once_with(mock.ANY, 1, 'prefix:lock:a', 'encoded:token')
+        delete.assert_not_called()
+
+    def test_hot_key_is_refreshed_early(self):
+        # 再生成に時間がかかる値は期限前でも更新される
+        self.local_cache.set('a', b'old', timeout=60, build_seconds=1000)
+        with mock.patch('attendance.local_cache.random.random', return_value=0.5):
+            self.assertEqual(self.local_cache.get_or_build('a', self.build), b'new')
+        # 期限まで余裕があり再生成も速い値はそのまま
+        self.local_cache.set('b', b'old', timeout=3600, build_seconds=0.01)
+        with mock.patch('attendance.local_cache.random.random', return_value=0.5):
+            self.assertEqual(self.local_cache.get_or_build('b', self.build), b'old')
+        # まとめて書き込んだ値も再生成時間に応じて更新される
+        self.local_cache.set_many({'c': b'old'}, timeout=60, build_seconds=1000)
+        with mock.patch('attendance.local_cache.random.random', return_value=0.5):
+            self.assertEqual(self.local_cache.get_or_build('c', self.build), b'new')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class HolidayIndexTests(TestCase):
+    """カレンダー別・年別の休日インデックスのテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        HolidayCalendar.objects.bulk_create([
+            HolidayCalendar(calendar_name='共通', date=date(2025, 5, 5), category='祝日'),
+            HolidayCalendar(calendar_name='共通', date=date(2025, 6, 30), category='祝日'),
+            HolidayCalendar(calendar_name='Techave', date=date(2025, 6, 30), category='会社休日'),
+            HolidayCalendar(calendar_name='Techave', date=date(2026, 1, 2), category='会社休日'),
+        ])
+
+    def setUp(self):
+        cache.clear()
+        holiday_local_cache.clear_local()
+        cache_generations.clear_local()
+
+    def test_indexes_are_loaded_once(self):
+        months = [(2025, 12), (2026, 1), (2026, 2)]
+        with self.assertNumQueries(1):
+            holidays = get_holidays(['共通', 'Techave'], months)
+        self.assertEqual(holidays, {date(2026, 1, 2): [{'calendar_name': 'Techave', 'category': '会社休日'}]})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_holidays(['共通', 'Techave'], months), holidays)
+
+    def test_month_lookup(self):
+        holidays = get_holidays(['共通', 'Techave'], [(2025, 6)])
+        self.assertEqual(holidays[date(2025, 6, 30)], [
+            {'calendar_name': '共通', 'category': '祝日'},
+            {'calendar_name': 'Techave', 'category': '会社休日'},
+        ])
+        self.assertEqual(get_holidays(['共通'], [(2025, 5), (2025, 6)]).keys(), {date(2025, 5, 5), date(2025, 6, 30)})
+
+    def test_admin_edit_invalidates_calendar(self):
+        get_holidays(['共通'], [(2025, 7)])
+        holiday = HolidayCalendar.objects.create(calendar_name='共通', date=date(2025, 7, 21), category='祝日')
+        self.assertIn(date(2025, 7, 21), get_holidays(['共通'], [(2025, 7)]))
+        holiday.calendar_name = 'H大甕'
+        holiday.save()
+        self.assertNotIn(date(2025, 7, 21), get_holidays(['共通'], [(2025, 7)]))
+        self.assertIn(date(2025, 7, 21), get_holidays(['H大甕'], [(2025, 7)]))
+        holiday.delete()
+        self.assertEqual(get_holidays(['H大甕'], [(2025, 7)]), {})
+
+
+class MonthSkeletonTests(TestCase):
+    """月の骨格（日付・曜日・休日）のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        HolidayCalendar.objects.bulk_create([
+            HolidayCalendar(calendar_name='共通', date=date(2025, 6, 30), category='祝日'),
+            HolidayCalendar(calendar_name='Techave', date=date(2025, 6, 27), category='会社休日'),
+        ])
+
+    def setUp(self):
+        cache.clear()
+        holiday_local_cache.clear_local()
+        cache_generations.clear_local()
+        clear_month_skeletons()
+
+    def test_days_and_weeks(self):
+        skeleton = get_month_skeleton(2025, 6, 'Techave')
+        self.assertEqual(len(skeleton.days), 30)
+        self.assertEqual(skeleton.day(1).weekday_name, '日')
+        self.assertEqual(skeleton.day(1).default_work_type, '休日(法)')
+        self.assertEqual(skeleton.day(7).default_work_type, '休日')
+        self.assertIsNone(skeleton.day(2).default_work_type)
+        self.assertEqual(skeleton.day(27).holidays, (('Techave', '会社休日'),))
+        self.assertEqual(skeleton.day(27).common_categories, ())
+        self.assertEqual(skeleton.day(30).common_categories, ('祝日',))
+        # 日曜始まりの週行
+        self.assertEqual(skeleton.weeks[0][0].date, date(2025, 6, 1))
+        self.assertIsNone(skeleton.weeks[-1][-1])
+
+    def test_memoized_until_calendar_changes(self):
+        skeleton = get_month_skeleton(2025, 6, 'Techave')
+        with self.assertNumQueries(0):
+            self.assertIs(get_month_skeleton(2025, 6, 'Techave'), skeleton)
+        HolidayCalendar.objects.create(calendar_name='Techave', date=date(2025, 6, 26), category='会社休日')
+        rebuilt = get_month_skeleton(2025, 6, 'Techave')
+        self.assertIsNot(rebuilt, skeleton)
+        self.assertTrue(rebuilt.day(26).is_calendar_holiday)
+
+    def test_join_records(self):
+        daily = DailyData(date(2025, 6, 2), '出勤', time(9, 0), time(18, 0))
+        joined = get_month_skeleton(2025, 6).join([daily])
+        self.assertIs(joined[1][1], daily)
+        self.assertIsNone(joined[0][1])
+        self.assertTrue(is_holiday_work_type('振替(休)'))
+        self.assertFalse(is_holiday_work_type('出勤'))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    ATTENDANCE_PREFETCH={'ENABLED': False},
+)
+class MainViewContextTests(TestCase):
+    """メイン画面のコンテキスト構築（クエリ数・処理時間の予算）のテスト"""
+
+    # キャッシュが空の時: ユーザー, 月次, 日次, 休日
+    COLD_QUERY_BUDGET = 4
+    # キャッシュ済みの時: ユーザーのみ
+    WARM_QUERY_BUDGET = 1
+    # キャッシュ済みの時の1リクエストあたりの処理時間 (秒)
+    WARM_LATENCY_BUDGET = 0.5
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        for year, month in (('2025', '11'), ('2025', '12'), ('2026', '01')):
+            monthly = AttendanceMonthly.objects.create(
+                employee=cls.employee, year=year, month=month, project_name='PJ',
+                base_calendar='Techave', break_minutes=60, standard_work_hours=8.0
+            )
+            AttendanceDaily.objects.bulk_create([
+                AttendanceDaily(
+                    monthly_attendance=monthly, date=date(int(year), int(month), day), work_type='出勤',
+                    start_time=time(9, 0), end_time=time(19, 0)
+                )
+                for day in range(1, 29)
+            ])
+        HolidayCalendar.objects.bulk_create([
+            HolidayCalendar(calendar_name='共通', date=date(2025, 12, 31), category='祝日'),
+            HolidayCalendar(calendar_name='Techave', date=date(2026, 1, 2), category='会社休日'),
+        ])
+
+    def setUp(self):
+        cache.clear()
+        monthly_local_cache.clear_local()
+        holiday_local_cache.clear_local()
+        cache_generations.clear_local()
+        clear_month_skeletons()
+        self.client.force_login(self.employee)
+        self.url = reverse('attendance:main') + '?year=2025&month=12'
+
+    def test_query_budget(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(ctx), self.COLD_QUERY_BUDGET)
+        # 年をまたぐ3か月分でも休日の取得は1回
+        self.assertEqual(sum('holiday_calendar' in query['sql'] for query in ctx.captured_queries), 1)
+        with self.assertNumQueries(self.WARM_QUERY_BUDGET):
+            self.client.get(self.url)
+
+    def test_latency_budget(self):
+        self.client.get(self.url)
+        started = perf_counter()
+        for _ in range(5):
+            self.client.get(self.url)
+        self.assertLess((perf_counter() - started) / 5, self.WARM_LATENCY_BUDGET)
+
+    def test_context(self):
+        context = self.client.get(self.url).context
+        month_days = context['month_days_list']
+        self.assertEqual(len(month_days), 31)
+        self.assertEqual(month_days[0].record.date, date(2025, 12, 1))
+        self.assertIsNone(month_days[30].record)
+        self.assertTrue(month_days[30].is_holiday)
+        self.assertEqual(context['prev_monthly_data'].month, '11')
+        self.assertEqual(context['calendar'][0][0], {'date': None, 'record': None, 'holiday_category': []})
+        self.assertEqual(context['calendar'][4][3]['holiday_category'], ['祝日'])
+        self.assertIn('2026-01-02', context['holidays_db'])
+        # 過去の月は月末日
+        self.assertEqual(context['default_day'], 31)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    ATTENDANCE_PREFETCH={'ENABLED': True},
+)
+class MonthPrefetchTests(TransactionTestCase):
+    """応答後の隣接月先読みのテスト（バックグラウンドスレッドからDBを読むため TransactionTestCase）"""
+
+    def setUp(self):
+        cache.clear()
+        monthly_local_cache.clear_local()
+        cache_generations.clear_local()
+        month_prefetcher.reset_stats()
+        self.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        for month in ('05', '06', '07'):
+            AttendanceMonthly.objects.create(
+                employee=self.employee, year='2025', month=month, project_name='PJ',
+                base_calendar='共通', break_minutes=60, standard_work_hours=8.0
+            )
+        self.client.force_login(self.employee)
+
+    def _get_main(self, month):
+        response = self.client.get(reverse('attendance:main') + f'?year=2025&month={month}')
+        self.assertEqual(response.status_code, 200)
+        month_prefetcher.wait(timeout=10)
+        return response
+
+    def test_neighbours_are_prefetched_after_response(self):
+        self._get_main(6)
+        cached = lookup_cached_monthly_bundle('000001', [(2025, 4), (2025, 7)])
+        # 4月はDBにない月として、7月はデータとしてキャッシュ済み
+        self.assertIs(cached[(2025, 4)], MONTH_ABSENT)
+        self.assertEqual(cached[(2025, 7)].project_name, 'PJ')
+        self.assertEqual(month_prefetcher.stats()['loaded'], 2)
+
+        # 翌月へ移動すると先読みした7月がキャッシュから使われる
+        with self.assertNumQueries(1):
+            self.client.get(reverse('attendance:main') + '?year=2025&month=7')
+        month_prefetcher.wait(timeout=10)
+        stats = month_prefetcher.stats()
+        # 7月の画面でさらに8月を先読み (5月はキャッシュ済み)
+        self.assertEqual(stats['used'], 1)
+        self.assertEqual(stats['loaded'], 3)
+        self.assertEqual(stats['already_cached'], 1)
+        self.assertAlmostEqual(stats['use_rate'], 1 / 3)
+
+    def test_repeated_navigation_is_deduplicated(self):
+        self._get_main(6)
+        self._get_main(6)
+        stats = month_prefetcher.stats()
+        self.assertEqual(stats['scheduled'], 2)
+        self.assertEqual(stats['deduplicated'], 2)
+
+    @override_settings(ATTENDANCE_PREFETCH={'ENABLED': False})
+    def test_disabled(self):
+        self._get_main(6)
+        self.assertEqual(month_prefetcher.stats()['scheduled'], 0)
+        self.assertIsNone(lookup_cached_monthly_bundle('000001', [(2025, 7)])[(2025, 7)])
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    ATTENDANCE_PREFETCH={'ENABLED': False},
+)
+class ConditionalGetTests(TestCase):
+    """月バージョンスタンプによる ETag / Last-Modified と 304 応答のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        cls.monthly = AttendanceMonthly.objects.create(
+            employee=cls.employee, year='2025', month='06', project_name='PJ',
+            base_calendar='共通', break_minutes=60, standard_work_hours=8.0
+        )
+        AttendanceDaily.objects.create(
+            monthly_attendance=cls.monthly, date=date(2025, 6, 2), work_type='出勤',
+            start_time=time(9, 0), end_time=time(18, 0)
+        )
+
+    def setUp(self):
+        cache.clear()
+        monthly_local_cache.clear_local()
+        cache_generations.clear_local()
+        self.client.force_login(self.employee)
+
+    def _update_day(self):
+        response = self.client.post(reverse('attendance:daily_update'), {
+            'year': 2025, 'month': 6, 'day': 2, 'work_type': '出勤', 'start_time': '09:00', 'end_time': '20:00',
+        }, content_type='application/json')
+        self.assertEqual(response.json()['status'], 'success')
+
+    def test_daily_get_not_modified(self):
+        url = reverse('attendance:daily_get') + '?date=2025-06-02'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        with mock.patch.object(monthly_repository, 'get') as get:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        get.assert_not_called()
+
+        # 書き込みでバージョンが変わる
+        self._update_day()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['record']['end_time'], '20:00')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_other_month_write_keeps_etag(self):
+        url = reverse('attendance:daily_get') + '?date=2025-06-02'
+        etag = self.client.get(url)['ETag']
+        monthly_repository.invalidate('000001', 2025, 8)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        invalidate_employee_cache('000001')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_main_page_not_modified(self):
+        url = reverse('attendance:main') + '?year=2025&month=6'
+        # 初回表示で CSRF クッキーが発行されるので2回目の ETag を使う
+        self.client.get(url)
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertNotIn('Last-Modified', response)
+        with mock.patch.object(monthly_repository, 'get_many') as get_many:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        get_many.assert_not_called()
+        # 休日カレンダーの変更も反映
+        HolidayCalendar.objects.create(calendar_name='共通', date=date(2025, 6, 16), category='祝日')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_bulk_info_not_modified(self):
+        url = reverse('attendance:monthly_bulk_info') + '?year=2025&month=6'
+        response = self.client.get(url)
+        self.assertTrue(response.json()['data']['2025-06']['exist'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self._update_day()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    ATTENDANCE_PREFETCH={'ENABLED': False},
+)
+class PartialUpdatePayloadTests(TestCase):
+    """更新系APIが返す日レコード・月合計（画面の部分更新用）のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        cls.monthly = AttendanceMonthly.objects.create(
+            employee=cls.employee, year='2025', month='06', project_name='PJ',
+            base_calendar='共通', break_minutes=60, standard_work_hours=8.0
+        )
+        AttendanceDaily.objects.create(
+            monthly_attendance=cls.monthly, date=date(2025, 6, 2), work_type='出勤',
+            start_time=time(9, 0), end_time=time(18, 0)
+        )
+
+    def setUp(self):
+        cache.clear()
+        monthly_local_cache.clear_local()
+        cache_generations.clear_local()
+        self.client.force_login(self.employee)
+
+    def _post(self, name, data):
+        response = self.client.post(reverse(name), data, content_type='application/json')
+        result = response.json()
+        self.assertEqual(result['status'], 'success', result)
+        return result
+
+    def _assert_month_matches_db(self, month):
+        # キャッシュを捨ててDBから読み直した値と一致すること
+        cache.clear()
+        monthly_local_cache.clear_local()
+        fresh = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(month['work_days'], fresh.work_days)
+        self.assertAlmostEqual(month['total_overtime_hours'], fresh.total_overtime_hours, places=2)
+        self.assertAlmostEqual(month['total_regular_work_hours'], fresh.total_regular_work_hours, places=2)
+
+    def test_daily_update_returns_day_and_month(self):
+        result = self._post('attendance:daily_update', {
+            'year': 2025, 'month': 6, 'day': 3, 'work_type': '出勤', 'start_time': '09:00', 'end_time': '21:00',
+        })
+        self.assertEqual(result['day']['date'], '2025-06-03')
+        self.assertEqual(result['day']['record']['end_time'], '21:00')
+        self.assertEqual(result['month']['work_days'], 2)
+        self._assert_month_matches_db(result['month'])
+
+    def test_delete_and_approve(self):
+        result = self._post('attendance:daily_approve', {'date': '2025-06-02'})
+        self.assertTrue(result['day']['record']['is_required'])
+        result = self._post('attendance:daily_delete', {'date': '2025-06-02'})
+        self.assertEqual(result['day'], {'date': '2025-06-02', 'record': None})
+        self.assertEqual(result['month']['work_days'], 0)
+        self._assert_month_matches_db(result['month'])
+
+    def test_monthly_update_returns_month(self):
+        result = self._post('attendance:monthly_update', {
+            'year': 2025, 'month': 6, 'project_name': 'PJ2', 'base_calendar': '共通',
+            'break_minutes': 45, 'standard_work_hours': 7.5,
+        })
+        self.assertEqual(result['month']['project_name'], 'PJ2')
+        self.assertEqual(result['month']['break_minutes'], 45)
+        self._assert_month_matches_db(result['month'])
+
+    def test_write_paths_ignore_stale_cached_copy(self):
+        # 他プロセスの更新がまだ届いていないローカルキャッシュの状態を作る
+        def add_day_behind_cache(day):
+            monthly_repository.get(self.employee, 2025, 6)
+            AttendanceDaily.objects.create(
+                monthly_attendance=self.monthly, date=date(2025, 6, day), work_type='出勤',
+                start_time=time(9, 0), end_time=time(18, 0)
+            )
+
+        add_day_behind_cache(4)
+        result = self._post('attendance:daily_delete', {'date': '2025-06-04'})
+        self.assertEqual(result['month']['work_days'], 1)
+
+        add_day_behind_cache(5)
+        result = self._post('attendance:daily_update', {
+            'year': 2025, 'month': 6, 'day': 3, 'work_type': '出勤', 'start_time': '09:00', 'end_time': '18:00',
+        })
+        self.assertEqual(result['month']['work_days'], 3)
+
+        add_day_behind_cache(6)
+        result = self._post('attendance:daily_batch_update', {
+            'year': 2025, 'month': 6,
+            'days': [{'day': 9, 'work_type': '出勤', 'start_time': '09:00', 'end_time': '18:00'}],
+        })
+        self.assertEqual(result['months'][0]['work_days'], 5)
+        self._assert_month_matches_db(result['months'][0])
+
+    def test_month_days_endpoint(self):
+        AttendanceDaily.objects.filter(date=date(2025, 6, 2)).update(is_required=True)
+        monthly_repository.invalidate('000001', 2025, 6)
+        url = reverse('attendance:daily_month') + '?year=2025&month=6'
+        response = self.client.get(url)
+        result = response.json()
+        self.assertEqual(result['month']['work_days'], 1)
+        self.assertEqual(list(result['days']), ['2025-06-02'])
+        record = result['days']['2025-06-02']
+        self.assertTrue(record['is_required'])
+        self.assertEqual(record['regular_work_hours'], 8.0)
+        # 日別取得APIと同じレコード
+        daily = self.client.get(reverse('attendance:daily_get') + '?date=2025-06-02').json()
+        self.assertEqual(daily['record'], record)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self._post('attendance:daily_update', {
+            'year': 2025, 'month': 6, 'day': 3, 'work_type': '出勤', 'start_time': '09:00', 'end_time': '18:00',
+        })
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.json()['days']), ['2025-06-02', '2025-06-03'])
+
+    def test_month_days_without_monthly(self):
+        result = self.client.get(reverse('attendance:daily_month') + '?year=2025&month=7').json()
+        self.assertEqual(result, {'status': 'success', 'month': None, 'days': {}})
+        result = self.client.get(reverse('attendance:daily_month') + '?year=2025&month=13').json()
+        self.assertEqual(result['status'], 'error')
+
+    def test_daily_get_served_from_cached_month(self):
+        self.client.get(reverse('attendance:daily_month') + '?year=2025&month=6')
+        with CaptureQueriesContext(connection) as queries:
+            result = self.client.get(reverse('attendance:daily_get') + '?date=2025-06-02').json()
+        self.assertEqual(result['record']['end_time'], '18:00')
+        self.assertFalse([q for q in queries.captured_queries if 'attendance_' in q['sql']])
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    ATTENDANCE_PREFETCH={'ENABLED': False},
+)
+class DailyBatchUpdateTests(TestCase):
+    """日別データ一括更新APIのテスト（1トランザクション・承認ロック・日別エラー）"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        for month in ('06', '07'):
+            AttendanceMonthly.objects.create(
+                employee=cls.employee, year='2025', month=month, project_name='PJ',
+                base_calendar='共通', break_minutes=60, standard_work_hours=8.0
+            )
+        AttendanceDaily.objects.create(
+            monthly_attendance=AttendanceMonthly.objects.get(month='06'), date=date(2025, 6, 2),
+            work_type='出勤', start_time=time(9, 0), end_time=time(18, 0), is_confirmed=True
+        )
+
+    def setUp(self):
+        cache.clear()
+        monthly_local_cache.clear_local()
+        cache_generations.clear_local()
+        self.client.force_login(self.employee)
+
+    def _post(self, data):
+        return self.client.post(reverse('attendance:daily_batch_update'), data, content_type='application/json').json()
+
+    @staticmethod
+    def _entry(day, **fields):
+        return {'day': day, 'work_type': '出勤', 'start_time': '09:00', 'end_time': '19:00', **fields}
+
+    def test_month_in_one_transaction(self):
+        days = [self._entry(day) for day in range(3, 31) if date(2025, 6, day).weekday() < 5]
+        with CaptureQueriesContext(connection) as queries:
+            result = self._post({'year': 2025, 'month': 6, 'days': days})
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual((result['saved'], result['failed']), (len(days), 0))
+        # 日数に関係なく一定のクエリ数（セッション/ユーザー + 月データ読み込み 2 回 + 保存）
+        self.assertLessEqual(len(queries), 10)
+        self.assertEqual(AttendanceDaily.objects.filter(date__month=6).count(), len(days) + 1)
+        # 保存した月はキャッシュに書き込まれており、その内容は DB と一致
+        with self.assertNumQueries(0):
+            cached = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(len(cached.daily_list), len(days) + 1)
+        self.assertEqual(result['months'][0]['work_days'], cached.work_days)
+
+    def test_per_day_errors_and_lock(self):
+        result = self._post({'year': 2025, 'month': 6, 'days': [
+            self._entry(2),                        # 承認済み
+            self._entry(3),
+            self._entry(3),                        # 重複
+            self._entry(4, start_time=''),         # 必須項目なし
+            self._entry(5, work_type='夜勤'),      # 勤務区分の選択肢にない
+            self._entry(6, end_time='25:99'),      # 時刻の形式が不正
+            self._entry(31),                       # 無効な日付
+            self._entry(1, year=2025, month=7),    # 別の月
+            self._entry(1, year=2025, month=8),    # 月別データなし
+        ]})
+        self.assertEqual(result['status'], 'success')
+        statuses = [(r['index'], r['status']) for r in result['results']]
+        self.assertEqual(statuses, [(0, 'error'), (1, 'success'), (2, 'error'), (3, 'error'),
+                                    (4, 'error'), (5, 'error'), (6, 'error'), (7, 'success'), (8, 'error')])
+        self.assertIn('承認', result['results'][0]['message'])
+        self.assertIn('勤務区分', result['results'][4]['message'])
+        self.assertIn('作業終了時刻', result['results'][5]['message'])
+        self.assertFalse(AttendanceDaily.objects.filter(date=date(2025, 6, 6)).exists())
+        self.assertEqual(result['results'][1]['record']['end_time'], '19:00')
+        self.assertEqual(sorted((m['year'], m['month']) for m in result['months']), [(2025, 6), (2025, 7)])
+        self.assertEqual(AttendanceDaily.objects.get(date=date(2025, 6, 2)).end_time, time(18, 0))
+        self.assertTrue(AttendanceDaily.objects.filter(date=date(2025, 7, 1)).exists())
+
+    def test_failure_rolls_back_all_months(self):
+        monthly_repository.get_many(self.employee, [(2025, 6), (2025, 7)])
+        saved = []
+
+        def fail_on_second_month(monthly_data, employee):
+            # 1か月目は実際に書き込み、2か月目で失敗させる
+            if saved:
+                raise RuntimeError('boom')
+            saved.append(monthly_data.month)
+            return update_monthly_from_structure(monthly_data, employee)
+
+        with mock.patch('attendance.repository.update_monthly_from_structure', side_effect=fail_on_second_month):
+            result = self._post({'year': 2025, 'month': 6, 'days': [
+                self._entry(3), self._entry(1, month=7),
+            ]})
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(len(saved), 1)
+        self.assertEqual(AttendanceDaily.objects.count(), 1)
+        self.assertIsNone(monthly_repository.get(self.employee, 2025, 6).find_day(date(2025, 6, 3)))
+
+    def test_request_errors(self):
+        self.assertEqual(self._post({'days': []})['status'], 'error')
+        too_many = [self._entry(1)] * 63
+        self.assertEqual(self._post({'year': 2025, 'month': 6, 'days': too_many})['status'], 'error')
+        result = self._post({'year': 2025, 'month': 6, 'days': [self._entry(2)]})
+        self.assertEqual((result['status'], result['saved'], result['failed']), ('error', 0, 1))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    ATTENDANCE_PREFETCH={'ENABLED': False},
+)
+class DailyPatternApplyTests(TestCase):
+    """勤務パターン一括適用のテスト（休日カレンダー・入力済み/承認済みの日は対象外）"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        cls.monthly = AttendanceMonthly.objects.create(
+            employee=cls.employee, year='2025', month='06', project_name='PJ',
+            base_calendar='本社', break_minutes=60, standard_work_hours=8.0
+        )
+        AttendanceDaily.objects.create(
+            monthly_attendance=cls.monthly, date=date(2025, 6, 2), work_type='出勤',
+            start_time=time(9, 0), end_time=time(18, 0), is_confirmed=True
+        )
+        AttendanceDaily.objects.create(
+            monthly_attendance=cls.monthly, date=date(2025, 6, 3), work_type='有給',
+            start_time=time(9, 0), end_time=time(18, 0)
+        )
+        HolidayCalendar.objects.create(calendar_name='共通', date=date(2025, 6, 16), category='祝日')
+        HolidayCalendar.objects.create(calendar_name='本社', date=date(2025, 6, 20), category='会社休日')
+        # 基準カレンダー以外の休日は無視
+        HolidayCalendar.objects.create(calendar_name='支社', date=date(2025, 6, 23), category='会社休日')
+
+    def setUp(self):
+        cache.clear()
+        monthly_local_cache.clear_local()
+        cache_generations.clear_local()
+        holiday_local_cache.clear_local()
+        clear_month_skeletons()
+        self.client.force_login(self.employee)
+
+    def _apply(self, **data):
+        data = {'year': 2025, 'month': 6, 'work_type': '出勤', 'start_time': '09:00', 'end_time': '18:00', **data}
+        return self.client.post(reverse('attendance:daily_apply_pattern'), data, content_type='application/json').json()
+
+    def test_fill_weekdays(self):
+        # 2025年6月の平日は21日: 祝日2日・入力済み2日を除く17日
+        monthly_repository.get(self.employee, 2025, 6)
+        get_month_skeleton(2025, 6, '本社')
+        with CaptureQueriesContext(connection) as queries:
+            result = self._apply()
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual((result['filled'], result['skipped_holidays'], result['skipped_entered']), (17, 2, 2))
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "attendance_daily"')]
+        self.assertEqual(len(inserts), 1)
+
+        filled = set(AttendanceDaily.objects.filter(work_type='出勤', is_confirmed=False).values_list('date', flat=True))
+        self.assertEqual(len(filled), 17)
+        self.assertIn(date(2025, 6, 23), filled)
+        self.assertFalse({date(2025, 6, 16), date(2025, 6, 20), date(2025, 6, 7)} & filled)
+        self.assertEqual(AttendanceDaily.objects.get(date=date(2025, 6, 3)).work_type, '有給')
+
+        # 埋めた月はキャッシュに書き込まれている
+        with self.assertNumQueries(0):
+            cached = monthly_repository.get(self.employee, 2025, 6)
+        self.assertEqual(len(cached.daily_list), 19)
+        self.assertEqual(result['month']['work_days'], cached.work_days)
+        # 2回目は埋める日がない
+        self.assertEqual(self._apply()['filled'], 0)
+
+    def test_weekday_mask(self):
+        result = self._apply(weekdays=[5])
+        self.assertEqual(result['filled'], 4)
+        self.assertEqual([day['date'] for day in result['days']],
+                         ['2025-06-07', '2025-06-14', '2025-06-21', '2025-06-28'])
+        self.assertEqual(self._apply(weekdays=[7])['status'], 'error')
+        self.assertEqual(self._apply(weekdays=[])['status'], 'error')
+
+    def test_validation(self):
+        self.assertEqual(self._apply(start_time='')['status'], 'error')
+        self.assertEqual(self._apply(month=7)['message'], '該当する月別勤怠情報が見つかりません')
+
+    def test_malformed_time_is_rejected(self):
+        # 解析できない時刻を空の時刻として月全体に書き込まない
+        result = self._apply(end_time='25:99')
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('作業終了時刻', result['message'])
+        self.assertEqual(self._apply(start_time='9時')['status'], 'error')
+        self.assertEqual(AttendanceDaily.objects.count(), 2)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ExcelReportTemplateTests(TestCase):
+    """エクセル報告書テンプレート（静的レイアウトの複製＋値のみ書き込み）のテスト"""
+
+    # テンプレート複製が毎回全体を描く方式より何倍速いこと
+    MIN_SPEEDUP = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create_user(
+            employee_no='000001', password='0000', first_name='太郎', last_name='山田'
+        )
+        monthly = AttendanceMonthly.objects.create(
+            employee=cls.employee, year='2025', month='06', project_name='PJ',
+            base_calendar='共通', break_minutes=60, standard_work_hours=8.0
+        )
+        for day, work_type in [(2, '出勤'), (3, '振替(休)'), (7, '出勤'), (16, '有給')]:
+            AttendanceDaily.objects.create(
+                monthly_attendance=monthly, date=date(2025, 6, day), work_type=work_type,
+                start_time=time(9, 0), end_time=time(19, 30), notes='作業'
+            )
+
+    def setUp(self):
+        cache.clear()
+        monthly_local_cache.clear_local()
+        cache_generations.clear_local()
+        clear_month_skeletons()
+        clear_report_template()
+
+    def _draw_from_scratch(self):
+        # 従来どおり毎回レイアウト全体を描いてから値を書く（比較用）
+        generator = ExcelReportGenerator(self.employee, 2025, 6)
+        generator._build_template()
+        monthly_data = monthly_repository.get(self.employee, 2025, 6)
+        generator._create_header_data()
+        generator._create_monthly_info_data(monthly_data)
+        generator._create_daily_table_data(get_month_skeleton(2025, 6, '共通'), monthly_data.daily_list)
+        generator._apply_holiday_design()
+        return generator.workbook
+
+    @staticmethod
+    def _fingerprint(workbook):
+        worksheet = workbook.active
+        cells = {}
+        for row in worksheet.iter_rows(min_row=1, max_row=46, min_col=1, max_col=16):
+            for cell in row:
+                cells[cell.coordinate] = (
+                    cell.value, repr(cell.font), repr(cell.fill), repr(cell.border),
+                    repr(cell.alignment), repr(cell.protection),
+                )
+        return (
+            worksheet.title, worksheet.protection.sheet, cells,
+            sorted(str(merged) for merged in worksheet.merged_cells.ranges),
+            {key: dim.width for key, dim in worksheet.column_dimensions.items()},
+            {key: dim.height for key, dim in worksheet.row_dimensions.items()},
+        )
+
+    def test_same_as_drawing_from_scratch(self):
+        report = ExcelReportGenerator(self.employee, 2025, 6).generate_report()
+        self.assertEqual(self._fingerprint(report), self._fingerprint(self._draw_from_scratch()))
+        worksheet = report.active
+        self.assertEqual(worksheet['J2'].value, '2025年 6月')
+        self.assertEqual(worksheet['F13'].value, '09:00')
+        # 日曜(6/1)・振替(休)(6/3)は曜日セルを強調、出勤日(6/2)はそのまま
+        self.assertEqual(worksheet['C12'].fill.fgColor.rgb, '00FFFF99')
+        self.assertEqual(worksheet['C14'].fill.fgColor.rgb, '00FFFF99')
+        self.assertEqual(worksheet['C13'].fill.fgColor.rgb, '00FFFFFF')
+
+    def test_template_drawn_once_and_not_modified(self):
+        with mock.patch.object(ExcelReportGenerator, '_build_template',
+                               autospec=True, side_effect=ExcelReportGenerator._build_template) as build:
+            first = ExcelReportGenerator(self.employee, 2025, 6).generate_report()
+            ExcelReportGenerator(self.employee, 2025, 6).generate_report()
+        self.assertEqual(build.call_count, 1)
+        # 報告書への書き込みはテンプレートに影響しない
+        template = get_report_template().worksheet
+        self.assertIsNone(template['J2'].value)
+        self.assertEqual(template['C12'].fill.fgColor.rgb, '00FFFFFF')
+        self.assertIsNot(first.active['C12']._style, template['C12']._style)
+
+    # 実行時間の比較は環境に左右されるため、ATTENDANCE_BENCHMARK=1 のときだけ実行する
+    @skipUnless(os.environ.get('ATTENDANCE_BENCHMARK'), 'ATTENDANCE_BENCHMARK が未設定')
+    def test_faster_than_drawing_from_scratch(self):
+        runs = 5
+        ExcelReportGenerator(self.employee, 2025, 6).generate_report()
+        started = perf_counter()
+        for _ in range(runs):
+            self._draw_from_scratch().save(BytesIO())
+        scratch = (perf_counter() - started) / runs
+        started = perf_counter()
+        for _ in range(runs):
+            ExcelReportGenerator(self.employee, 2025, 6).generate_report().save(BytesIO())
+        cloned = (perf_counter() - started) / runs
+        self.assertLess(cloned * self.MIN_SPEEDUP, scratch)
@@ -2,7 +2,7 @@ from django.urls import path
 from django.conf import settings
 from django.conf.urls.static import static
 from .views import (
-    MainView, MonthlyAttendanceCreateView, MonthlyAttendanceUpdateView, DailyDataUpdateView, DailyDataGetView,
+    MainView, MonthlyAttendanceCreateView, MonthlyAttendanceUpdateView, MonthlyBulkInfoView, DailyDataUpdateView, DailyDataBatchUpdateView, DailyPatternApplyView, DailyDataGetView, DailyMonthDataView,
     login_view, logout_view, MonthlyAttendanceDeleteView, DailyAttendanceDeleteView, ExcelDownloadView, PDFPreviewView, EmailSendView, password_change_view, copy_prev_month, DailyApproveView #, signup_view
 )
 from .views import attendance_require_day
@@ -17,8 +17,12 @@ urlpatterns = [
     path('monthly/create/', MonthlyAttendanceCreateView.as_view(), name='monthly_create'),
     path('monthly/update/', MonthlyAttendanceUpdateView.as_view(), name='monthly_update'),
     path('monthly/delete/', MonthlyAttendanceDeleteView.as_view(), name='monthly_delete'),
+    path('monthly/bulk_info/', MonthlyBulkInfoView.as_view(), name='monthly_bulk_info'),
     path('daily/update/', DailyDataUpdateView.as_view(), name='daily_update'),
+    path('daily/batch_update/', DailyDataBatchUpdateView.as_view(), name='daily_batch_update'),
+    path('daily/apply_pattern/', DailyPatternApplyView.as_view(), name='daily_apply_pattern'),
     path('daily/get/', DailyDataGetView.as_view(), name='daily_get'),
+    path('daily/month/', DailyMonthDataView.as_view(), name='daily_month'),
     path('daily/delete/', DailyAttendanceDeleteView.as_view(), name='daily_delete'),
     path('daily/approve/', DailyApproveView.as_view(), name='daily_approve'),
     path('excel/download/', ExcelDownloadView.as_view(), name='excel_download'),
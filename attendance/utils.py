@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import date, time
+from django.db import transaction
 from .models import Employee, AttendanceMonthly, AttendanceDaily
 from .structures import DailyData, MonthlyData
+from .work_hours import apply_work_hours_batch
 
 def convert_daily_to_structure(daily_model: AttendanceDaily, 
                               break_minutes: int = 60,
@@ -17,7 +19,8 @@ def convert_daily_to_structure(daily_model: AttendanceDaily,
         is_required=daily_model.is_required,
         is_confirmed=daily_model.is_confirmed,
         break_minutes=break_minutes,
-        standard_work_hours=standard_work_hours
+        standard_work_hours=standard_work_hours,
+        daily_id=daily_model.daily_id
     )
 
 def convert_monthly_to_structure(monthly_model: AttendanceMonthly) -> MonthlyData:
@@ -36,24 +39,32 @@ def convert_monthly_to_structure(monthly_model: AttendanceMonthly) -> MonthlyDat
         )
         daily_list.append(daily_data)
     
-    return MonthlyData(
-        employee_id=monthly_model.employee.employee_no,
+    return _build_monthly_structure(monthly_model, daily_list)
+
+def _build_monthly_structure(monthly_model: AttendanceMonthly, daily_list: List[DailyData]) -> MonthlyData:
+    """월별 모델과 변환된 일별 리스트로 MonthlyData 생성"""
+    monthly_data = MonthlyData(
+        # employee의 PK가 사원번호이므로 employee_id로 충분 (사원 조회 불필요)
+        employee_id=monthly_model.employee_id,
         year=monthly_model.year,
         month=monthly_model.month,
         project_name=monthly_model.project_name,
         base_calendar=monthly_model.base_calendar,
         break_minutes=monthly_model.break_minutes,
         standard_work_hours=monthly_model.standard_work_hours,
-        daily_list=daily_list
+        daily_list=daily_list,
+        monthly_id=monthly_model.monthly_id
     )
+    # DB에서 읽은 직후이므로 변경 없음으로 표시
+    monthly_data.mark_clean()
+    return monthly_data
 
 def get_or_create_monthly_structure(employee: Employee, year: str, month: str) -> Optional[MonthlyData]:
     """월별 구조체를 가져오거나 생성"""
     # DB에서 월별 데이터 조회
     monthly_model = AttendanceMonthly.objects.filter(
         employee=employee,
-        year=year,
-        month=month.zfill(2)
+        period=AttendanceMonthly.to_period(year, month)
     ).first()
     
     if monthly_model:
@@ -66,6 +77,103 @@ def get_or_create_monthly_structure(employee: Employee, year: str, month: str) -
         # DB에 없으면 None 반환
         return None
 
+def load_monthly_structures_range(start: Tuple[int, int], end: Tuple[int, int],
+                                  employees: Optional[Iterable] = None,
+                                  place_work: Optional[str] = None,
+                                  group: Optional[str] = None,
+                                  lock: bool = False) -> Dict[str, Dict[str, MonthlyData]]:
+    """
+    여러 사원, 여러 달의 MonthlyData를 한 번에 생성합니다.
+    월별 쿼리 1회 + 일별 쿼리 1회로 읽어 메모리에서 묶고, 근무시간은 일괄 계산합니다.
+    
+    Args:
+        start: 시작 (년, 월)
+        end: 종료 (년, 월)
+        employees: 사원 객체/사원번호 목록 또는 Employee 쿼리셋 (None이면 전체)
+        place_work: 근무지 필터
+        group: 그룹명 필터
+        lock: True이면 월별 행을 잠금 (select_for_update, 트랜잭션 안에서 호출)
+        
+    Returns:
+        {사원번호: {"YYYY-MM": MonthlyData}} - 월별 데이터가 없는 달은 포함되지 않음
+    """
+    # 년월 키 범위 검색 (employee, period 인덱스)
+    monthly_qs = AttendanceMonthly.objects.filter(
+        period__range=(AttendanceMonthly.to_period(*start), AttendanceMonthly.to_period(*end))
+    )
+    
+    if employees is not None:
+        if not hasattr(employees, 'model'):
+            employees = [getattr(emp, 'employee_no', emp) for emp in employees]
+        monthly_qs = monthly_qs.filter(employee__in=employees)
+    if place_work:
+        monthly_qs = monthly_qs.filter(employee__place_work=place_work)
+    if group:
+        # 그룹 조인으로 같은 행이 여러 번 나올 수 있음
+        monthly_qs = monthly_qs.filter(employee__groups__name=group).distinct()
+    if lock:
+        # 잠그는 순서를 고정해 교착을 피함
+        monthly_qs = monthly_qs.select_for_update().order_by('employee_id', 'period')
+    
+    monthly_models = list(monthly_qs)
+    if not monthly_models:
+        return {}
+    
+    # 일별 데이터는 한 번에 가져와서 월별로 묶음
+    daily_by_monthly = {monthly_model.monthly_id: [] for monthly_model in monthly_models}
+    daily_rows = AttendanceDaily.objects.filter(
+        monthly_attendance_id__in=list(daily_by_monthly)
+    ).order_by('monthly_attendance_id', 'date').values_list(
+        'monthly_attendance_id', 'daily_id', 'date', 'work_type', 'start_time', 'end_time',
+        'alternative_work_date', 'notes', 'is_required', 'is_confirmed'
+    )
+    for (monthly_id, daily_id, day, work_type, start_time, end_time,
+         alternative_work_date, notes, is_required, is_confirmed) in daily_rows:
+        daily_by_monthly[monthly_id].append(DailyData(
+            date=day,
+            work_type=work_type,
+            start_time=start_time,
+            end_time=end_time,
+            alternative_work_date=alternative_work_date,
+            notes=notes,
+            is_required=is_required,
+            is_confirmed=is_confirmed,
+            daily_id=daily_id
+        ))
+    
+    result = {}
+    all_days = []
+    for monthly_model in monthly_models:
+        daily_list = daily_by_monthly[monthly_model.monthly_id]
+        for daily in daily_list:
+            daily.break_minutes = monthly_model.break_minutes
+            daily.standard_work_hours = monthly_model.standard_work_hours
+        all_days.extend(daily_list)
+        monthly_data = _build_monthly_structure(monthly_model, daily_list)
+        key = f"{int(monthly_model.year):04d}-{int(monthly_model.month):02d}"
+        result.setdefault(monthly_model.employee_id, {})[key] = monthly_data
+    
+    # 모든 사원, 모든 달의 근무시간을 한 번에 계산
+    apply_work_hours_batch(all_days)
+    return result
+
+def load_monthly_structures(year: int, month: int,
+                            employees: Optional[Iterable] = None,
+                            place_work: Optional[str] = None,
+                            group: Optional[str] = None) -> Dict[str, MonthlyData]:
+    """
+    한 달분 MonthlyData를 여러 사원에 대해 한 번에 생성합니다. (쿼리 2회)
+    
+    Returns:
+        {사원번호: MonthlyData} - 월별 데이터가 없는 사원은 포함되지 않음
+    """
+    key = f"{int(year):04d}-{int(month):02d}"
+    by_employee = load_monthly_structures_range(
+        (int(year), int(month)), (int(year), int(month)),
+        employees=employees, place_work=place_work, group=group
+    )
+    return {employee_no: months[key] for employee_no, months in by_employee.items()}
+
 def save_daily_from_structure(daily_data: DailyData, monthly_model: AttendanceMonthly) -> AttendanceDaily:
     """DailyData 구조체를 DB에 저장"""
     # 기존 데이터가 있는지 확인
@@ -99,36 +207,126 @@ def save_daily_from_structure(daily_data: DailyData, monthly_model: AttendanceMo
             is_required=daily_data.is_required,
         )
 
-def update_monthly_from_structure(monthly_data: MonthlyData, employee: Employee) -> AttendanceMonthly:
-    """MonthlyData 구조체를 DB에 저장/업데이트"""
-    # 기존 월별 데이터 조회
-    monthly_model = AttendanceMonthly.objects.filter(
-        employee=employee,
-        year=monthly_data.year,
-        month=monthly_data.month
-    ).first()
-    
-    if monthly_model:
-        # 기존 데이터 업데이트
-        monthly_model.project_name = monthly_data.project_name
-        monthly_model.base_calendar = monthly_data.base_calendar
-        monthly_model.break_minutes = monthly_data.break_minutes
-        monthly_model.standard_work_hours = monthly_data.standard_work_hours
-        monthly_model.save()
-    else:
-        # 새 데이터 생성
-        monthly_model = AttendanceMonthly.objects.create(
-            employee=employee,
-            year=monthly_data.year,
-            month=monthly_data.month,
-            project_name=monthly_data.project_name,
-            base_calendar=monthly_data.base_calendar,
-            break_minutes=monthly_data.break_minutes,
-            standard_work_hours=monthly_data.standard_work_hours
-        )
-    
-    # 일별 데이터도 함께 저장
-    for daily_data in monthly_data.daily_list:
-        save_daily_from_structure(daily_data, monthly_model)
+DAILY_SAVE_FIELDS = [
+    'date', 'work_type', 'start_time', 'end_time', 'alternative_work_date',
+    'notes', 'is_confirmed', 'is_required',
+]
+
+def _build_daily_model(daily_data: DailyData, monthly_id: int) -> AttendanceDaily:
+    """DailyData 구조체에서 저장용 AttendanceDaily 인스턴스 생성 (DB 조회 없음)"""
+    return AttendanceDaily(
+        daily_id=daily_data.daily_id,
+        monthly_attendance_id=monthly_id,
+        date=daily_data.date,
+        work_type=daily_data.work_type,
+        start_time=daily_data.start_time,
+        end_time=daily_data.end_time,
+        alternative_work_date=daily_data.alternative_work_date,
+        notes=daily_data.notes,
+        is_confirmed=daily_data.is_confirmed,
+        is_required=daily_data.is_required,
+    )
+
+def update_monthly_from_structure(monthly_data: MonthlyData, employee: Employee) -> int:
+    """
+    MonthlyData 구조체를 DB에 저장/업데이트 (변경분만 저장)
+    - 헤더가 바뀌지 않았으면 월별 행 UPDATE를 생략 (일별만 바뀌면 월별 행을 잠가 존재만 확인)
+    - 그 사이 월별 행이 삭제되었으면 AttendanceMonthly.DoesNotExist
+    - 변경된 일별 데이터만 bulk_update / bulk_create로 한 번에 저장
+    - 전체를 하나의 트랜잭션으로 처리
+    반환값은 월별 데이터 ID입니다.
+    """
+    with transaction.atomic():
+        monthly_id = monthly_data.monthly_id
+        header = {
+            'project_name': monthly_data.project_name,
+            'base_calendar': monthly_data.base_calendar,
+            'break_minutes': monthly_data.break_minutes,
+            'standard_work_hours': monthly_data.standard_work_hours,
+        }
+        
+        header_saved = False
+        if monthly_id is None:
+            # ID를 모르는 구조체는 기존 월별 데이터 조회
+            monthly_id = AttendanceMonthly.objects.filter(
+                employee=employee,
+                period=AttendanceMonthly.to_period(monthly_data.year, monthly_data.month)
+            ).values_list('monthly_id', flat=True).first()
+            
+            if monthly_id is None:
+                # 새 데이터 생성
+                monthly_id = AttendanceMonthly.objects.create(
+                    employee=employee,
+                    year=monthly_data.year,
+                    month=monthly_data.month,
+                    **header
+                ).monthly_id
+                header_saved = True
+            monthly_data.monthly_id = monthly_id
+        
+        # 변경된 일별 데이터만 저장
+        dirty_days = monthly_data.dirty_days()
+        
+        if not header_saved:
+            if monthly_data.is_header_dirty:
+                # 기존 데이터 업데이트 (헤더가 바뀐 경우만)
+                found = AttendanceMonthly.objects.filter(monthly_id=monthly_id).update(**header)
+            elif dirty_days:
+                # 일별만 바뀐 경우에도 월별 행을 잠가 커밋 전에 삭제되지 않도록 함
+                found = AttendanceMonthly.objects.select_for_update().filter(monthly_id=monthly_id).exists()
+            else:
+                found = True
+            if not found:
+                # 다른 요청이 월별 데이터를 삭제함 (일별 행을 만들면 외래 키 오류가 되므로 여기서 중단)
+                raise AttendanceMonthly.DoesNotExist(f"월별 데이터가 삭제되었습니다 (monthly_id={monthly_id})")
+        
+        changed_days = [daily for daily in dirty_days if daily.daily_id is not None]
+        if changed_days:
+            updated = AttendanceDaily.objects.bulk_update(
+                [_build_daily_model(daily, monthly_id) for daily in changed_days],
+                DAILY_SAVE_FIELDS
+            )
+            if updated != len(changed_days):
+                # 다른 요청이 행을 지운 날은 ID를 버리고 새 날짜와 같이 처리
+                remaining_ids = set(AttendanceDaily.objects.filter(
+                    daily_id__in=[daily.daily_id for daily in changed_days]
+                ).values_list('daily_id', flat=True))
+                for daily in changed_days:
+                    if daily.daily_id not in remaining_ids:
+                        print(f"일별 데이터 행 없음 (daily_id={daily.daily_id}): {daily.date}")
+                        daily.daily_id = None
+        
+        new_days = [daily for daily in dirty_days if daily.daily_id is None]
+        if new_days:
+            # ID가 없어도 같은 날짜 행이 이미 있으면 그 행을 UPDATE
+            existing_ids = dict(AttendanceDaily.objects.filter(
+                monthly_attendance_id=monthly_id,
+                date__in=[daily.date for daily in new_days]
+            ).values_list('date', 'daily_id'))
+            for daily in new_days:
+                daily.daily_id = existing_ids.get(daily.date)
+            relinked_days = [daily for daily in new_days if daily.daily_id is not None]
+            if relinked_days:
+                AttendanceDaily.objects.bulk_update(
+                    [_build_daily_model(daily, monthly_id) for daily in relinked_days],
+                    DAILY_SAVE_FIELDS
+                )
+            new_days = [daily for daily in new_days if daily.daily_id is None]
+        
+        if new_days:
+            created = AttendanceDaily.objects.bulk_create(
+                [_build_daily_model(daily, monthly_id) for daily in new_days]
+            )
+            if any(model.daily_id is None for model in created):
+                # MySQL은 bulk_create 후 ID를 돌려주지 않으므로 날짜로 다시 조회
+                created_ids = dict(AttendanceDaily.objects.filter(
+                    monthly_attendance_id=monthly_id,
+                    date__in=[daily.date for daily in new_days]
+                ).values_list('date', 'daily_id'))
+            else:
+                created_ids = {model.date: model.daily_id for model in created}
+            for daily in new_days:
+                daily.daily_id = created_ids.get(daily.date)
     
-    return monthly_model 
\ No newline at end of file
+    monthly_data.mark_clean(monthly_id)
+    return monthly_id
@@ -20,7 +20,10 @@ from .monthly_views import (
 
 from .daily_views import (
     DailyDataUpdateView,
+    DailyDataBatchUpdateView,
+    DailyPatternApplyView,
     DailyDataGetView,
+    DailyMonthDataView,
     DailyAttendanceDeleteView,
     DailyApproveView,
     attendance_require_day
@@ -53,7 +56,10 @@ __all__ = [
     
     # Daily views
     'DailyDataUpdateView',
+    'DailyDataBatchUpdateView',
+    'DailyPatternApplyView',
     'DailyDataGetView',
+    'DailyMonthDataView',
     'DailyAttendanceDeleteView',
     'DailyApproveView',
     
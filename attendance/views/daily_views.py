@@ -7,12 +7,121 @@ from django.http import JsonResponse
 from datetime import datetime, date
 import json
 
+from ..conditional import month_conditional
 from ..models import AttendanceMonthly, AttendanceDaily
-from ..utils import get_or_create_monthly_structure, update_monthly_from_structure
-from ..cache_utils import invalidate_monthly_cache
+from ..month_skeleton import get_month_skeleton
+from ..payloads import day_payload, day_record_payload, month_days_payload, month_payload
+from ..repository import month_key, monthly_repository
 from ..structures import DailyData
 
 
+# 一括更新で一度に受け付ける日数（2か月分）
+MAX_BATCH_DAYS = 62
+# パターン適用のデフォルト曜日（0=月 ... 4=金）
+DEFAULT_PATTERN_WEEKDAYS = (0, 1, 2, 3, 4)
+
+
+# 입력 가능한 근무구분 (모델의 선택지와 같음)
+VALID_WORK_TYPES = frozenset(value for value, _ in AttendanceDaily.WORK_TYPE_CHOICES)
+
+
+class DailyEntryError(ValueError):
+    """日別入力の検証エラー（メッセージはそのまま画面に表示）"""
+
+
+def _parse_optional(value, fmt, label, message):
+    # 빈 값은 None, 형식이 틀린 값은 검증 오류
+    # (None으로 넘기면 패턴 적용/일괄 등록에서 시각이 빈 날이 한꺼번에 저장됨)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, fmt)
+    except (TypeError, ValueError) as e:
+        print(f"{label} parsing error: {e}")
+        raise DailyEntryError(message)
+
+
+def parse_daily_entry(data: dict) -> dict:
+    """
+    日別入力1件を検証・変換（単日更新と一括更新で共通）
+    日(day)と年月(year, month)から日付を作り、必須項目と時刻を確認する
+    """
+    day = data.get('day')
+    if not day:
+        raise DailyEntryError('日付が指定されていません')
+    
+    year = data.get('year')
+    month = data.get('month')
+    if not year or not month:
+        raise DailyEntryError('年月情報が不足しています')
+    
+    try:
+        target_date = date(int(year), int(month), int(day))
+    except (TypeError, ValueError):
+        raise DailyEntryError('無効な日付です')
+    
+    work_type = data.get('work_type')
+    start_time_str = data.get('start_time')
+    end_time_str = data.get('end_time')
+    
+    if not work_type:
+        raise DailyEntryError('勤務区分を選択してください')
+    if work_type not in VALID_WORK_TYPES:
+        raise DailyEntryError('勤務区分が正しくありません')
+    if not start_time_str:
+        raise DailyEntryError('作業開始時刻を入力してください')
+    if not end_time_str:
+        raise DailyEntryError('作業終了時刻を入力してください')
+    
+    start_time = _parse_optional(start_time_str, '%H:%M', 'Start time', '作業開始時刻の形式が正しくありません')
+    end_time = _parse_optional(end_time_str, '%H:%M', 'End time', '作業終了時刻の形式が正しくありません')
+    alternative_work_date = _parse_optional(
+        data.get('alternative_work_date'), '%Y-%m-%d', 'Alternative work date', '振替日の形式が正しくありません'
+    )
+    return {
+        'target_date': target_date,
+        'work_type': work_type,
+        'start_time': start_time.time() if start_time else None,
+        'end_time': end_time.time() if end_time else None,
+        'alternative_work_date': alternative_work_date.date() if alternative_work_date else None,
+    }
+
+
+def apply_daily_entry(monthly_data, entry: dict, data: dict):
+    """
+    検証済みの入力を月別データ（構造体）に反映し、(日別データ, メッセージ) を返す
+    承認申請中・承認済みの日は修正不可（DailyEntryError）
+    """
+    target_date = entry['target_date']
+    existing_daily = monthly_data.find_day(target_date)
+    
+    # 승인 대기/완료 상태면 수정 불가
+    if existing_daily and (existing_daily.is_required or existing_daily.is_confirmed):
+        raise DailyEntryError('この日の勤怠情報は承認申請中または承認済みのため、修正できません。')
+    
+    if existing_daily:
+        # 기존 데이터 업데이트
+        alternative_work_date = entry['alternative_work_date'] or existing_daily.alternative_work_date
+        notes = data.get('notes', existing_daily.notes)
+        message = '更新しました'
+    else:
+        # 새 데이터 생성
+        alternative_work_date = entry['alternative_work_date']
+        notes = data.get('notes', '')
+        message = '新規登録しました'
+    
+    # 해당 날짜만 재계산 (월 합계는 응답 시 한 번만 집계)
+    daily_data = monthly_data.update_day(
+        target_date,
+        work_type=entry['work_type'],
+        start_time=entry['start_time'],
+        end_time=entry['end_time'],
+        alternative_work_date=alternative_work_date,
+        notes=notes
+    )
+    return daily_data, message
+
+
 # 日別データ更新ビュー（ログイン必須）
 @method_decorator(login_required, name='dispatch')
 @method_decorator(csrf_exempt, name='dispatch')
@@ -26,151 +135,209 @@ class DailyDataUpdateView(View):
             data = json.loads(request.body)
             print(f"Received data: {data}")
             
-            # 日付の処理 - 日(day)のみを受け取り、現在の年月と組み合わせる
-            day = data.get('day')
-            if not day:
-                print("Error: No day provided")
-                return JsonResponse({'status': 'error', 'message': '日付が指定されていません'})
-            
-            year = data.get('year')
-            month = data.get('month')
-            
-            if not year or not month:
-                print("Error: No year or month provided")
-                return JsonResponse({'status': 'error', 'message': '年月情報が不足しています'})
-            
-            print(f"Processing date: {year}-{month}-{day}")
-            
-            try:
-                target_date = date(int(year), int(month), int(day))
-                print(f"Target date: {target_date}")
-            except ValueError as e:
-                print(f"Date parsing error: {e}")
-                return JsonResponse({'status': 'error', 'message': '無効な日付です'})
-            
-            # 구조체 기반으로 월별 데이터 가져오기
-            monthly_data = get_or_create_monthly_structure(
-                employee=request.user,
-                year=str(target_date.year),
-                month=str(target_date.month)
-            )
-            
-            print(f"Monthly data found: {monthly_data is not None}")
-            
-            if not monthly_data:
-                print("Error: No monthly data found")
-                return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
-            
-            # 필수 필드 검증
-            work_type = data.get('work_type')
-            start_time_str = data.get('start_time')
-            end_time_str = data.get('end_time')
-            alternative_work_date_str = data.get('alternative_work_date')
-            
-            if not work_type:
-                return JsonResponse({'status': 'error', 'message': '勤務区分を選択してください'})
-            
-            if not start_time_str:
-                return JsonResponse({'status': 'error', 'message': '作業開始時刻を入力してください'})
-            
-            if not end_time_str:
-                return JsonResponse({'status': 'error', 'message': '作業終了時刻を入力してください'})
-            
-            print(f"Time strings: start={start_time_str}, end={end_time_str}, alt={alternative_work_date_str}")
-            
-            start_time = None
-            end_time = None
-            alternative_work_date = None
+            # 입력값 검증 (일괄 등록과 같은 규칙)
+            entry = parse_daily_entry(data)
+            target_date = entry['target_date']
+            print(f"Target date: {target_date}")
             
-            if start_time_str:
-                try:
-                    start_time = datetime.strptime(start_time_str, '%H:%M').time()
-                    print(f"Parsed start_time: {start_time}")
-                except ValueError as e:
-                    print(f"Start time parsing error: {e}")
-                    pass
-            
-            if end_time_str:
-                try:
-                    end_time = datetime.strptime(end_time_str, '%H:%M').time()
-                    print(f"Parsed end_time: {end_time}")
-                except ValueError as e:
-                    print(f"End time parsing error: {e}")
-                    pass
-            
-            if alternative_work_date_str:
-                try:
-                    alternative_work_date = datetime.strptime(alternative_work_date_str, '%Y-%m-%d').date()
-                    print(f"Parsed alternative_work_date: {alternative_work_date}")
-                except ValueError as e:
-                    print(f"Alternative work date parsing error: {e}")
-                    pass
-            
-            # 기존 일별 데이터 찾기 또는 새로 생성
-            existing_daily = None
-            for daily in monthly_data.daily_list:
-                if daily.date == target_date:
-                    existing_daily = daily
-                    break
-            
-            # 승인 대기/완료 상태면 수정 불가
-            if existing_daily and (existing_daily.is_required or existing_daily.is_confirmed):
-                return JsonResponse({'status': 'error', 'message': 'この日の勤怠情報は承認申請中または承認済みのため、修正できません。'})
-            
-            if existing_daily:
-                # 기존 데이터 업데이트
-                existing_daily.work_type = work_type  # 필수 필드이므로 기본값 없이 설정
-                existing_daily.start_time = start_time  # 필수 필드이므로 기본값 없이 설정
-                existing_daily.end_time = end_time  # 필수 필드이므로 기본값 없이 설정
-                existing_daily.alternative_work_date = alternative_work_date or existing_daily.alternative_work_date
-                existing_daily.notes = data.get('notes', existing_daily.notes)
-                # 시간 계산 실행
-                existing_daily.calculate_work_hours()
-                print("Daily data updated")
-                message = '更新しました'
-            else:
-                # 새 데이터 생성
-                new_daily = DailyData(
-                    date=target_date,
-                    work_type=data.get('work_type', '出勤'),
-                    start_time=start_time,
-                    end_time=end_time,
-                    alternative_work_date=alternative_work_date,
-                    notes=data.get('notes', ''),
-                    break_minutes=monthly_data.break_minutes,
-                    standard_work_hours=monthly_data.standard_work_hours
-                )
-                # 시간 계산 실행
-                new_daily.calculate_work_hours()
-                monthly_data.daily_list.append(new_daily)
-                print("Daily data created")
-                message = '新規登録しました'
-            
-            # DB에 저장
-            update_monthly_from_structure(monthly_data, request.user)
-            
-            # 캐시 무효화 (해당 월의 캐시 삭제)
-            invalidate_monthly_cache(
-                employee_id=request.user.employee_no,
-                year=str(target_date.year),
-                month=str(target_date.month)
-            )
+            # 월별 행을 잠그고 DB에서 읽은 사본을 수정 (블록을 벗어나면 저장, 커밋 후 캐시에 씀)
+            with monthly_repository.edit(request.user, target_date.year, target_date.month) as monthly_data:
+                print(f"Monthly data found: {monthly_data is not None}")
+                
+                if not monthly_data:
+                    print("Error: No monthly data found")
+                    return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
+                
+                # 승인 잠금 확인 후 해당 날짜만 재계산 (월 합계는 응답 시 한 번만 집계)
+                daily_data, message = apply_daily_entry(monthly_data, entry, data)
+                print(f"Daily data saved in structure: {message}")
             
             print(f"Success: {message}")
-            return JsonResponse({'status': 'success', 'message': message})
-            
+            # 화면 부분 갱신용: 바뀐 날짜와 월 합계
+            return JsonResponse({
+                'status': 'success',
+                'message': message,
+                'day': day_payload(target_date, daily_data),
+                'month': month_payload(monthly_data),
+            })
+            
+        except DailyEntryError as e:
+            print(f"Validation error: {e}")
+            return JsonResponse({'status': 'error', 'message': str(e)})
+        except json.JSONDecodeError as e:
+            print(f"JSON decode error: {e}")
+            return JsonResponse({'status': 'error', 'message': 'JSONデータの解析に失敗しました'})
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            import traceback
+            traceback.print_exc()
+            return JsonResponse({'status': 'error', 'message': str(e)})
+
+
+# 日別データ一括更新ビュー（ログイン必須）
+# 1週間〜1か月分の入力をまとめて検証し、1つのトランザクションで保存する
+@method_decorator(login_required, name='dispatch')
+@method_decorator(csrf_exempt, name='dispatch')
+class DailyDataBatchUpdateView(View):
+    def post(self, request, *args, **kwargs):
+        print("=== DailyDataBatchUpdateView called ===")
+        try:
+            data = json.loads(request.body)
         except json.JSONDecodeError as e:
             print(f"JSON decode error: {e}")
             return JsonResponse({'status': 'error', 'message': 'JSONデータの解析に失敗しました'})
+        
+        entries = data.get('days') if isinstance(data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return JsonResponse({'status': 'error', 'message': '登録する日別データがありません'})
+        if len(entries) > MAX_BATCH_DAYS:
+            return JsonResponse({'status': 'error', 'message': f'一度に登録できるのは{MAX_BATCH_DAYS}日分までです'})
+        
+        try:
+            # 1) 전체 항목 검증 (년월은 항목에 없으면 요청의 값을 사용)
+            results = [None] * len(entries)
+            parsed = []
+            seen_dates = set()
+            for index, entry_data in enumerate(entries):
+                try:
+                    if not isinstance(entry_data, dict):
+                        raise DailyEntryError('日別データの形式が正しくありません')
+                    entry_data = {'year': data.get('year'), 'month': data.get('month'), **entry_data}
+                    entry = parse_daily_entry(entry_data)
+                    if entry['target_date'] in seen_dates:
+                        raise DailyEntryError('同じ日付が重複しています')
+                    seen_dates.add(entry['target_date'])
+                    parsed.append((index, entry_data, entry))
+                except DailyEntryError as e:
+                    results[index] = {'index': index, 'date': None, 'status': 'error', 'message': str(e)}
+            
+            # 2) 관련된 달의 행을 잠그고 DB에서 한 번에 읽어 구조체에 반영
+            # 3) 블록을 나가면 바뀐 달만 하나의 트랜잭션으로 저장하고, 커밋 후 그 달들을 한 번에 캐시에 씀
+            months = sorted({(entry['target_date'].year, entry['target_date'].month) for _, _, entry in parsed})
+            changed = {}
+            with monthly_repository.edit_many(request.user, months) as monthly_map:
+                for index, entry_data, entry in parsed:
+                    target_date = entry['target_date']
+                    key = month_key(target_date.year, target_date.month)
+                    result = {'index': index, 'date': target_date.strftime('%Y-%m-%d')}
+                    monthly_data = monthly_map.get(key)
+                    try:
+                        if not monthly_data:
+                            raise DailyEntryError('該当する月別勤怠情報が見つかりません')
+                        daily_data, message = apply_daily_entry(monthly_data, entry, entry_data)
+                    except DailyEntryError as e:
+                        result.update(status='error', message=str(e))
+                    else:
+                        result.update(status='success', message=message, record=day_record_payload(daily_data))
+                        changed[key] = monthly_data
+                    results[index] = result
+        
         except Exception as e:
             print(f"Unexpected error: {e}")
             import traceback
             traceback.print_exc()
             return JsonResponse({'status': 'error', 'message': str(e)})
+        
+        saved = sum(1 for result in results if result['status'] == 'success')
+        failed = len(results) - saved
+        print(f"Batch update: saved={saved}, failed={failed}")
+        if not saved:
+            message = '登録できる日別データがありませんでした'
+        elif failed:
+            message = f'{saved}件を登録しました（{failed}件はエラー）'
+        else:
+            message = f'{saved}件を登録しました'
+        return JsonResponse({
+            'status': 'success' if saved else 'error',
+            'message': message,
+            'saved': saved,
+            'failed': failed,
+            'results': results,
+            'months': [month_payload(monthly_data) for monthly_data in changed.values()],
+        })
+
+
+# 勤務パターン一括適用ビュー（ログイン必須）
+# 指定曜日のうち休日カレンダー上の休日でない未入力日を同じ勤務時間で埋める
+@method_decorator(login_required, name='dispatch')
+@method_decorator(csrf_exempt, name='dispatch')
+class DailyPatternApplyView(View):
+    def post(self, request, *args, **kwargs):
+        print("=== DailyPatternApplyView called ===")
+        try:
+            data = json.loads(request.body)
+            # 패턴에는 날짜가 없으므로 1일로 년월/필수 항목/시각을 검증 (단일 등록과 같은 규칙)
+            pattern = parse_daily_entry({**data, 'day': 1})
+            
+            weekdays = data.get('weekdays', DEFAULT_PATTERN_WEEKDAYS)
+            if (not isinstance(weekdays, (list, tuple)) or not weekdays
+                    or not all(type(weekday) is int and 0 <= weekday <= 6 for weekday in weekdays)):
+                return JsonResponse({'status': 'error', 'message': '曜日の指定が正しくありません'})
+            weekdays = set(weekdays)
+            
+            year, month = pattern['target_date'].year, pattern['target_date'].month
+            # 월별 행을 잠그고 DB에서 읽은 사본에 채움
+            # 새 날짜만 dirty이므로 블록을 나갈 때 bulk_create 한 번, 커밋 후 캐시 쓰기도 한 번
+            with monthly_repository.edit(request.user, year, month) as monthly_data:
+                if not monthly_data:
+                    return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
+                
+                # 월 골격의 휴일은 共通 + 기준 캘린더의 HolidayCalendar (프로세스 내 메모)
+                skeleton = get_month_skeleton(year, month, monthly_data.base_calendar)
+                filled = []
+                skipped_holidays = 0
+                skipped_entered = 0
+                for skeleton_day in skeleton.days:
+                    if skeleton_day.weekday not in weekdays:
+                        continue
+                    if skeleton_day.is_calendar_holiday:
+                        skipped_holidays += 1
+                        continue
+                    # 이미 입력했거나 승인 대기/완료인 날은 건드리지 않음
+                    if monthly_data.find_day(skeleton_day.date) is not None:
+                        skipped_entered += 1
+                        continue
+                    filled.append(monthly_data.update_day(
+                        skeleton_day.date,
+                        work_type=pattern['work_type'],
+                        start_time=pattern['start_time'],
+                        end_time=pattern['end_time'],
+                        notes=data.get('notes', '')
+                    ))
+            
+            print(f"Pattern applied: filled={len(filled)}, holidays={skipped_holidays}, entered={skipped_entered}")
+            
+            return JsonResponse({
+                'status': 'success',
+                'message': f'{len(filled)}日分を登録しました',
+                'filled': len(filled),
+                'skipped_holidays': skipped_holidays,
+                'skipped_entered': skipped_entered,
+                'days': [day_payload(daily.date, daily) for daily in filled],
+                'month': month_payload(monthly_data),
+            })
+        
+        except DailyEntryError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)})
+        except json.JSONDecodeError as e:
+            print(f"JSON decode error: {e}")
+            return JsonResponse({'status': 'error', 'message': 'JSONデータの解析に失敗しました'})
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            import traceback
+            traceback.print_exc()
+            return JsonResponse({'status': 'error', 'message': str(e)})
+
+
+def requested_day_month(request, *args, **kwargs):
+    # 조건부 GET용: date 파라미터가 속한 달
+    target_date = datetime.strptime(request.GET.get('date') or '', '%Y-%m-%d').date()
+    return [(target_date.year, target_date.month)]
 
 
 # 日別データ取得ビュー（ログ인必須）
 @method_decorator(login_required, name='dispatch')
+@method_decorator(month_conditional(requested_day_month), name='get')
 class DailyDataGetView(View):
     def get(self, request, *args, **kwargs):
         date_str = request.GET.get('date')
@@ -180,34 +347,18 @@ class DailyDataGetView(View):
         try:
             target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
             
-            # 구조체 기반으로 월별 데이터 가져오기
-            monthly_data = get_or_create_monthly_structure(
+            # 저장소에서 월별 데이터 가져오기 (캐시 우선)
+            monthly_data = monthly_repository.get(
                 employee=request.user,
-                year=str(target_date.year),
-                month=str(target_date.month)
+                year=target_date.year,
+                month=target_date.month
             )
             
             if not monthly_data:
                 return JsonResponse({'status': 'success', 'record': None})
             
-            # 해당 날짜의 일별 데이터 찾기
-            daily_data = None
-            for daily in monthly_data.daily_list:
-                if daily.date == target_date:
-                    daily_data = daily
-                    break
-            
-            if daily_data:
-                record = {
-                    'work_type': daily_data.work_type,
-                    'start_time': daily_data.start_time.strftime('%H:%M') if daily_data.start_time else '',
-                    'end_time': daily_data.end_time.strftime('%H:%M') if daily_data.end_time else '',
-                    'alternative_work_date': daily_data.alternative_work_date.strftime('%Y-%m-%d') if daily_data.alternative_work_date else '',
-                    'notes': daily_data.notes or ''
-                }
-                return JsonResponse({'status': 'success', 'record': record})
-            else:
-                return JsonResponse({'status': 'success', 'record': None})
+            # 해당 날짜의 일별 데이터 찾기 (필드 구성은 월 단위 API와 같음)
+            return JsonResponse({'status': 'success', 'record': day_record_payload(monthly_data.find_day(target_date))})
                 
         except ValueError:
             return JsonResponse({'status': 'error', 'message': '無効な日付形式です'})
@@ -215,6 +366,34 @@ class DailyDataGetView(View):
             return JsonResponse({'status': 'error', 'message': str(e)})
 
 
+def requested_year_month(request, *args, **kwargs):
+    # 조건부 GET용: year, month 파라미터의 달
+    return [(int(request.GET.get('year') or ''), int(request.GET.get('month') or ''))]
+
+
+# 月単位の日別データ取得ビュー（ログイン必須）
+# 画面はこの応答をメモリに保持し、日付クリック時は /daily/get/ を呼ばない
+@method_decorator(login_required, name='dispatch')
+@method_decorator(month_conditional(requested_year_month), name='get')
+class DailyMonthDataView(View):
+    def get(self, request, *args, **kwargs):
+        try:
+            year, month = requested_year_month(request)[0]
+            date(year, month, 1)
+        except ValueError:
+            return JsonResponse({'status': 'error', 'message': '無効な年月です'})
+        
+        try:
+            # 저장소에서 월별 데이터 가져오기 (캐시 우선)
+            monthly_data = monthly_repository.get(employee=request.user, year=year, month=month)
+            return JsonResponse(
+                {'status': 'success', **month_days_payload(monthly_data)},
+                json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False}
+            )
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)})
+
+
 # 日別勤怠削除ビュー（ログ인必須）
 @method_decorator(login_required, name='dispatch')
 @method_decorator(csrf_exempt, name='dispatch')
@@ -233,52 +412,20 @@ class DailyAttendanceDeleteView(View):
             except ValueError:
                 return JsonResponse({'status': 'error', 'message': '無効な日付形式です'})
             
-            # 구조체 기반으로 월별 데이터 가져오기
-            monthly_data = get_or_create_monthly_structure(
-                employee=request.user,
-                year=str(target_date.year),
-                month=str(target_date.month)
-            )
-            
-            if not monthly_data:
-                return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
-            
-            # 해당 날짜의 일별 데이터 찾기 및 제거
-            daily_to_remove = None
-            for daily in monthly_data.daily_list:
-                if daily.date == target_date:
-                    daily_to_remove = daily
-                    break
+            # 월별 행을 잠그고 DB에서 읽은 사본을 수정 (블록을 벗어나면 저장, 커밋 후 캐시에 씀)
+            with monthly_repository.edit(request.user, target_date.year, target_date.month) as monthly_data:
+                if not monthly_data:
+                    return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
+                
+                # 해당 날짜의 일별 데이터를 구조체와 DB에서 제거
+                daily_to_remove = monthly_repository.delete_day(monthly_data, target_date)
             
             if daily_to_remove:
-                monthly_data.daily_list.remove(daily_to_remove)
-                
-                # DB에서도 삭제
-                monthly_model = AttendanceMonthly.objects.filter(
-                    employee=request.user,
-                    year=str(target_date.year),
-                    month=str(target_date.month).zfill(2)
-                ).first()
-                
-                if monthly_model:
-                    AttendanceDaily.objects.filter(
-                        monthly_attendance=monthly_model,
-                        date=target_date
-                    ).delete()
-                
-                # 구조체를 DB에 저장
-                update_monthly_from_structure(monthly_data, request.user)
-                
-                # 캐시 무효화 (해당 월의 캐시 삭제)
-                invalidate_monthly_cache(
-                    employee_id=request.user.employee_no,
-                    year=str(target_date.year),
-                    month=str(target_date.month)
-                )
-                
                 return JsonResponse({
                     'status': 'success', 
-                    'message': f'{target_date.strftime("%Y年%m月%d日")}の勤怠情報を削除しました。'
+                    'message': f'{target_date.strftime("%Y年%m月%d日")}の勤怠情報を削除しました。',
+                    'day': day_payload(target_date, None),
+                    'month': month_payload(monthly_data),
                 })
             else:
                 return JsonResponse({'status': 'error', 'message': '該当する日別勤怠情報が見つかりません'})
@@ -308,32 +455,24 @@ class DailyApproveView(View):
                 target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
             except ValueError:
                 return JsonResponse({'status': 'error', 'message': '無効な日付形式です'})
-            # 월별 데이터 가져오기
-            monthly_data = get_or_create_monthly_structure(
-                employee=request.user,
-                year=str(target_date.year),
-                month=str(target_date.month)
-            )
-            if not monthly_data:
-                return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
-            # 해당 날짜의 일별 데이터 찾기
-            daily_data = None
-            for daily in monthly_data.daily_list:
-                if daily.date == target_date:
-                    daily_data = daily
-                    break
-            if not daily_data:
-                return JsonResponse({'status': 'error', 'message': '該当する日別勤怠情報が見つかりません'})
-            if daily_data.is_required == 1:
-                return JsonResponse({'status': 'error', 'message': 'すでに承認申請中です。'})
-            daily_data.is_required = 1
-            update_monthly_from_structure(monthly_data, request.user)
-            invalidate_monthly_cache(
-                employee_id=request.user.employee_no,
-                year=str(target_date.year),
-                month=str(target_date.month)
-            )
-            return JsonResponse({'status': 'success', 'message': '承認申請しました。'})
+            # 월별 행을 잠그고 DB에서 읽은 사본을 수정 (블록을 벗어나면 저장, 커밋 후 캐시에 씀)
+            with monthly_repository.edit(request.user, target_date.year, target_date.month) as monthly_data:
+                if not monthly_data:
+                    return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
+                # 해당 날짜의 일별 데이터 찾기
+                daily_data = monthly_data.find_day(target_date)
+                if not daily_data:
+                    return JsonResponse({'status': 'error', 'message': '該当する日別勤怠情報が見つかりません'})
+                if daily_data.is_required == 1:
+                    return JsonResponse({'status': 'error', 'message': 'すでに承認申請中です。'})
+                # 승인 신청은 근무시간에 영향이 없으므로 재계산 불필요
+                daily_data.is_required = 1
+            return JsonResponse({
+                'status': 'success',
+                'message': '承認申請しました。',
+                'day': day_payload(target_date, daily_data),
+                'month': month_payload(monthly_data),
+            })
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -352,7 +491,7 @@ def attendance_require_day(request):
             from datetime import datetime
             target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
             monthly = AttendanceMonthly.objects.filter(
-                employee=request.user, year=str(target_date.year), month=str(target_date.month).zfill(2)
+                employee=request.user, period=AttendanceMonthly.to_period(target_date.year, target_date.month)
             ).first()
             if not monthly:
                 return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
@@ -361,6 +500,8 @@ def attendance_require_day(request):
                 return JsonResponse({'status': 'error', 'message': '該当する日別勤怠情報が見つかりません'})
             daily.is_required = True
             daily.save()
+            # 저장소를 거치지 않고 DB를 바꿨으므로 캐시 항목을 버림
+            monthly_repository.invalidate(request.user.employee_no, target_date.year, target_date.month)
             return JsonResponse({'status': 'success'})
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)})
@@ -2,193 +2,149 @@
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from datetime import datetime, date
 import calendar
 import json
 import collections
 
-from ..models import AttendanceMonthly, HolidayCalendar
+from ..models import AttendanceMonthly
+from ..cache_utils import CALENDARS_NAMESPACE, cache_generations
+from ..conditional import month_conditional, template_stamp
+from ..holidays import get_holidays
+from ..month_skeleton import get_month_skeleton
+from ..prefetch import month_prefetcher
 from ..forms import MonthlyAttendanceForm, DailyAttendanceForm
-from ..cache_utils import get_monthly_data_with_cache, preload_adjacent_months
+from ..repository import monthly_repository, adjacent_months, month_key
 from ..structures import DailyData
 
 # カレンダーの最初の曜日を日曜日に設定
 calendar.setfirstweekday(calendar.SUNDAY)
 
 
+def requested_month(request):
+    """URLパラメータの年月 (없으면 오늘 기준)"""
+    year = request.GET.get('year')
+    month = request.GET.get('month')
+    if year is None or month is None:
+        today = datetime.today()
+        return today.year, today.month
+    return int(year), int(month)
+
+
+def main_page_months(request, *args, **kwargs):
+    # 조건부 GET용: 화면이 읽는 전월/당월
+    prev, current, _ = adjacent_months(*requested_month(request))
+    return [prev, current]
+
+
+def main_page_extras(request, *args, **kwargs):
+    # 월별 데이터 외에 화면을 바꾸는 값들 (오늘 날짜, 휴일 캘린더, 사용자 표시명, CSRF, 템플릿)
+    return [
+        date.today().isoformat(),
+        cache_generations.get(CALENDARS_NAMESPACE),
+        getattr(request.user, 'display_name', ''),
+        request.META.get('CSRF_COOKIE', ''),
+        template_stamp(MainView.template_name),
+    ]
+
+
 # メインビュー（ログイン必須）
+@method_decorator(month_conditional(main_page_months, main_page_extras), name='get')
 class MainView(LoginRequiredMixin, TemplateView):
     template_name = 'attendance/main.html'
     login_url = 'attendance:login'
+
+    # 리스트용 하루분 (날짜, 요일, 일별 데이터, 휴일 여부)
+    MonthDay = collections.namedtuple('MonthDay', ['date', 'weekday', 'record', 'is_holiday'])
     
     def get_context_data(self, **kwargs):
-        import calendar  # 함수 맨 위에서 항상 import
         context = super().get_context_data(**kwargs)
         
-        # URLパラメータから年月を取得
-        year = self.request.GET.get('year')
-        month = self.request.GET.get('month')
-        
-        if year is None or month is None:
-            # 오늘 날짜로 기본값 설정
-            today = datetime.today()
-            year = today.year
-            month = today.month
-        else:
-            year = int(year)
-            month = int(month)
+        # URLパラメータから年月を取得 (없으면 오늘 날짜로 기본값 설정)
+        year, month = requested_month(self.request)
         
         current_date = date(year, month, 1)
-        context['current_date'] = current_date
-        context['today'] = date.today()
-        
-        # default_day 계산
         today = date.today()
-        if current_date.year == today.year and current_date.month == today.month:
-            default_day = today.day
-        elif current_date < today.replace(day=1):
-            # 과거달: 마지막일
-            last_day = calendar.monthrange(current_date.year, current_date.month)[1]
-            default_day = last_day
-        else:
-            # 미래달: 1일
-            default_day = 1
-        context['default_day'] = default_day
+        context['current_date'] = current_date
+        context['today'] = today
         
-        # 캐싱을 사용하여 월별 데이터 가져오기 (캐시 우선, 없으면 DB에서 로드)
-        monthly_data = get_monthly_data_with_cache(
-            employee=self.request.user,
-            year=str(current_date.year),
-            month=str(current_date.month)
-        )
+        # 전월/당월 데이터를 저장소에서 한 번에 가져오기 (캐시 우선, 없는 달만 DB에서 로드)
+        months = adjacent_months(year, month)
+        prev, current, following = months
+        prev_key, current_key = month_key(*prev), month_key(*current)
+        preloaded = monthly_repository.get_many(self.request.user, [prev, current])
+        month_prefetcher.record_use(self.request.user, [prev, current])
+        # 이웃 화면(전월/익월)에 필요한 나머지 달은 응답 후 백그라운드에서 캐시에 올려 둠
+        month_prefetcher.schedule(self.request.user, [adjacent_months(*prev)[0], following])
+        monthly_data = preloaded[current_key]
         context['monthly_data'] = monthly_data
+        # 전월 데이터도 같은 일괄 조회 결과에서 사용
+        context['prev_monthly_data'] = preloaded[prev_key]
         context['form'] = MonthlyAttendanceForm()
         # monthly_data가 없어도 daily_form은 항상 제공
         # monthly_data가 없으면 disabled 폼 생성
         context['daily_form'] = DailyAttendanceForm(disabled=monthly_data is None)
-        
-        # 캘린더와 weekdays는 항상 생성 (monthly_data가 없어도)
-        context['calendar'] = self.generate_calendar_data(current_date, monthly_data.daily_list if monthly_data else [])
-        context['weekdays'] = ['日', '月', '火', '水', '木', '金', '土']
 
-        # holidays_db: 3개월치(전월, 당월, 익월) 휴일 정보를 DB에서 가져와 context에 추가
-        current_year = current_date.year
-        current_month = current_date.month
-        months = []
-        for diff in [-1, 0, 1]:
-            y = current_year + ((current_month + diff - 1) // 12)
-            m = (current_month + diff - 1) % 12 + 1
-            months.append((y, m))
-        month_dates = []
-        for y, m in months:
-            last_day = calendar.monthrange(y, m)[1]
-            for d in range(1, last_day + 1):
-                month_dates.append(date(y, m, d))
-        base_calendar = None
-        if monthly_data:
-            base_calendar = monthly_data.base_calendar
+        # holidays_db: 3개월치(전월, 당월, 익월) 휴일 정보 (휴일 색인 캐시, 없으면 한 번의 쿼리)
+        base_calendar = monthly_data.base_calendar if monthly_data else None
         calendars = ['共通']
         if base_calendar and base_calendar not in calendars:
             calendars.append(base_calendar)
-        holidays = HolidayCalendar.objects.filter(calendar_name__in=calendars, date__in=month_dates)
-        holidays_db = collections.defaultdict(list)
-        for h in holidays:
-            holidays_db[h.date].append({'calendar_name': h.calendar_name, 'category': h.category})
+        holidays_db = get_holidays(calendars, months)
         holidays_db_strkey = {d.strftime('%Y-%m-%d'): v for d, v in holidays_db.items()}
-        context['holidays_db'] = dict(holidays_db_strkey)
+        context['holidays_db'] = holidays_db_strkey
         context['holidays_db_json'] = json.dumps(holidays_db_strkey, ensure_ascii=False)
 
-        # 리스트용 한 달치 날짜/요일 데이터 always 제공
-        MonthDay = collections.namedtuple('MonthDay', ['date', 'weekday', 'record', 'is_holiday'])
-        month_days = []
-        cal = calendar.Calendar(firstweekday=6)  # 일요일 시작
-        # 휴일 정보 준비
-        holidays_set = set()
-        for dstr in context['holidays_db'].keys():
-            holidays_set.add(datetime.strptime(dstr, '%Y-%m-%d').date())
-        for dt in cal.itermonthdates(current_date.year, current_date.month):
-            if dt.month == current_date.month:
-                # record: daily_list에서 해당 날짜가 있으면 연결, 없으면 None
-                record = None
-                if monthly_data and monthly_data.daily_list:
-                    for d in monthly_data.daily_list:
-                        if d.date == dt:
-                            record = d
-                            break
-                # 토/일/휴일 판정
-                is_holiday = (dt.weekday() == 6) or (dt.weekday() == 0) or (dt in holidays_set)
-                month_days.append(MonthDay(date=dt, weekday=dt.weekday(), record=record, is_holiday=is_holiday))
-        context['month_days_list'] = month_days
-
-        # 인접 월 데이터 미리 로드
-        preload_adjacent_months(self.request.user, current_date.year, current_date.month)
-
-        # Employee 객체는 self.request.user
-        employee = self.request.user
-
-        # 전달 연/월 계산
-        employee_no = self.request.user.employee_no
-        if month == 1:
-            prev_year, prev_month = year - 1, 12
+        # 당월 골격 (위에서 휴일 색인을 읽어 두었으므로 새로 만들 때도 추가 쿼리 없음)
+        skeleton = get_month_skeleton(year, month, base_calendar)
+        context['calendar'], context['month_days_list'] = self.build_month_views(
+            skeleton, monthly_data.daily_list if monthly_data else []
+        )
+        context['weekdays'] = ['日', '月', '火', '水', '木', '金', '土']
+
+        # default_day 계산
+        if current_date.year == today.year and current_date.month == today.month:
+            default_day = today.day
+        elif current_date < today.replace(day=1):
+            # 과거달: 마지막일
+            default_day = len(skeleton.days)
         else:
-            prev_year, prev_month = year, month - 1
+            # 미래달: 1일
+            default_day = 1
+        context['default_day'] = default_day
 
-        year = str(year)
-        month = f"{int(month):02d}"
-        prev_year = str(prev_year)
-        prev_month = f"{int(prev_month):02d}"
+        context['year'] = str(year)
+        context['month'] = f"{month:02d}"
+        return context
 
-        prev_monthly_data = AttendanceMonthly.objects.filter(
-            employee__employee_no=employee_no, year=prev_year, month=prev_month
-        ).first()
+    def build_month_views(self, skeleton, daily_list):
+        """
+        골격과 일별 데이터를 한 번에 묶어 캘린더(주 단위)와 리스트용 데이터를 만듭니다.
+        일별 데이터는 날짜 색인으로 한 번만 찾습니다.
 
-        context['prev_monthly_data'] = prev_monthly_data
-        context['year'] = year
-        context['month'] = month
-    
-        return context
-    
-    def generate_calendar_data(self, current_date, daily_list):
-        import collections
-        from django.utils.safestring import mark_safe
-        # 구조체 기반 캘린더 데이터 생성
-        cal = calendar.monthcalendar(current_date.year, current_date.month)
-        daily_dict = {daily.date: daily for daily in daily_list}
-        # holiday 정보 가져오기
-        holidays_db = self.get_holidays_db(current_date)
-        calendar_data = []
-        for week in cal:
-            week_data = []
-            for day in week:
-                if day == 0:
-                    week_data.append({'date': None, 'record': None, 'holiday_category': []})
-                else:
-                    day_date = date(current_date.year, current_date.month, day)
-                    record = daily_dict.get(day_date)
-                    # holiday_category를 리스트로
-                    holiday_category = [h['category'] for h in holidays_db.get(day_date, [])]
-                    week_data.append({'date': day_date, 'record': record, 'holiday_category': holiday_category})
-            calendar_data.append(week_data)
-        return calendar_data
-
-    def get_holidays_db(self, current_date):
-        import collections
-        from ..models import HolidayCalendar
-        current_year = current_date.year
-        current_month = current_date.month
-        months = []
-        for diff in [-1, 0, 1]:
-            y = current_year + ((current_month + diff - 1) // 12)
-            m = (current_month + diff - 1) % 12 + 1
-            months.append((y, m))
-        month_dates = []
-        for y, m in months:
-            last_day = calendar.monthrange(y, m)[1]
-            for d in range(1, last_day + 1):
-                month_dates.append(date(y, m, d))
-        calendars = ['共通']
-        holidays = HolidayCalendar.objects.filter(calendar_name__in=calendars, date__in=month_dates)
-        holidays_db = collections.defaultdict(list)
-        for h in holidays:
-            holidays_db[h.date].append({'calendar_name': h.calendar_name, 'category': h.category})
-        return dict(holidays_db) 
\ No newline at end of file
+        Returns:
+            (calendar_data, month_days)
+        """
+        month_days = []
+        cells = {}
+        for skeleton_day, record in skeleton.join(daily_list):
+            # 토/일/휴일 판정
+            is_holiday = skeleton_day.weekday in (6, 0) or skeleton_day.is_calendar_holiday
+            month_days.append(self.MonthDay(
+                date=skeleton_day.date, weekday=skeleton_day.weekday, record=record, is_holiday=is_holiday,
+            ))
+            # 캘린더 칸 (휴일 구분은 共通 캘린더)
+            cells[skeleton_day.day] = {
+                'date': skeleton_day.date,
+                'record': record,
+                'holiday_category': list(skeleton_day.common_categories),
+            }
+        calendar_data = [
+            [
+                cells[skeleton_day.day] if skeleton_day else {'date': None, 'record': None, 'holiday_category': []}
+                for skeleton_day in week
+            ]
+            for week in skeleton.weeks
+        ]
+        return calendar_data, month_days
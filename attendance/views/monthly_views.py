@@ -10,10 +10,11 @@ from django.urls import reverse_lazy
 from django.http import JsonResponse
 import json
 
+from ..conditional import month_conditional
 from ..models import AttendanceMonthly, AttendanceDaily
 from ..forms import MonthlyAttendanceForm
-from ..utils import get_or_create_monthly_structure, update_monthly_from_structure
-from ..cache_utils import invalidate_monthly_cache, preload_adjacent_months
+from ..payloads import month_payload
+from ..repository import monthly_repository, adjacent_months
 
 
 # 月別勤怠作成ビュー（ログイン必須）
@@ -43,6 +44,8 @@ class MonthlyAttendanceCreateView(LoginRequiredMixin, CreateView):
         try:
             result = super().form_valid(form)
             print(f"Monthly attendance created successfully: {form.instance}")
+            # 없는 달로 캐시되어 있을 수 있으므로 무효화
+            monthly_repository.invalidate(self.request.user.employee_no, form.instance.year, form.instance.month)
             
             # AJAX 요청인 경우 JSON 응답
             if self.request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -97,39 +100,11 @@ class MonthlyAttendanceDeleteView(View):
             if not year or not month:
                 return JsonResponse({'status': 'error', 'message': '年月情報が不足しています'})
             
-            # 구조체 기반으로 월별 데이터 가져오기
-            monthly_data = get_or_create_monthly_structure(
-                employee=request.user,
-                year=str(year),
-                month=str(month)
-            )
-            
-            if not monthly_data:
+            # DB에서 월별/일별 데이터를 삭제하고 캐시 무효화 (없는 달이면 None)
+            daily_count = monthly_repository.delete(request.user, year, month)
+            if daily_count is None:
                 return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
-            
-            # DB에서 삭제
-            monthly_model = AttendanceMonthly.objects.filter(
-                employee=request.user,
-                year=str(year),
-                month=str(month).zfill(2)
-            ).first()
-            
-            if monthly_model:
-                # 관련하는 일별 데이터도 삭제
-                daily_count = AttendanceDaily.objects.filter(monthly_attendance=monthly_model).count()
-                AttendanceDaily.objects.filter(monthly_attendance=monthly_model).delete()
-                
-                # 월별 데이터를 삭제
-                monthly_model.delete()
-                
-                print(f"Deleted monthly attendance and {daily_count} daily records")
-            
-            # 캐시 무효화 (해당 월의 캐시 삭제)
-            invalidate_monthly_cache(
-                employee_id=request.user.employee_no,
-                year=str(year),
-                month=str(month)
-            )
+            print(f"Deleted monthly attendance and {daily_count} daily records")
             
             return JsonResponse({
                 'status': 'success', 
@@ -163,44 +138,26 @@ class MonthlyAttendanceUpdateView(View):
             if not year or not month:
                 return JsonResponse({'status': 'error', 'message': '年月情報が不足しています'})
             
-            # 구조체 기반으로 월별 데이터 가져오기
-            monthly_data = get_or_create_monthly_structure(
-                employee=request.user,
-                year=str(year),
-                month=str(month)
-            )
-            
-            if not monthly_data:
-                return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
-            
-            # 구조체 데이터 업데이트
-            monthly_data.project_name = data.get('project_name', monthly_data.project_name)
-            monthly_data.base_calendar = data.get('base_calendar', monthly_data.base_calendar)
-            monthly_data.break_minutes = int(data.get('break_minutes', monthly_data.break_minutes))
-            monthly_data.standard_work_hours = float(data.get('standard_work_hours', monthly_data.standard_work_hours))
-            
-            # 일별 데이터의 설정값도 업데이트
-            for daily in monthly_data.daily_list:
-                daily.break_minutes = monthly_data.break_minutes
-                daily.standard_work_hours = monthly_data.standard_work_hours
-                # 시간 재계산
-                daily.calculate_work_hours()
-            
-            # DB에 저장
-            update_monthly_from_structure(monthly_data, request.user)
-            
-            # 캐시 무효화 (해당 월의 캐시 삭제)
-            invalidate_monthly_cache(
-                employee_id=request.user.employee_no,
-                year=str(year),
-                month=str(month)
-            )
+            # 월별 행을 잠그고 DB에서 읽은 사본을 수정 (블록을 벗어나면 저장, 커밋 후 캐시에 씀)
+            with monthly_repository.edit(request.user, year, month) as monthly_data:
+                if not monthly_data:
+                    return JsonResponse({'status': 'error', 'message': '該当する月別勤怠情報が見つかりません'})
+                
+                # 구조체 데이터 업데이트
+                monthly_data.project_name = data.get('project_name', monthly_data.project_name)
+                monthly_data.base_calendar = data.get('base_calendar', monthly_data.base_calendar)
+                monthly_data.break_minutes = int(data.get('break_minutes', monthly_data.break_minutes))
+                monthly_data.standard_work_hours = float(data.get('standard_work_hours', monthly_data.standard_work_hours))
+                
+                # 일별 데이터의 설정값도 업데이트하고 시간 재계산 (일괄 계산)
+                monthly_data.calculate_all_daily_hours()
             
             print(f"Monthly data updated successfully")
             
             return JsonResponse({
                 'status': 'success', 
-                'message': f'{year}年{month}月の勤怠情報を修正しました。'
+                'message': f'{year}年{month}月の勤怠情報を修正しました。',
+                'month': month_payload(monthly_data),
             })
             
         except json.JSONDecodeError as e:
@@ -213,9 +170,15 @@ class MonthlyAttendanceUpdateView(View):
             return JsonResponse({'status': 'error', 'message': str(e)})
 
 
+def requested_adjacent_months(request, *args, **kwargs):
+    # 조건부 GET용: 기준 월의 전월/당월/익월
+    return adjacent_months(int(request.GET.get('year')), int(request.GET.get('month')))
+
+
 # [추가] 3개월치 월별 정보를 한 번에 내려주는 bulk API
 @method_decorator(login_required, name='dispatch')
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(month_conditional(requested_adjacent_months), name='get')
 class MonthlyBulkInfoView(View):
     """
     3개월치 월별 정보를 한 번에 내려주는 API
@@ -233,8 +196,8 @@ class MonthlyBulkInfoView(View):
             month = int(month)
         except ValueError:
             return JsonResponse({'status': 'error', 'message': 'year, month는 정수여야 합니다.'})
-        # 3개월치 월별 데이터 preload
-        preloaded = preload_adjacent_months(request.user, year, month)
+        # 3개월치 월별 데이터 preload (캐시에 없는 달은 한 번에 로드)
+        preloaded = monthly_repository.get_many(request.user, adjacent_months(year, month))
         result = {}
         for key, monthly_data in preloaded.items():
             if monthly_data:
@@ -4,15 +4,33 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.http import JsonResponse, HttpResponse
-import tempfile
+import io
 import json
 
+from ..cache_utils import get_report_with_cache
 from ..excel_generator import ExcelReportGenerator
 from ..pdf_generator import PDFReportGenerator
 from django.core.mail import EmailMessage
 from django.conf import settings
 
 
+def build_excel_bytes(employee, year, month):
+    """稼動報告書エクセルのバイト列 (月別データのバージョンごとにキャッシュ)"""
+    def build():
+        workbook = ExcelReportGenerator(employee, year, month).generate_report()
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue()
+    return get_report_with_cache(employee, year, month, 'excel', build)
+
+
+def build_pdf_bytes(employee, year, month):
+    """稼動報告書PDFのバイト列 (月別データのバージョンごとにキャッシュ)"""
+    def build():
+        return PDFReportGenerator(employee, year, month).generate_pdf().getvalue()
+    return get_report_with_cache(employee, year, month, 'pdf', build)
+
+
 # エクセルダウンロードビュー（ログイン必須）
 @method_decorator(login_required, name='dispatch')
 class ExcelDownloadView(View):
@@ -25,9 +43,8 @@ class ExcelDownloadView(View):
             return JsonResponse({'status': 'error', 'message': '年月が指定されていません'})
         
         try:
-            # ExcelReportGeneratorを使用してエクセルファイルを生成
-            generator = ExcelReportGenerator(request.user, int(year), int(month))
-            workbook = generator.generate_report()
+            # ExcelReportGeneratorを使用してエクセルファイルを生成 (月別データのバージョンごとにキャッシュ)
+            excel_bytes = build_excel_bytes(request.user, int(year), int(month))
             
             # employee_name을 '이름_사원번호' 형식으로 설정
             employee_name = f"{request.user.display_name}({request.user.employee_no})"
@@ -39,10 +56,7 @@ class ExcelDownloadView(View):
             )
             response['Content-Disposition'] = f'attachment; filename="{filename}"'
             
-            # 엑셀 저장 직전
-            print("엑셀 저장 직전")
-            workbook.save(response)
-            print("엑셀 저장 성공")
+            response.write(excel_bytes)
             return response
             
         except ValueError as e:
@@ -65,9 +79,8 @@ class PDFPreviewView(View):
             return JsonResponse({'status': 'error', 'message': '年月が指定されていません'})
         
         try:
-            # PDFReportGeneratorを使用してPDFファイルを生成
-            generator = PDFReportGenerator(request.user, int(year), int(month))
-            pdf_buffer = generator.generate_pdf()
+            # PDFReportGeneratorを使用してPDFファイルを生成 (月別データのバージョンごとにキャッシュ)
+            pdf_bytes = build_pdf_bytes(request.user, int(year), int(month))
             
             # employee_name을 '이름_사원번호' 형식으로 설정
             employee_name = f"{request.user.display_name}({request.user.employee_no})"
@@ -84,7 +97,7 @@ class PDFPreviewView(View):
             response['X-Frame-Options'] = 'SAMEORIGIN'
             
             # PDFデータをレスポンスに書き込み
-            response.write(pdf_buffer.getvalue())
+            response.write(pdf_bytes)
             return response
             
         except ValueError as e:
@@ -113,23 +126,13 @@ class EmailSendView(View):
             
             if not email_to or not file_type or not year or not month:
                 return JsonResponse({'status': 'error', 'message': '必要な情報が不足しています。'})
-            # 파일 생성
+            # 파일 생성 (캐시된 리포트가 있으면 재사용)
             if file_type == 'pdf':
-                from ..pdf_generator import PDFReportGenerator
-                generator = PDFReportGenerator(request.user, int(year), int(month))
-                file_buffer = generator.generate_pdf()
+                file_bytes = build_pdf_bytes(request.user, int(year), int(month))
                 file_ext = 'pdf'
                 mime_type = 'application/pdf'
             elif file_type == 'excel':
-                generator = ExcelReportGenerator(request.user, int(year), int(month))
-                workbook = generator.generate_report()
-                file_buffer = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-                try:
-                    print("엑셀 저장 직전")
-                    workbook.save(file_buffer.name)
-                    print("엑셀 저장 성공")
-                except Exception as e:
-                    print("엑셀 저장 중 에러:", e)
+                file_bytes = build_excel_bytes(request.user, int(year), int(month))
                 file_ext = 'xlsx'
                 mime_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             else:
@@ -148,21 +151,11 @@ class EmailSendView(View):
                 to=[email_to],
             )
 
-            if file_type == 'pdf':
-                filename = f"{year}_{month}_稼働報告書_{employee_name}.pdf"
-                email.attach(filename, file_buffer.getvalue(), mime_type)
-            else:
-                filename = f"{year}_{month}_稼働報告書_{employee_name}.xlsx"
-                file_buffer.seek(0)
-                email.attach(filename, file_buffer.read(), mime_type)
+            filename = f"{year}_{month}_稼働報告書_{employee_name}.{file_ext}"
+            email.attach(filename, file_bytes, mime_type)
             
             # 이메일 전송
             email.send(fail_silently=False)
-            # 임시파일 정리
-            if file_type == 'excel':
-                import os
-                file_buffer.close()
-                os.unlink(file_buffer.name)
             return JsonResponse({'status': 'success'})
         except Exception as e:
             import traceback
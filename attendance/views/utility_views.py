@@ -4,6 +4,7 @@ from django.views.decorators.http import require_POST
 from django.http import JsonResponse, HttpResponseBadRequest
 
 from ..models import AttendanceMonthly
+from ..repository import monthly_repository
 
 
 # 전월 복사 기능
@@ -33,12 +34,12 @@ def copy_prev_month(request):
 
     try:
         prev_obj = AttendanceMonthly.objects.get(
-            employee__employee_no=employee_no, year=prev_year, month=prev_month
+            employee_id=employee_no, period=AttendanceMonthly.to_period(prev_year, prev_month)
         )
     except AttendanceMonthly.DoesNotExist:
         return HttpResponseBadRequest('前月の情報がありません。')
 
-    if AttendanceMonthly.objects.filter(employee__employee_no=employee_no, year=year, month=month).exists():
+    if AttendanceMonthly.objects.filter(employee_id=employee_no, period=AttendanceMonthly.to_period(year, month)).exists():
         return HttpResponseBadRequest('今月の情報は既に存在します。')
 
     # Employee 객체 가져오기
@@ -56,5 +57,7 @@ def copy_prev_month(request):
         is_required=False,
     )
     new_obj.save()
+    # 없는 달로 캐시되어 있을 수 있으므로 무효화
+    monthly_repository.invalidate(employee_no, year, month)
 
     return JsonResponse({'result': 'ok'}) 
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+근무시간 계산 모듈
+- 근무규칙 타임라인: 휴게시간 규칙을 48시간 분 단위 누적합 배열로 컴파일하여
+  "구간 내 유급 분"을 배열 조회 두 번으로 계산합니다.
+- 일괄 계산: 여러 DailyData 행의 상근/공제/잔업/심야/소계 시간을 NumPy 배열 연산으로 한 번에 계산합니다.
+  DailyData.calculate_work_hours()와 완전히 동일한 결과를 반환합니다.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 DailyData의 스칼라 계산으로 대체
+    np = None
+
+# 휴일/공휴일/대체휴일 근무구분
+HOLIDAY_TYPES = ('休日(法)', '祝日', '振替(法)', '休日', '振替(休)')
+HALF_PAID_LEAVE = '有給(半)'
+
+# 규칙 상수 (분 단위, 근무일 00:00 기준 / 1440 이상은 다음날)
+DAY_MINUTES = 24 * 60
+LUNCH_DEDUCT_FROM = 9 * 60          # 09:00~12:00 시작이면 점심시간 공제
+LUNCH_DEDUCT_TO = 12 * 60
+LUNCH_START = 12 * 60
+OVERTIME_START = 18 * 60            # 18:00 이후 잔업
+LATE_NIGHT_START = 22 * 60 + 30     # 22:30 이후 심야
+LATE_NIGHT_END = DAY_MINUTES + 6 * 60  # 다음날 06:00
+TIMELINE_MINUTES = 2 * DAY_MINUTES  # 근무일 00:00 ~ 다음날 24:00
+
+# 휴게 구간 (시작, 종료) - 종료가 None이면 시작 + 점심시간(break_minutes)
+LUNCH_BREAK = (LUNCH_START, None)
+EVENING_BREAKS = ((19 * 60 + 30, 20 * 60), (22 * 60, 22 * 60 + 30))
+LATE_NIGHT_BREAKS = ((DAY_MINUTES + 30, DAY_MINUTES + 60), (DAY_MINUTES + 3 * 60, DAY_MINUTES + 3 * 60 + 30))
+
+# 근무규칙: 계산 구간별로 공제할 휴게 구간
+HOLIDAY_BAND = 'holiday'        # 휴일 잔업 (점심 + 저녁 휴게)
+WORKDAY_BAND = 'workday'        # 근무일 18:00~22:30 잔업 (저녁 휴게)
+LATE_NIGHT_BAND = 'late_night'  # 22:30 이후 심야 (심야 휴게)
+WORK_RULES = (
+    (HOLIDAY_BAND, (LUNCH_BREAK,) + EVENING_BREAKS),
+    (WORKDAY_BAND, EVENING_BREAKS),
+    (LATE_NIGHT_BAND, LATE_NIGHT_BREAKS),
+)
+
+# 계산 결과 시간 값은 종류가 적으므로 같은 float 객체를 공유
+_HOURS = {}
+
+RESULT_FIELDS = (
+    'regular_work_hours',
+    'deduction_hours',
+    'overtime_hours',
+    'late_night_overtime_hours',
+    'total_hours',
+)
+
+
+class WorkRuleTimeline:
+    """
+    컴파일된 근무규칙 타임라인
+    구간(band)별로 분 단위 휴게 겹침 수(coverage)와 그 누적합(prefix)을 보관합니다.
+    겹치는 휴게 구간은 중복 공제되므로 구간별 겹침 합과 동일한 결과가 나옵니다.
+    """
+
+    def __init__(self, break_minutes: int, rules=WORK_RULES):
+        self.break_minutes = break_minutes
+        self._coverage = {}
+        self._prefix = {}
+        self._arrays = {}
+        for band, windows in rules:
+            coverage = [0] * (TIMELINE_MINUTES + 1)
+            for window_start, window_end in windows:
+                if window_end is None:
+                    window_end = window_start + break_minutes
+                for minute in range(max(0, int(window_start)), min(TIMELINE_MINUTES, int(window_end))):
+                    coverage[minute] += 1
+            prefix = [0] * (TIMELINE_MINUTES + 1)
+            for minute in range(TIMELINE_MINUTES):
+                prefix[minute + 1] = prefix[minute] + coverage[minute]
+            self._coverage[band] = coverage
+            self._prefix[band] = prefix
+
+    def _breaks_before(self, band: str, minute: float):
+        """0분부터 minute까지의 휴게 분 (분 미만은 선형 보간)"""
+        index = int(minute)
+        breaks = self._prefix[band][index]
+        if minute != index:
+            breaks += (minute - index) * self._coverage[band][index]
+        return breaks
+
+    def paid_minutes(self, band: str, lo: float, hi: float):
+        """[lo, hi] 구간에서 휴게를 뺀 근무 분"""
+        return (hi - lo) - (self._breaks_before(band, hi) - self._breaks_before(band, lo))
+
+    def paid_minutes_array(self, band: str, lo: 'np.ndarray', hi: 'np.ndarray') -> 'np.ndarray':
+        """paid_minutes의 NumPy 배열 버전"""
+        if band not in self._arrays:
+            self._arrays[band] = (np.array(self._prefix[band], dtype=np.float64),
+                                  np.array(self._coverage[band], dtype=np.float64))
+        prefix, coverage = self._arrays[band]
+
+        def breaks_before(minute):
+            index = minute.astype(np.int64)
+            return prefix[index] + (minute - index) * coverage[index]
+
+        return (hi - lo) - (breaks_before(hi) - breaks_before(lo))
+
+
+@lru_cache(maxsize=64)
+def get_work_rule_timeline(break_minutes: int, rules=WORK_RULES) -> WorkRuleTimeline:
+    """(점심시간, 근무규칙)별로 한 번만 컴파일한 타임라인을 반환"""
+    return WorkRuleTimeline(break_minutes, rules)
+
+
+def _paid_minutes(breaks, band, lo, hi):
+    """행별 점심시간에 맞는 타임라인으로 [lo, hi] 구간의 근무 분을 계산"""
+    lo = np.broadcast_to(np.asarray(lo, dtype=np.float64), breaks.shape)
+    hi = np.broadcast_to(np.asarray(hi, dtype=np.float64), breaks.shape)
+    result = np.zeros(breaks.shape, dtype=np.float64)
+    for value in np.unique(breaks):
+        mask = breaks == value
+        timeline = get_work_rule_timeline(int(value))
+        result[mask] = timeline.paid_minutes_array(band, lo[mask], hi[mask])
+    return result
+
+
+def calculate_work_hours_batch(start_minutes: Sequence[Optional[float]],
+                               end_minutes: Sequence[Optional[float]],
+                               work_types: Sequence[Optional[str]],
+                               break_minutes,
+                               standard_work_hours) -> Dict[str, 'np.ndarray']:
+    """
+    근무시간을 일괄 계산합니다.
+
+    Args:
+        start_minutes: 작업 시작 시각 (분, 미입력은 None)
+        end_minutes: 작업 종료 시각 (분, 미입력은 None)
+        work_types: 근무구분
+        break_minutes: 점심시간 (분) - 스칼라 또는 행별 배열
+        standard_work_hours: 기준 근무시간 - 스칼라 또는 행별 배열
+
+    Returns:
+        RESULT_FIELDS를 키로 하는 float64 배열 딕셔너리 (값이 없는 경우 NaN)
+    """
+    n = len(work_types)
+    start = np.array([np.nan if v is None else v for v in start_minutes], dtype=np.float64)
+    end = np.array([np.nan if v is None else v for v in end_minutes], dtype=np.float64)
+    breaks = np.broadcast_to(np.asarray(break_minutes, dtype=np.float64), (n,))
+    standard = np.broadcast_to(np.asarray(standard_work_hours, dtype=np.float64), (n,))
+    is_holiday = np.fromiter((wt in HOLIDAY_TYPES for wt in work_types), dtype=bool, count=n)
+    is_half = np.fromiter((wt == HALF_PAID_LEAVE for wt in work_types), dtype=bool, count=n)
+
+    has_start = ~np.isnan(start)
+    has_end = ~np.isnan(end)
+    has_both = has_start & has_end
+    s = np.where(has_start, start, 0.0)
+    e = np.where(has_end, end, 0.0)
+    e = np.where(e < s, e + DAY_MINUTES, e)  # 다음날로 넘어가는 경우
+
+    # 상근시간
+    work = e - s
+    work = np.where((s >= LUNCH_DEDUCT_FROM) & (s <= LUNCH_DEDUCT_TO), work - breaks, work)
+    work = np.where(work > standard * 60, standard * 60, work)
+    regular = np.where(has_both, work / 60.0, np.nan)
+    regular = np.where(has_start & ~has_end & ~is_holiday, standard, regular)
+
+    # 공제시간
+    deduction = standard - regular
+    deduction = np.where(is_half, deduction + 4.0, deduction)
+    deduction = np.maximum(0.0, deduction)
+    deduction = np.where(is_holiday, np.nan, deduction)
+
+    crosses_night = e > LATE_NIGHT_START
+
+    # 심야시간 (22:30~06:00, 06:00 이후까지 근무하면 종료시각까지)
+    night_end = np.where(e > LATE_NIGHT_END, e, LATE_NIGHT_END)
+    night = _paid_minutes(breaks, LATE_NIGHT_BAND, LATE_NIGHT_START, night_end)
+    late_night = np.where(crosses_night, np.maximum(0.0, night / 60.0), 0.0)
+
+    # 휴일: 시작~종료 전체가 잔업 (22:30 이후는 심야로 분리)
+    holiday_end = np.where(crosses_night, LATE_NIGHT_START, e)
+    holiday_overtime = np.maximum(0.0, _paid_minutes(breaks, HOLIDAY_BAND, s, holiday_end) / 60.0)
+
+    # 근무일: 18:00~22:30 구간이 잔업
+    after_overtime_start = e > OVERTIME_START
+    overtime_end = np.where(crosses_night, LATE_NIGHT_START, np.maximum(e, OVERTIME_START))
+    workday = _paid_minutes(breaks, WORKDAY_BAND, OVERTIME_START, overtime_end)
+    workday_overtime = np.where(after_overtime_start, np.maximum(0.0, workday / 60.0), 0.0)
+    workday_late_night = np.where(after_overtime_start, late_night, 0.0)
+
+    overtime = np.where(has_both, np.where(is_holiday, holiday_overtime, workday_overtime), np.nan)
+    late_night = np.where(has_both, np.where(is_holiday, late_night, workday_late_night), np.nan)
+
+    # 소계시간
+    total = np.where(has_both, 0.0 + regular + overtime + late_night, np.nan)
+
+    return {
+        'regular_work_hours': regular,
+        'deduction_hours': deduction,
+        'overtime_hours': overtime,
+        'late_night_overtime_hours': late_night,
+        'total_hours': total,
+    }
+
+
+def apply_work_hours_batch(daily_list: Iterable) -> None:
+    """
+    DailyData 리스트의 근무시간을 일괄 계산하여 각 객체에 기록합니다.
+    break_minutes / standard_work_hours는 각 DailyData의 값을 사용하므로
+    여러 달, 여러 사원의 데이터를 한 번에 넘겨도 됩니다.
+    """
+    daily_list = list(daily_list)
+    if not daily_list:
+        return
+
+    if np is None:
+        for daily in daily_list:
+            daily.calculate_work_hours()
+        return
+
+    results = calculate_work_hours_batch(
+        [d.start_minutes for d in daily_list],
+        [d.end_minutes for d in daily_list],
+        [d.work_type for d in daily_list],
+        [d.break_minutes for d in daily_list],
+        [d.standard_work_hours for d in daily_list],
+    )
+    columns = [results[name].tolist() for name in RESULT_FIELDS]
+    for daily, values in zip(daily_list, zip(*columns)):
+        for name, value in zip(RESULT_FIELDS, values):
+            setattr(daily, name, None if value != value else _HOURS.setdefault(value, value))
+        daily._touch()
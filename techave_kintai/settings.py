@@ -139,6 +139,19 @@ CACHES = {
     }
 }
 
+# Redis 앞단의 워커별 로컬 LRU 캐시 설정
+ATTENDANCE_LOCAL_CACHE = {
+    'MAX_ENTRIES': 512,  # 워커당 최대 항목 수
+    'REVALIDATE_SECONDS': 1,  # 이 시간이 지나면 Redis의 버전 스탬프로 재확인 (다른 워커 변경 반영 지연 상한)
+}
+
+# 인접 월 미리 읽기 (응답 후 백그라운드 스레드)
+ATTENDANCE_PREFETCH = {
+    'ENABLED': True,
+    'MAX_WORKERS': 2,  # 워커 프로세스당 스레드 수
+    'MAX_PENDING': 16,  # 대기 작업 수 상한 (넘치면 버림)
+}
+
 # 메모리 캐시 (Redis 서버가 없을 때 사용)
 # CACHES = {
 #     'default': {